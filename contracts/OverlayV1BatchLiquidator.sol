@@ -0,0 +1,103 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Factory.sol";
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Token.sol";
+
+import "./interfaces/IOverlayV1State.sol";
+
+/// @title A periphery contract to liquidate many positions across
+/// @title Overlay markets in a single transaction
+contract OverlayV1BatchLiquidator {
+    IOverlayV1Token public immutable ovl; // overlay token
+    IOverlayV1Factory public immutable factory; // overlay market factory
+    IOverlayV1State public immutable state; // overlay market state
+
+    // position to attempt to liquidate
+    struct Liquidation {
+        IOverlayV1Market market;
+        address owner;
+        uint256 id;
+    }
+
+    // event emitted on batch liquidate
+    event PositionsLiquidated(address indexed user, uint256 count, uint256 fees);
+
+    constructor(IOverlayV1State _state) {
+        IOverlayV1Factory _factory = _state.factory();
+        state = _state;
+        factory = _factory;
+        ovl = _factory.ovl();
+    }
+
+    /// @notice Liquidates each of the given positions that is currently
+    /// @notice liquidatable and forwards the liquidation fees to the caller
+    /// @dev skips positions that are not liquidatable or fail to liquidate
+    /// @dev instead of reverting the entire batch
+    /// @dev size batches to fit in a block: once gas runs low, try calls
+    /// @dev get only 63/64 of what remains and are skipped as failures
+    /// @return liquidated_ as whether each position was liquidated
+    /// @return fees_ as the total liquidation fees forwarded to the caller
+    function liquidate(Liquidation[] memory liquidations)
+        external
+        returns (bool[] memory liquidated_, uint256 fees_)
+    {
+        uint256 balanceBefore = ovl.balanceOf(address(this));
+
+        uint256 count;
+        liquidated_ = new bool[](liquidations.length);
+        for (uint256 i = 0; i < liquidations.length; i++) {
+            Liquidation memory liquidation = liquidations[i];
+            if (!_liquidatable(liquidation)) {
+                continue;
+            }
+
+            // market transfers liquidation fee to this contract
+            try liquidation.market.liquidate(liquidation.owner, liquidation.id) {
+                liquidated_[i] = true;
+                count++;
+            } catch {}
+        }
+
+        // forward all fees collected on this batch to the caller
+        fees_ = ovl.balanceOf(address(this)) - balanceBefore;
+        if (fees_ > 0) {
+            ovl.transfer(msg.sender, fees_);
+        }
+
+        // emit event to track batch liquidations
+        emit PositionsLiquidated(msg.sender, count, fees_);
+    }
+
+    /// @notice Gets whether each of the given positions is currently
+    /// @notice liquidatable and would be liquidated in a batch
+    /// @return liquidatable_ as whether each position is liquidatable
+    function liquidatable(Liquidation[] memory liquidations)
+        external
+        view
+        returns (bool[] memory liquidatable_)
+    {
+        liquidatable_ = new bool[](liquidations.length);
+        for (uint256 i = 0; i < liquidations.length; i++) {
+            liquidatable_[i] = _liquidatable(liquidations[i]);
+        }
+    }
+
+    /// @dev whether position is liquidatable on a market deployed by factory
+    /// @dev uses same checks as OverlayV1State.liquidatable. Returns false
+    /// @dev instead of reverting if the check fails
+    function _liquidatable(Liquidation memory liquidation) private view returns (bool) {
+        if (!factory.isMarket(address(liquidation.market))) {
+            return false;
+        }
+
+        try state.liquidatable(liquidation.market, liquidation.owner, liquidation.id) returns (
+            bool liquidatable_
+        ) {
+            return liquidatable_;
+        } catch {
+            return false;
+        }
+    }
+}
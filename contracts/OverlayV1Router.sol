@@ -0,0 +1,124 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Factory.sol";
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Token.sol";
+
+/// @title A periphery contract to build and unwind many positions across
+/// @title Overlay markets in a single transaction
+/// @dev positions built through the router are held by the router on
+/// @dev behalf of the caller and can only be unwound through the router
+contract OverlayV1Router {
+    IOverlayV1Token public immutable ovl; // overlay token
+    IOverlayV1Factory public immutable factory; // overlay market factory
+
+    // type of operation to execute on the market
+    enum Action {
+        Build,
+        Unwind
+    }
+
+    // build: uses collateral, leverage, isLong, priceLimit
+    // unwind: uses positionId, fraction, priceLimit
+    struct Operation {
+        Action action;
+        IOverlayV1Market market;
+        uint256 collateral;
+        uint256 leverage;
+        bool isLong;
+        uint256 positionId;
+        uint256 fraction;
+        uint256 priceLimit;
+    }
+
+    // owners of positions held by the router: market => positionId => owner
+    mapping(IOverlayV1Market => mapping(uint256 => address)) public ownerOf;
+
+    // events emitted on build, unwind, execute
+    event PositionBuilt(address indexed user, address indexed market, uint256 positionId);
+    event PositionUnwound(address indexed user, address indexed market, uint256 positionId);
+    event OperationsExecuted(
+        address indexed user,
+        uint256 count,
+        uint256 amountIn,
+        uint256 amountOut
+    );
+
+    constructor(IOverlayV1Factory _factory) {
+        factory = _factory;
+        ovl = _factory.ovl();
+    }
+
+    /// @notice Executes the given build and unwind operations in order,
+    /// @notice pulling amountIn of OVL from the caller once up front
+    /// @dev amountIn must cover collateral plus trading fees on all builds
+    /// @dev less any proceeds from unwinds earlier in the list. Any OVL
+    /// @dev remaining after all operations is returned to the caller
+    /// @dev reverts if any operation fails, including on price limits
+    /// @return positionIds_ as the position id for each operation
+    /// @return amountOut_ as the amount of OVL returned to the caller
+    function execute(Operation[] memory operations, uint256 amountIn)
+        external
+        returns (uint256[] memory positionIds_, uint256 amountOut_)
+    {
+        uint256 balanceBefore = ovl.balanceOf(address(this));
+        if (amountIn > 0) {
+            ovl.transferFrom(msg.sender, address(this), amountIn);
+        }
+
+        positionIds_ = new uint256[](operations.length);
+        for (uint256 i = 0; i < operations.length; i++) {
+            Operation memory operation = operations[i];
+            require(factory.isMarket(address(operation.market)), "OVLV1: !market");
+
+            if (operation.action == Action.Build) {
+                positionIds_[i] = _build(operation);
+            } else {
+                _unwind(operation);
+                positionIds_[i] = operation.positionId;
+            }
+        }
+
+        // return remaining collateral and unwind proceeds to the caller
+        amountOut_ = ovl.balanceOf(address(this)) - balanceBefore;
+        if (amountOut_ > 0) {
+            ovl.transfer(msg.sender, amountOut_);
+        }
+
+        // emit event to track batch executions
+        emit OperationsExecuted(msg.sender, operations.length, amountIn, amountOut_);
+    }
+
+    /// @dev builds position on market held by router for msg.sender
+    function _build(Operation memory operation) private returns (uint256 positionId_) {
+        IOverlayV1Market market = operation.market;
+
+        // approve market once for max since router holds no OVL between txs
+        if (ovl.allowance(address(this), address(market)) < type(uint256).max) {
+            ovl.approve(address(market), type(uint256).max);
+        }
+
+        positionId_ = market.build(
+            operation.collateral,
+            operation.leverage,
+            operation.isLong,
+            operation.priceLimit
+        );
+        ownerOf[market][positionId_] = msg.sender;
+
+        // emit event to track positions held by router for user
+        emit PositionBuilt(msg.sender, address(market), positionId_);
+    }
+
+    /// @dev unwinds position on market held by router for msg.sender
+    function _unwind(Operation memory operation) private {
+        IOverlayV1Market market = operation.market;
+        require(ownerOf[market][operation.positionId] == msg.sender, "OVLV1: !owner");
+
+        market.unwind(operation.positionId, operation.fraction, operation.priceLimit);
+
+        // emit event to track positions unwound by router for user
+        emit PositionUnwound(msg.sender, address(market), operation.positionId);
+    }
+}
@@ -6,8 +6,10 @@ import "./interfaces/IOverlayV1State.sol";
 import "./state/OverlayV1BaseState.sol";
 import "./state/OverlayV1EstimateState.sol";
 import "./state/OverlayV1OIState.sol";
+import "./state/OverlayV1PackedState.sol";
 import "./state/OverlayV1PositionState.sol";
 import "./state/OverlayV1PriceState.sol";
+import "./state/OverlayV1ProjectionState.sol";
 
 /// @title A market state contract to view the current state of
 /// @title an Overlay market
@@ -17,7 +19,9 @@ contract OverlayV1State is
     OverlayV1PriceState,
     OverlayV1OIState,
     OverlayV1EstimateState,
-    OverlayV1PositionState
+    OverlayV1PositionState,
+    OverlayV1ProjectionState,
+    OverlayV1PackedState
 {
     constructor(IOverlayV1Factory _factory) OverlayV1BaseState(_factory) {}
 
@@ -47,4 +51,89 @@ contract OverlayV1State is
             fundingRate: _fundingRate(market)
         });
     }
+
+    /// @notice Gets the raw market attributes needed to compute the
+    /// @notice current market state off-chain
+    /// @dev oi values are as last stored on the market (before funding)
+    function _rawMarketData(IOverlayV1Market market)
+        internal
+        view
+        returns (RawMarketData memory rawData_)
+    {
+        address feed = market.feed();
+        rawData_.feed = feed;
+
+        // aggregate oi and oi shares values stored on market
+        rawData_.oiLong = market.oiLong();
+        rawData_.oiShort = market.oiShort();
+        rawData_.oiLongShares = market.oiLongShares();
+        rawData_.oiShortShares = market.oiShortShares();
+        rawData_.timestampUpdateLast = market.timestampUpdateLast();
+
+        // rolling volume and minted snapshots
+        (
+            rawData_.snapshotVolumeBid.timestamp,
+            rawData_.snapshotVolumeBid.window,
+            rawData_.snapshotVolumeBid.accumulator
+        ) = market.snapshotVolumeBid();
+        (
+            rawData_.snapshotVolumeAsk.timestamp,
+            rawData_.snapshotVolumeAsk.window,
+            rawData_.snapshotVolumeAsk.accumulator
+        ) = market.snapshotVolumeAsk();
+        (
+            rawData_.snapshotMinted.timestamp,
+            rawData_.snapshotMinted.window,
+            rawData_.snapshotMinted.accumulator
+        ) = market.snapshotMinted();
+
+        // risk params indexed as in Risk.Parameters
+        for (uint256 i = 0; i < rawData_.params.length; i++) {
+            rawData_.params[i] = market.params(i);
+        }
+
+        // latest oracle data from feed
+        rawData_.data = _getOracleData(feed);
+    }
+
+    /// @notice Gets the raw market attributes to aggregate calls into a
+    /// @notice single function for off-chain computation
+    /// @dev WARNING: makes many calls to market
+    /// @return rawData_ as the raw market data
+    function rawMarketData(IOverlayV1Market market)
+        external
+        view
+        returns (RawMarketData memory rawData_)
+    {
+        rawData_ = _rawMarketData(market);
+    }
+
+    /// @notice Gets the raw market attributes for each of the given
+    /// @notice markets in a single call
+    /// @dev WARNING: makes many calls to each market
+    /// @return rawData_ as the raw market data for each market
+    function rawMarketDataBatch(IOverlayV1Market[] memory markets)
+        external
+        view
+        returns (RawMarketData[] memory rawData_)
+    {
+        rawData_ = new RawMarketData[](markets.length);
+        for (uint256 i = 0; i < markets.length; i++) {
+            rawData_[i] = _rawMarketData(markets[i]);
+        }
+    }
+
+    /// @notice Executes each of the given calls to views on this contract,
+    /// @notice returning whether each succeeded along with its return data
+    /// @dev calls are ABI encoded with function selector. A call that
+    /// @dev reverts does not revert the batch, with revert data returned
+    /// @dev as returnData and success == false
+    /// @return results_ as the (success, returnData) for each call
+    function tryBatch(bytes[] memory calls) external view returns (Result[] memory results_) {
+        results_ = new Result[](calls.length);
+        for (uint256 i = 0; i < calls.length; i++) {
+            (bool success, bytes memory returnData) = address(this).staticcall(calls[i]);
+            results_[i] = Result({success: success, returnData: returnData});
+        }
+    }
 }
@@ -2,17 +2,23 @@
 pragma solidity 0.8.10;
 
 import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Oracle.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Roller.sol";
 
 import "./state/IOverlayV1BaseState.sol";
 import "./state/IOverlayV1PriceState.sol";
 import "./state/IOverlayV1OIState.sol";
 import "./state/IOverlayV1PositionState.sol";
+import "./state/IOverlayV1ProjectionState.sol";
+import "./state/IOverlayV1PackedState.sol";
 
 interface IOverlayV1State is
     IOverlayV1BaseState,
     IOverlayV1PriceState,
     IOverlayV1OIState,
-    IOverlayV1PositionState
+    IOverlayV1PositionState,
+    IOverlayV1ProjectionState,
+    IOverlayV1PackedState
 {
     struct MarketState {
         uint256 bid;
@@ -27,8 +33,39 @@ interface IOverlayV1State is
         int256 fundingRate;
     }
 
+    struct RawMarketData {
+        address feed;
+        uint256 oiLong;
+        uint256 oiShort;
+        uint256 oiLongShares;
+        uint256 oiShortShares;
+        uint256 timestampUpdateLast;
+        Roller.Snapshot snapshotVolumeBid;
+        Roller.Snapshot snapshotVolumeAsk;
+        Roller.Snapshot snapshotMinted;
+        uint256[15] params;
+        Oracle.Data data;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
     function marketState(IOverlayV1Market market)
         external
         view
         returns (MarketState memory state_);
+
+    function rawMarketData(IOverlayV1Market market)
+        external
+        view
+        returns (RawMarketData memory rawData_);
+
+    function rawMarketDataBatch(IOverlayV1Market[] memory markets)
+        external
+        view
+        returns (RawMarketData[] memory rawData_);
+
+    function tryBatch(bytes[] memory calls) external view returns (Result[] memory results_);
 }
@@ -0,0 +1,30 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+
+import "./IOverlayV1BaseState.sol";
+import "./IOverlayV1OIState.sol";
+import "./IOverlayV1PositionState.sol";
+import "./IOverlayV1PriceState.sol";
+
+interface IOverlayV1PackedState is
+    IOverlayV1BaseState,
+    IOverlayV1PriceState,
+    IOverlayV1OIState,
+    IOverlayV1PositionState
+{
+    // positions on market for owners, ids tightly packed into fixed width records
+    function positionsPacked(
+        IOverlayV1Market market,
+        address[] memory owners,
+        uint256[] memory ids
+    ) external view returns (bytes memory packed_);
+
+    // current values of positions on market tightly packed into fixed width records
+    function positionValuesPacked(
+        IOverlayV1Market market,
+        address[] memory owners,
+        uint256[] memory ids
+    ) external view returns (bytes memory packed_);
+}
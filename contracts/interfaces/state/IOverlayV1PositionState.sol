@@ -99,4 +99,76 @@ interface IOverlayV1PositionState is IOverlayV1BaseState, IOverlayV1PriceState,
         address owner,
         uint256 id
     ) external view returns (uint256 liquidationPrice_);
+
+    // collateral backing given position on the market
+    function collateralFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 collateral_);
+
+    // value of given position on the market
+    function valueFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 value_);
+
+    // notional of given position on the market
+    function notionalFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 notional_);
+
+    // whether given position is liquidatable on the market
+    function liquidatableFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (bool liquidatable_);
+
+    // liquidation fee rewarded to liquidator for given position on market
+    function liquidationFeeFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 liquidationFee_);
+
+    // liquidation price for given position on market
+    function liquidationPriceFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 liquidationPrice_);
+
+    // collateral backing each of given positions on the market
+    function collateralsFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (uint256[] memory collaterals_);
+
+    // value of each of given positions on the market
+    function valuesFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (uint256[] memory values_);
+
+    // notional of each of given positions on the market
+    function notionalsFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (uint256[] memory notionals_);
+
+    // whether each of given positions is liquidatable on the market
+    function liquidatablesFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (bool[] memory liquidatables_);
+
+    // liquidation fee rewarded to liquidator for each of given positions on market
+    function liquidationFeesFromPositions(
+        IOverlayV1Market market,
+        Position.Info[] memory positions
+    ) external view returns (uint256[] memory liquidationFees_);
+
+    // liquidation price for each of given positions on market
+    function liquidationPricesFromPositions(
+        IOverlayV1Market market,
+        Position.Info[] memory positions
+    ) external view returns (uint256[] memory liquidationPrices_);
 }
@@ -0,0 +1,44 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+
+import "./IOverlayV1BaseState.sol";
+import "./IOverlayV1OIState.sol";
+import "./IOverlayV1PositionState.sol";
+import "./IOverlayV1PriceState.sol";
+
+interface IOverlayV1ProjectionState is
+    IOverlayV1BaseState,
+    IOverlayV1PriceState,
+    IOverlayV1OIState,
+    IOverlayV1PositionState
+{
+    struct MarketProjection {
+        uint256 timestamp;
+        uint256 oiLong;
+        uint256 oiShort;
+        int256 fundingRate;
+    }
+
+    struct PositionProjection {
+        uint256 timestamp;
+        uint256 value;
+        uint256 notional;
+        bool liquidatable;
+    }
+
+    // projected open interest and funding rate on market at future timestamps
+    function marketProjection(IOverlayV1Market market, uint256[] memory timestamps)
+        external
+        view
+        returns (MarketProjection[] memory projections_);
+
+    // projected value, notional and liquidation state of position at future timestamps
+    function positionProjection(
+        IOverlayV1Market market,
+        address owner,
+        uint256 id,
+        uint256[] memory timestamps
+    ) external view returns (PositionProjection[] memory projections_);
+}
@@ -0,0 +1,12 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+/// @title A Uniswap V3 position manager stand in for local tests
+contract NonfungiblePositionManagerMock {
+    address public immutable factory;
+    string public constant name = "Uniswap V3 Positions NFT-V1";
+
+    constructor(address _factory) {
+        factory = _factory;
+    }
+}
@@ -0,0 +1,43 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "./UniswapV3PoolMock.sol";
+
+/// @title A Uniswap V3 factory stand in for local tests deploying pools
+/// @title with a constant tick and liquidity
+contract UniswapV3FactoryMock {
+    address public owner;
+
+    mapping(uint24 => int24) public feeAmountTickSpacing;
+    mapping(address => mapping(address => mapping(uint24 => address))) public getPool;
+
+    constructor() {
+        owner = msg.sender;
+        feeAmountTickSpacing[500] = 10;
+        feeAmountTickSpacing[3000] = 60;
+        feeAmountTickSpacing[10000] = 200;
+    }
+
+    /// @dev tick is for the price of token0 in terms of token1 after sorting
+    function createPool(
+        address tokenA,
+        address tokenB,
+        uint24 fee,
+        int24 tick,
+        uint128 liquidity
+    ) external returns (address pool) {
+        require(tokenA != tokenB, "tokenA == tokenB");
+        (address token0, address token1) = tokenA < tokenB
+            ? (tokenA, tokenB)
+            : (tokenB, tokenA);
+        int24 tickSpacing = feeAmountTickSpacing[fee];
+        require(tickSpacing != 0, "!fee");
+        require(getPool[token0][token1][fee] == address(0), "pool exists");
+
+        pool = address(
+            new UniswapV3PoolMock(token0, token1, fee, tickSpacing, tick, liquidity)
+        );
+        getPool[token0][token1][fee] = pool;
+        getPool[token1][token0][fee] = pool;
+    }
+}
@@ -0,0 +1,85 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+/// @title A Uniswap V3 pool stand in for local tests with a constant tick
+/// @title and liquidity over all time
+/// @dev observations are computed as if the pool had the same tick and
+/// @dev liquidity since timestamp zero, so observe works for any seconds ago
+contract UniswapV3PoolMock {
+    address public immutable factory;
+    address public immutable token0;
+    address public immutable token1;
+    uint24 public immutable fee;
+    int24 public immutable tickSpacing;
+
+    int24 public immutable tick;
+    uint128 public immutable liquidity;
+
+    uint16 public observationCardinalityNext = 1;
+
+    constructor(
+        address _token0,
+        address _token1,
+        uint24 _fee,
+        int24 _tickSpacing,
+        int24 _tick,
+        uint128 _liquidity
+    ) {
+        require(_liquidity > 0, "liquidity == 0");
+        factory = msg.sender;
+        token0 = _token0;
+        token1 = _token1;
+        fee = _fee;
+        tickSpacing = _tickSpacing;
+        tick = _tick;
+        liquidity = _liquidity;
+    }
+
+    /// @dev sqrtPriceX96 is not used by Overlay feeds so is left zero
+    function slot0()
+        external
+        view
+        returns (
+            uint160 sqrtPriceX96,
+            int24 tick_,
+            uint16 observationIndex,
+            uint16 observationCardinality,
+            uint16 observationCardinalityNext_,
+            uint8 feeProtocol,
+            bool unlocked
+        )
+    {
+        return (
+            0,
+            tick,
+            0,
+            observationCardinalityNext,
+            observationCardinalityNext,
+            0,
+            true
+        );
+    }
+
+    function increaseObservationCardinalityNext(uint16 _observationCardinalityNext) external {
+        if (_observationCardinalityNext > observationCardinalityNext) {
+            observationCardinalityNext = _observationCardinalityNext;
+        }
+    }
+
+    function observe(uint32[] calldata secondsAgos)
+        external
+        view
+        returns (
+            int56[] memory tickCumulatives,
+            uint160[] memory secondsPerLiquidityCumulativeX128s
+        )
+    {
+        tickCumulatives = new int56[](secondsAgos.length);
+        secondsPerLiquidityCumulativeX128s = new uint160[](secondsAgos.length);
+        for (uint256 i = 0; i < secondsAgos.length; i++) {
+            uint256 time = block.timestamp - secondsAgos[i];
+            tickCumulatives[i] = int56(tick) * int56(uint56(time));
+            secondsPerLiquidityCumulativeX128s[i] = uint160((time << 128) / liquidity);
+        }
+    }
+}
@@ -0,0 +1,110 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@uniswap/v3-core/contracts/interfaces/IERC20Minimal.sol";
+
+import "../interfaces/uniswap/v3-staker/IUniswapV3Staker.sol";
+import "../libraries/uniswap/v3-staker/IncentiveId.sol";
+
+import "./UniswapV3FactoryMock.sol";
+
+/// @title A Uniswap V3 staker stand in for local tests that only supports
+/// @title creating incentives
+contract UniswapV3StakerMock {
+    // max tick for uniswap v3 pools
+    int24 private constant MAX_TICK = 887272;
+
+    struct Incentive {
+        uint256 totalRewardUnclaimed;
+        uint160 totalSecondsClaimedX128;
+        uint96 numberOfStakes;
+    }
+
+    UniswapV3FactoryMock public immutable factory;
+    address public immutable nonfungiblePositionManager;
+    uint256 public immutable maxIncentiveStartLeadTime;
+    uint256 public immutable maxIncentiveDuration;
+
+    mapping(bytes32 => Incentive) public incentives;
+
+    event IncentiveCreated(
+        IERC20Minimal indexed rewardToken,
+        IUniswapV3Pool indexed pool,
+        uint256 startTime,
+        uint256 endTime,
+        int24 minWidth,
+        address refundee,
+        uint256 reward
+    );
+
+    constructor(
+        UniswapV3FactoryMock _factory,
+        address _nonfungiblePositionManager,
+        uint256 _maxIncentiveStartLeadTime,
+        uint256 _maxIncentiveDuration
+    ) {
+        factory = _factory;
+        nonfungiblePositionManager = _nonfungiblePositionManager;
+        maxIncentiveStartLeadTime = _maxIncentiveStartLeadTime;
+        maxIncentiveDuration = _maxIncentiveDuration;
+    }
+
+    function createIncentive(IUniswapV3Staker.IncentiveKey memory key, uint256 reward)
+        public
+    {
+        require(reward > 0, "reward must be positive");
+        require(block.timestamp <= key.startTime, "start time must be now or in the future");
+        require(
+            key.startTime - block.timestamp <= maxIncentiveStartLeadTime,
+            "start time too far into future"
+        );
+        require(key.startTime < key.endTime, "start time must be before end time");
+        require(
+            key.endTime - key.startTime <= maxIncentiveDuration,
+            "incentive duration is too long"
+        );
+
+        bytes32 incentiveId = IncentiveId.compute(key);
+        incentives[incentiveId].totalRewardUnclaimed += reward;
+        key.rewardToken.transferFrom(msg.sender, address(this), reward);
+
+        emit IncentiveCreated(
+            key.rewardToken,
+            key.pool,
+            key.startTime,
+            key.endTime,
+            key.minWidth,
+            key.refundee,
+            reward
+        );
+    }
+
+    /// @dev sets minWidth to the max tick range for the pool tick spacing
+    function createIncentiveWithMaxRange(
+        IERC20Minimal rewardToken,
+        uint256 startTime,
+        uint256 endTime,
+        address refundee,
+        uint256 reward,
+        address token0,
+        address token1,
+        uint24 fee
+    ) external {
+        address pool = factory.getPool(token0, token1, fee);
+        require(pool != address(0), "!pool");
+
+        int24 tickSpacing = factory.feeAmountTickSpacing(fee);
+        int24 minWidth = 2 * ((MAX_TICK / tickSpacing) * tickSpacing);
+        createIncentive(
+            IUniswapV3Staker.IncentiveKey({
+                rewardToken: rewardToken,
+                pool: IUniswapV3Pool(pool),
+                startTime: startTime,
+                endTime: endTime,
+                minWidth: minWidth,
+                refundee: refundee
+            }),
+            reward
+        );
+    }
+}
@@ -34,6 +34,16 @@ abstract contract OverlayV1OIState is IOverlayV1OIState, OverlayV1BaseState, Ove
         internal
         view
         returns (uint256 oiLong_, uint256 oiShort_)
+    {
+        (oiLong_, oiShort_) = _oisAt(market, block.timestamp);
+    }
+
+    /// @dev oi values at the given timestamp accounting for funding
+    /// @dev assumes no market updates occur before timestamp
+    function _oisAt(IOverlayV1Market market, uint256 timestamp)
+        internal
+        view
+        returns (uint256 oiLong_, uint256 oiShort_)
     {
         // oiLong/Short values before funding adjustments
         oiLong_ = market.oiLong();
@@ -41,7 +51,7 @@ abstract contract OverlayV1OIState is IOverlayV1OIState, OverlayV1BaseState, Ove
 
         // time elapsed since funding last paid
         // if > 0, adjust for funding
-        uint256 timeElapsed = block.timestamp - market.timestampUpdateLast();
+        uint256 timeElapsed = timestamp - market.timestampUpdateLast();
         if (timeElapsed > 0) {
             // determine overweight vs underweight side
             bool isLongOverweight = oiLong_ > oiShort_;
@@ -95,7 +105,17 @@ abstract contract OverlayV1OIState is IOverlayV1OIState, OverlayV1BaseState, Ove
     /// @dev f = 2 * k * ( oiLong - oiShort ) / (oiLong + oiShort)
     /// @dev such that long > short then positive
     function _fundingRate(IOverlayV1Market market) internal view returns (int256 fundingRate_) {
-        (uint256 oiLong, uint256 oiShort) = _ois(market);
+        fundingRate_ = _fundingRateAt(market, block.timestamp);
+    }
+
+    /// @dev funding rate at the given timestamp
+    /// @dev assumes no market updates occur before timestamp
+    function _fundingRateAt(IOverlayV1Market market, uint256 timestamp)
+        internal
+        view
+        returns (int256 fundingRate_)
+    {
+        (uint256 oiLong, uint256 oiShort) = _oisAt(market, timestamp);
 
         // determine overweight vs underweight side
         bool isLongOverweight = oiLong > oiShort;
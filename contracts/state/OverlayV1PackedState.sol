@@ -0,0 +1,148 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@openzeppelin/contracts/utils/math/SafeCast.sol";
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Oracle.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Position.sol";
+
+import "../interfaces/state/IOverlayV1PackedState.sol";
+
+import "./OverlayV1BaseState.sol";
+import "./OverlayV1OIState.sol";
+import "./OverlayV1PositionState.sol";
+import "./OverlayV1PriceState.sol";
+
+abstract contract OverlayV1PackedState is
+    IOverlayV1PackedState,
+    OverlayV1BaseState,
+    OverlayV1PriceState,
+    OverlayV1OIState,
+    OverlayV1PositionState
+{
+    using SafeCast for uint256;
+
+    // byte length of each packed position record
+    uint256 internal constant POSITION_PACKED_SIZE = 63;
+
+    // byte length of each packed position values record
+    uint256 internal constant POSITION_VALUES_PACKED_SIZE = 65;
+
+    /// @dev allocates bytes of given length with an extra word of slack
+    /// @dev at the end so full word writes of the last record do not
+    /// @dev spill into memory allocated after
+    function _allocatePacked(uint256 length) private pure returns (bytes memory packed_) {
+        packed_ = new bytes(length + 32);
+        assembly {
+            mstore(packed_, length)
+        }
+    }
+
+    /// @dev writes position to packed at offset as the big-endian record:
+    /// @dev notionalInitial (uint96), debtInitial (uint96), midTick (int24),
+    /// @dev entryTick (int24), flags (uint8; bit 0 = isLong,
+    /// @dev bit 1 = liquidated), oiShares (uint240), fractionRemaining (uint16)
+    /// @dev each mstore writes a full word so fields must be written in
+    /// @dev order. Last write spills past the record into the next record
+    /// @dev or the slack word from _allocatePacked
+    function _packPosition(
+        bytes memory packed,
+        uint256 offset,
+        Position.Info memory position
+    ) private pure {
+        uint256 notionalInitial = position.notionalInitial;
+        uint256 debtInitial = position.debtInitial;
+        int256 midTick = position.midTick;
+        int256 entryTick = position.entryTick;
+        uint256 flags = (position.isLong ? 1 : 0) | (position.liquidated ? 2 : 0);
+        uint256 oiShares = position.oiShares;
+        uint256 fractionRemaining = position.fractionRemaining;
+        assembly {
+            let ptr := add(add(packed, 32), offset)
+            mstore(ptr, shl(160, notionalInitial))
+            mstore(add(ptr, 12), shl(160, debtInitial))
+            mstore(add(ptr, 24), shl(232, and(midTick, 0xffffff)))
+            mstore(add(ptr, 27), shl(232, and(entryTick, 0xffffff)))
+            mstore(add(ptr, 30), shl(248, flags))
+            mstore(add(ptr, 31), shl(16, oiShares))
+            mstore(add(ptr, 61), shl(240, fractionRemaining))
+        }
+    }
+
+    /// @dev writes current position values to packed at offset as the
+    /// @dev big-endian record: value (uint128), notional (uint128),
+    /// @dev collateral (uint128), liquidationFee (uint128),
+    /// @dev flags (uint8; bit 0 = liquidatable)
+    /// @dev values are computed from market inputs loaded once per batch
+    function _packPositionValues(
+        bytes memory packed,
+        uint256 offset,
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        MarketInputs memory inputs,
+        Position.Info memory position
+    ) private view {
+        uint256 value = _valueFromInputs(market, data, inputs, position).toUint128();
+        uint256 notional = _notionalFromInputs(market, data, inputs, position).toUint128();
+        uint256 collateral = _collateralFromInputs(inputs, position).toUint128();
+        uint256 liquidationFee = _liquidationFeeFromInputs(data, inputs, position).toUint128();
+        uint256 flags = _liquidatableFromInputs(data, inputs, position) ? 1 : 0;
+        assembly {
+            let ptr := add(add(packed, 32), offset)
+            mstore(ptr, shl(128, value))
+            mstore(add(ptr, 16), shl(128, notional))
+            mstore(add(ptr, 32), shl(128, collateral))
+            mstore(add(ptr, 48), shl(128, liquidationFee))
+            mstore(add(ptr, 64), shl(248, flags))
+        }
+    }
+
+    /// @notice Gets the positions from the Overlay market for the given
+    /// @notice position owners and ids tightly packed into fixed width
+    /// @notice records of 63 bytes each
+    /// @dev see _packPosition for the record layout
+    /// @return packed_ as the packed positions in order of owners, ids
+    function positionsPacked(
+        IOverlayV1Market market,
+        address[] memory owners,
+        uint256[] memory ids
+    ) external view returns (bytes memory packed_) {
+        require(owners.length == ids.length, "OVLV1: !length");
+        packed_ = _allocatePacked(owners.length * POSITION_PACKED_SIZE);
+        for (uint256 i = 0; i < owners.length; i++) {
+            Position.Info memory position = _getPosition(market, owners[i], ids[i]);
+            _packPosition(packed_, i * POSITION_PACKED_SIZE, position);
+        }
+    }
+
+    /// @notice Gets the current value, notional, collateral, liquidation fee
+    /// @notice and liquidation state of the positions on the Overlay market
+    /// @notice for the given position owners and ids tightly packed into
+    /// @notice fixed width records of 65 bytes each
+    /// @dev see _packPositionValues for the record layout. Fetches oracle
+    /// @dev data and market inputs once for all positions
+    /// @return packed_ as the packed position values in order of owners, ids
+    function positionValuesPacked(
+        IOverlayV1Market market,
+        address[] memory owners,
+        uint256[] memory ids
+    ) external view returns (bytes memory packed_) {
+        require(owners.length == ids.length, "OVLV1: !length");
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        MarketInputs memory inputs = _marketInputsPriced(market, data);
+
+        packed_ = _allocatePacked(owners.length * POSITION_VALUES_PACKED_SIZE);
+        for (uint256 i = 0; i < owners.length; i++) {
+            Position.Info memory position = _getPosition(market, owners[i], ids[i]);
+            _packPositionValues(
+                packed_,
+                i * POSITION_VALUES_PACKED_SIZE,
+                market,
+                data,
+                inputs,
+                position
+            );
+        }
+    }
+}
@@ -6,6 +6,7 @@ import "@overlay-protocol/v1-core/contracts/libraries/FixedPoint.sol";
 import "@overlay-protocol/v1-core/contracts/libraries/Oracle.sol";
 import "@overlay-protocol/v1-core/contracts/libraries/Position.sol";
 import "@overlay-protocol/v1-core/contracts/libraries/Risk.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Roller.sol";
 
 import "../interfaces/state/IOverlayV1PositionState.sol";
 
@@ -22,6 +23,22 @@ abstract contract OverlayV1PositionState is
     using FixedPoint for uint256;
     using Position for Position.Info;
 
+    // market inputs shared by all positions in a batch view, read from
+    // the market once per batch instead of once per position
+    struct MarketInputs {
+        uint256 oiLong; // oi long accounting for funding
+        uint256 oiShort; // oi short accounting for funding
+        uint256 oiLongShares;
+        uint256 oiShortShares;
+        uint256 capPayoff;
+        uint256 maintenanceMarginFraction;
+        uint256 liquidationFeeRate;
+        // only loaded by views that price positions at the bid or ask
+        uint256 capOi;
+        Roller.Snapshot snapshotVolumeBid;
+        Roller.Snapshot snapshotVolumeAsk;
+    }
+
     /// @notice Gets the position from the given market for the
     /// @notice position owner and position id
     function _getPosition(
@@ -131,13 +148,24 @@ abstract contract OverlayV1PositionState is
         IOverlayV1Market market,
         Oracle.Data memory data,
         Position.Info memory position
+    ) internal view returns (uint256 value_) {
+        value_ = _valueAt(market, data, position, block.timestamp);
+    }
+
+    /// @dev value of the individual position at the given timestamp
+    /// @dev holding oracle data fixed
+    function _valueAt(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        Position.Info memory position,
+        uint256 timestamp
     ) internal view returns (uint256 value_) {
         // assume entire position value such that fraction = ONE
         uint256 fraction = FixedPoint.ONE;
 
         // get the attributes needed to calculate position value:
         // oiLong/Short, oiLongShares/oiShortShares, price, capPayoff
-        (uint256 oiLong, uint256 oiShort) = _ois(market);
+        (uint256 oiLong, uint256 oiShort) = _oisAt(market, timestamp);
 
         // aggregate oi values on market
         uint256 oiTotalOnSide = position.isLong ? oiLong : oiShort;
@@ -151,8 +179,8 @@ abstract contract OverlayV1PositionState is
         // current price is price position would receive if unwound
         // longs get the bid on unwind, shorts get the ask
         uint256 currentPrice = position.isLong
-            ? _bid(market, data, _fractionOfCapOi(market, data, oi))
-            : _ask(market, data, _fractionOfCapOi(market, data, oi));
+            ? _bidAt(market, data, _fractionOfCapOi(market, data, oi), timestamp)
+            : _askAt(market, data, _fractionOfCapOi(market, data, oi), timestamp);
 
         // get cap payoff from risk params
         uint256 capPayoff = market.params(uint256(Risk.Parameters.CapPayoff));
@@ -172,13 +200,24 @@ abstract contract OverlayV1PositionState is
         IOverlayV1Market market,
         Oracle.Data memory data,
         Position.Info memory position
+    ) internal view returns (uint256 notional_) {
+        notional_ = _notionalAt(market, data, position, block.timestamp);
+    }
+
+    /// @dev notional (including PnL) of the individual position at the
+    /// @dev given timestamp holding oracle data fixed
+    function _notionalAt(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        Position.Info memory position,
+        uint256 timestamp
     ) internal view returns (uint256 notional_) {
         // assume entire position value such that fraction = ONE
         uint256 fraction = FixedPoint.ONE;
 
         // get the attributes needed to calculate position notional:
         // oiLong/Short, oiLongShares/oiShortShares, price, capPayoff
-        (uint256 oiLong, uint256 oiShort) = _ois(market);
+        (uint256 oiLong, uint256 oiShort) = _oisAt(market, timestamp);
 
         // aggregate oi values on market
         uint256 oiTotalOnSide = position.isLong ? oiLong : oiShort;
@@ -192,8 +231,8 @@ abstract contract OverlayV1PositionState is
         // current price is price position would receive if unwound
         // longs get the bid on unwind, shorts get the ask
         uint256 currentPrice = position.isLong
-            ? _bid(market, data, _fractionOfCapOi(market, data, oi))
-            : _ask(market, data, _fractionOfCapOi(market, data, oi));
+            ? _bidAt(market, data, _fractionOfCapOi(market, data, oi), timestamp)
+            : _askAt(market, data, _fractionOfCapOi(market, data, oi), timestamp);
 
         // get cap payoff from risk params
         uint256 capPayoff = market.params(uint256(Risk.Parameters.CapPayoff));
@@ -255,10 +294,21 @@ abstract contract OverlayV1PositionState is
         IOverlayV1Market market,
         Oracle.Data memory data,
         Position.Info memory position
+    ) internal view returns (bool liquidatable_) {
+        liquidatable_ = _liquidatableAt(market, data, position, block.timestamp);
+    }
+
+    /// @dev liquidation state of the individual position at the given
+    /// @dev timestamp holding oracle data fixed
+    function _liquidatableAt(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        Position.Info memory position,
+        uint256 timestamp
     ) internal view returns (bool liquidatable_) {
         // get the attributes needed to calculate position notional:
         // oiLong/Short, oiLongShares/oiShortShares, price, capPayoff
-        (uint256 oiLong, uint256 oiShort) = _ois(market);
+        (uint256 oiLong, uint256 oiShort) = _oisAt(market, timestamp);
 
         // aggregate oi values on market
         uint256 oiTotalOnSide = position.isLong ? oiLong : oiShort;
@@ -313,6 +363,227 @@ abstract contract OverlayV1PositionState is
         maintenanceMargin_ = q.mulUp(maintenanceMarginFraction);
     }
 
+    /// @dev current liquidation price of the individual position
+    function _liquidationPrice(IOverlayV1Market market, Position.Info memory position)
+        internal
+        view
+        returns (uint256 liquidationPrice_)
+    {
+        // get position attributes independent of funding
+        uint256 entryPrice = position.entryPrice();
+        uint256 liquidationFeeRate = market.params(uint256(Risk.Parameters.LiquidationFeeRate));
+        uint256 maintenanceMargin = _maintenanceMargin(market, position);
+
+        // get position attributes dependent on funding
+        uint256 oi = _oi(market, position);
+        uint256 collateral = _collateral(market, position);
+        require(oi > 0, "OVLV1: oi == 0");
+
+        // get price delta from entry price: dp = | liqPrice - entryPrice |
+        uint256 dp = collateral
+            .subFloor(maintenanceMargin.divUp(FixedPoint.ONE - liquidationFeeRate))
+            .divUp(oi);
+        liquidationPrice_ = position.isLong ? entryPrice.subFloor(dp) : entryPrice + dp;
+    }
+
+    /// @dev market inputs for batch views that don't price at bid or ask
+    function _marketInputs(IOverlayV1Market market)
+        internal
+        view
+        returns (MarketInputs memory inputs_)
+    {
+        (inputs_.oiLong, inputs_.oiShort) = _ois(market);
+        inputs_.oiLongShares = market.oiLongShares();
+        inputs_.oiShortShares = market.oiShortShares();
+        inputs_.capPayoff = market.params(uint256(Risk.Parameters.CapPayoff));
+        inputs_.maintenanceMarginFraction = market.params(
+            uint256(Risk.Parameters.MaintenanceMarginFraction)
+        );
+        inputs_.liquidationFeeRate = market.params(uint256(Risk.Parameters.LiquidationFeeRate));
+    }
+
+    /// @dev market inputs for batch views that price at bid or ask
+    function _marketInputsPriced(IOverlayV1Market market, Oracle.Data memory data)
+        internal
+        view
+        returns (MarketInputs memory inputs_)
+    {
+        inputs_ = _marketInputs(market);
+        inputs_.capOi = _capOi(market, data);
+        inputs_.snapshotVolumeBid = _snapshotVolumeBid(market);
+        inputs_.snapshotVolumeAsk = _snapshotVolumeAsk(market);
+    }
+
+    /// @dev aggregate oi and oi shares on the side of the position
+    function _oisOnSide(MarketInputs memory inputs, Position.Info memory position)
+        internal
+        pure
+        returns (uint256 oiTotalOnSide_, uint256 oiTotalSharesOnSide_)
+    {
+        oiTotalOnSide_ = position.isLong ? inputs.oiLong : inputs.oiShort;
+        oiTotalSharesOnSide_ = position.isLong ? inputs.oiLongShares : inputs.oiShortShares;
+    }
+
+    /// @dev price position would receive if unwound given its current oi
+    /// @dev longs get the bid on unwind, shorts get the ask
+    function _unwindPriceFromInputs(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        MarketInputs memory inputs,
+        Position.Info memory position,
+        uint256 oi
+    ) internal view returns (uint256 price_) {
+        // fractionOfCapOi = oi / capOi, handling the capOi == 0 edge case
+        uint256 fractionOfCapOi = inputs.capOi == 0 ? type(uint256).max : oi.divDown(inputs.capOi);
+        if (position.isLong) {
+            uint256 volume = _volumeFromSnapshot(
+                inputs.snapshotVolumeBid,
+                data,
+                fractionOfCapOi,
+                block.timestamp
+            );
+            price_ = market.bid(data, volume);
+        } else {
+            uint256 volume = _volumeFromSnapshot(
+                inputs.snapshotVolumeAsk,
+                data,
+                fractionOfCapOi,
+                block.timestamp
+            );
+            price_ = market.ask(data, volume);
+        }
+    }
+
+    /// @dev current collateral backing the position from batch inputs
+    function _collateralFromInputs(MarketInputs memory inputs, Position.Info memory position)
+        internal
+        view
+        returns (uint256 collateral_)
+    {
+        // assume entire position value such that fraction = ONE
+        uint256 fraction = FixedPoint.ONE;
+        uint256 q = Position.notionalInitial(position, fraction);
+        uint256 d = Position.debtInitial(position, fraction);
+        uint256 oiInitial = position.oiInitial(fraction);
+
+        // position's current oi factoring in funding
+        (uint256 oiTotalOnSide, uint256 oiTotalSharesOnSide) = _oisOnSide(inputs, position);
+        uint256 oiCurrent = position.oiCurrent(fraction, oiTotalOnSide, oiTotalSharesOnSide);
+
+        // return the collateral
+        collateral_ = q.mulUp(oiCurrent).divUp(oiInitial).subFloor(d);
+    }
+
+    /// @dev current value of the position from batch inputs
+    function _valueFromInputs(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        MarketInputs memory inputs,
+        Position.Info memory position
+    ) internal view returns (uint256 value_) {
+        // assume entire position value such that fraction = ONE
+        uint256 fraction = FixedPoint.ONE;
+        (uint256 oiTotalOnSide, uint256 oiTotalSharesOnSide) = _oisOnSide(inputs, position);
+        uint256 oi = position.oiCurrent(fraction, oiTotalOnSide, oiTotalSharesOnSide);
+        uint256 currentPrice = _unwindPriceFromInputs(market, data, inputs, position, oi);
+
+        // return current value
+        value_ = position.value(
+            fraction,
+            oiTotalOnSide,
+            oiTotalSharesOnSide,
+            currentPrice,
+            inputs.capPayoff
+        );
+    }
+
+    /// @dev current notional (including PnL) of the position from batch
+    /// @dev inputs
+    function _notionalFromInputs(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        MarketInputs memory inputs,
+        Position.Info memory position
+    ) internal view returns (uint256 notional_) {
+        // assume entire position value such that fraction = ONE
+        uint256 fraction = FixedPoint.ONE;
+        (uint256 oiTotalOnSide, uint256 oiTotalSharesOnSide) = _oisOnSide(inputs, position);
+        uint256 oi = position.oiCurrent(fraction, oiTotalOnSide, oiTotalSharesOnSide);
+        uint256 currentPrice = _unwindPriceFromInputs(market, data, inputs, position, oi);
+
+        // return current notional with PnL
+        notional_ = position.notionalWithPnl(
+            fraction,
+            oiTotalOnSide,
+            oiTotalSharesOnSide,
+            currentPrice,
+            inputs.capPayoff
+        );
+    }
+
+    /// @dev current liquidation state of the position from batch inputs
+    /// @dev liquidations exit at the mid price
+    function _liquidatableFromInputs(
+        Oracle.Data memory data,
+        MarketInputs memory inputs,
+        Position.Info memory position
+    ) internal view returns (bool liquidatable_) {
+        (uint256 oiTotalOnSide, uint256 oiTotalSharesOnSide) = _oisOnSide(inputs, position);
+        liquidatable_ = position.liquidatable(
+            oiTotalOnSide,
+            oiTotalSharesOnSide,
+            _mid(data),
+            inputs.capPayoff,
+            inputs.maintenanceMarginFraction,
+            inputs.liquidationFeeRate
+        );
+    }
+
+    /// @dev current liquidation fee rewarded to liquidator of position
+    /// @dev from batch inputs
+    function _liquidationFeeFromInputs(
+        Oracle.Data memory data,
+        MarketInputs memory inputs,
+        Position.Info memory position
+    ) internal view returns (uint256 liquidationFee_) {
+        if (_liquidatableFromInputs(data, inputs, position)) {
+            // value on liquidation is at the mid price
+            (uint256 oiTotalOnSide, uint256 oiTotalSharesOnSide) = _oisOnSide(inputs, position);
+            uint256 value = position.value(
+                FixedPoint.ONE,
+                oiTotalOnSide,
+                oiTotalSharesOnSide,
+                _mid(data),
+                inputs.capPayoff
+            );
+            liquidationFee_ = value.mulDown(inputs.liquidationFeeRate);
+        }
+    }
+
+    /// @dev current liquidation price of the position from batch inputs
+    function _liquidationPriceFromInputs(MarketInputs memory inputs, Position.Info memory position)
+        internal
+        view
+        returns (uint256 liquidationPrice_)
+    {
+        // get position attributes independent of funding
+        uint256 entryPrice = position.entryPrice();
+        uint256 q = Position.notionalInitial(position, FixedPoint.ONE);
+        uint256 maintenanceMargin = q.mulUp(inputs.maintenanceMarginFraction);
+
+        // get position attributes dependent on funding
+        (uint256 oiTotalOnSide, uint256 oiTotalSharesOnSide) = _oisOnSide(inputs, position);
+        uint256 oi = position.oiCurrent(FixedPoint.ONE, oiTotalOnSide, oiTotalSharesOnSide);
+        uint256 collateral = _collateralFromInputs(inputs, position);
+        require(oi > 0, "OVLV1: oi == 0");
+
+        // get price delta from entry price: dp = | liqPrice - entryPrice |
+        uint256 dp = collateral
+            .subFloor(maintenanceMargin.divUp(FixedPoint.ONE - inputs.liquidationFeeRate))
+            .divUp(oi);
+        liquidationPrice_ = position.isLong ? entryPrice.subFloor(dp) : entryPrice + dp;
+    }
+
     /// @notice Gets the position from the Overlay market or the given
     /// @notice position owner and position id
     function position(
@@ -495,23 +766,200 @@ abstract contract OverlayV1PositionState is
         address owner,
         uint256 id
     ) external view returns (uint256 liquidationPrice_) {
-        address feed = market.feed();
         Position.Info memory position = _getPosition(market, owner, id);
+        liquidationPrice_ = _liquidationPrice(market, position);
+    }
 
-        // get position attributes independent of funding
-        uint256 entryPrice = position.entryPrice();
-        uint256 liquidationFeeRate = market.params(uint256(Risk.Parameters.LiquidationFeeRate));
-        uint256 maintenanceMargin = _maintenanceMargin(market, position);
+    /// @notice Gets the current collateral backing the given position
+    /// @notice on the Overlay market
+    /// @dev skips the position lookup on the market for callers that
+    /// @dev already have the position info
+    /// @return collateral_ as the current collateral backing the position
+    function collateralFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 collateral_)
+    {
+        collateral_ = _collateral(market, position);
+    }
 
-        // get position attributes dependent on funding
-        uint256 oi = _oi(market, position);
-        uint256 collateral = _collateral(market, position);
-        require(oi > 0, "OVLV1: oi == 0");
+    /// @notice Gets the current value of the given position on the
+    /// @notice Overlay market
+    /// @dev skips the position lookup on the market for callers that
+    /// @dev already have the position info
+    /// @return value_ as the current value of the position
+    function valueFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 value_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        value_ = _value(market, data, position);
+    }
 
-        // get price delta from entry price: dp = | liqPrice - entryPrice |
-        uint256 dp = collateral
-            .subFloor(maintenanceMargin.divUp(FixedPoint.ONE - liquidationFeeRate))
-            .divUp(oi);
-        liquidationPrice_ = position.isLong ? entryPrice.subFloor(dp) : entryPrice + dp;
+    /// @notice Gets the current notional of the given position on the
+    /// @notice Overlay market (accounts for PnL)
+    /// @dev skips the position lookup on the market for callers that
+    /// @dev already have the position info
+    /// @return notional_ as the current notional of the position
+    function notionalFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 notional_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        notional_ = _notional(market, data, position);
+    }
+
+    /// @notice Gets whether the given position is currently liquidatable
+    /// @notice on the Overlay market
+    /// @dev skips the position lookup on the market for callers that
+    /// @dev already have the position info
+    /// @return liquidatable_ as whether the position is liquidatable
+    function liquidatableFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (bool liquidatable_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        liquidatable_ = _liquidatable(market, data, position);
+    }
+
+    /// @notice Gets the liquidation fee rewarded to the liquidator if
+    /// @notice the given position currently liquidatable on the Overlay market
+    /// @dev liquidationFee_ == 0 if not liquidatable
+    /// @return liquidationFee_ as the current liquidation fee reward
+    function liquidationFeeFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 liquidationFee_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        liquidationFee_ = _liquidationFee(market, data, position);
+    }
+
+    /// @notice Gets the current liquidation price of the given position
+    /// @notice on the Overlay market
+    /// @dev reverts if position oi == 0
+    /// @return liquidationPrice_ as the current liquidation price
+    function liquidationPriceFromPosition(IOverlayV1Market market, Position.Info memory position)
+        external
+        view
+        returns (uint256 liquidationPrice_)
+    {
+        liquidationPrice_ = _liquidationPrice(market, position);
+    }
+
+    /// @notice Gets the current collateral backing each of the given
+    /// @notice positions on the Overlay market
+    /// @dev reads market inputs once for all positions
+    /// @return collaterals_ as the current collateral backing each position
+    function collateralsFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (uint256[] memory collaterals_)
+    {
+        MarketInputs memory inputs = _marketInputs(market);
+
+        collaterals_ = new uint256[](positions.length);
+        for (uint256 i = 0; i < positions.length; i++) {
+            collaterals_[i] = _collateralFromInputs(inputs, positions[i]);
+        }
+    }
+
+    /// @notice Gets the current value of each of the given positions
+    /// @notice on the Overlay market
+    /// @dev fetches oracle data and market inputs once for all positions
+    /// @return values_ as the current value of each position
+    function valuesFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (uint256[] memory values_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        MarketInputs memory inputs = _marketInputsPriced(market, data);
+
+        values_ = new uint256[](positions.length);
+        for (uint256 i = 0; i < positions.length; i++) {
+            values_[i] = _valueFromInputs(market, data, inputs, positions[i]);
+        }
+    }
+
+    /// @notice Gets the current notional of each of the given positions
+    /// @notice on the Overlay market (accounts for PnL)
+    /// @dev fetches oracle data and market inputs once for all positions
+    /// @return notionals_ as the current notional of each position
+    function notionalsFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (uint256[] memory notionals_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        MarketInputs memory inputs = _marketInputsPriced(market, data);
+
+        notionals_ = new uint256[](positions.length);
+        for (uint256 i = 0; i < positions.length; i++) {
+            notionals_[i] = _notionalFromInputs(market, data, inputs, positions[i]);
+        }
+    }
+
+    /// @notice Gets whether each of the given positions is currently
+    /// @notice liquidatable on the Overlay market
+    /// @dev fetches oracle data and market inputs once for all positions
+    /// @return liquidatables_ as whether each position is liquidatable
+    function liquidatablesFromPositions(IOverlayV1Market market, Position.Info[] memory positions)
+        external
+        view
+        returns (bool[] memory liquidatables_)
+    {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        MarketInputs memory inputs = _marketInputs(market);
+
+        liquidatables_ = new bool[](positions.length);
+        for (uint256 i = 0; i < positions.length; i++) {
+            liquidatables_[i] = _liquidatableFromInputs(data, inputs, positions[i]);
+        }
+    }
+
+    /// @notice Gets the liquidation fee rewarded to the liquidator for each
+    /// @notice of the given positions on the Overlay market
+    /// @dev fetches oracle data and market inputs once for all positions
+    /// @return liquidationFees_ as the current liquidation fee for each position
+    function liquidationFeesFromPositions(
+        IOverlayV1Market market,
+        Position.Info[] memory positions
+    ) external view returns (uint256[] memory liquidationFees_) {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        MarketInputs memory inputs = _marketInputs(market);
+
+        liquidationFees_ = new uint256[](positions.length);
+        for (uint256 i = 0; i < positions.length; i++) {
+            liquidationFees_[i] = _liquidationFeeFromInputs(data, inputs, positions[i]);
+        }
+    }
+
+    /// @notice Gets the current liquidation price of each of the given
+    /// @notice positions on the Overlay market
+    /// @dev reverts if any position oi == 0
+    /// @dev reads market inputs once for all positions
+    /// @return liquidationPrices_ as the current liquidation price of each position
+    function liquidationPricesFromPositions(
+        IOverlayV1Market market,
+        Position.Info[] memory positions
+    ) external view returns (uint256[] memory liquidationPrices_) {
+        MarketInputs memory inputs = _marketInputs(market);
+
+        liquidationPrices_ = new uint256[](positions.length);
+        for (uint256 i = 0; i < positions.length; i++) {
+            liquidationPrices_[i] = _liquidationPriceFromInputs(inputs, positions[i]);
+        }
     }
 }
@@ -18,66 +18,135 @@ abstract contract OverlayV1PriceState is IOverlayV1PriceState, OverlayV1BaseStat
         IOverlayV1Market market,
         Oracle.Data memory data,
         uint256 fractionOfCapOi
+    ) internal view returns (uint256 bid_) {
+        bid_ = _bidAt(market, data, fractionOfCapOi, block.timestamp);
+    }
+
+    function _ask(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        uint256 fractionOfCapOi
+    ) internal view returns (uint256 ask_) {
+        ask_ = _askAt(market, data, fractionOfCapOi, block.timestamp);
+    }
+
+    function _mid(Oracle.Data memory data) internal view returns (uint256 mid_) {
+        mid_ = Math.average(data.priceOverMicroWindow, data.priceOverMacroWindow);
+    }
+
+    function _volumeBid(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        uint256 fractionOfCapOi
+    ) internal view returns (uint256 volume_) {
+        volume_ = _volumeBidAt(market, data, fractionOfCapOi, block.timestamp);
+    }
+
+    function _volumeAsk(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        uint256 fractionOfCapOi
+    ) internal view returns (uint256 volume_) {
+        volume_ = _volumeAskAt(market, data, fractionOfCapOi, block.timestamp);
+    }
+
+    /// @dev bid price at the given timestamp holding oracle data fixed
+    function _bidAt(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        uint256 fractionOfCapOi,
+        uint256 timestamp
     ) internal view returns (uint256 bid_) {
         // get the rolling volume on the bid
-        uint256 volume = _volumeBid(market, data, fractionOfCapOi);
+        uint256 volume = _volumeBidAt(market, data, fractionOfCapOi, timestamp);
 
         // get the bid price for market
         bid_ = market.bid(data, volume);
     }
 
-    function _ask(
+    /// @dev ask price at the given timestamp holding oracle data fixed
+    function _askAt(
         IOverlayV1Market market,
         Oracle.Data memory data,
-        uint256 fractionOfCapOi
+        uint256 fractionOfCapOi,
+        uint256 timestamp
     ) internal view returns (uint256 ask_) {
         // get the rolling volume on the ask
-        uint256 volume = _volumeAsk(market, data, fractionOfCapOi);
+        uint256 volume = _volumeAskAt(market, data, fractionOfCapOi, timestamp);
 
         // get the ask price for market
         ask_ = market.ask(data, volume);
     }
 
-    function _mid(Oracle.Data memory data) internal view returns (uint256 mid_) {
-        mid_ = Math.average(data.priceOverMicroWindow, data.priceOverMacroWindow);
+    /// @dev rolling volume on the bid at the given timestamp
+    function _volumeBidAt(
+        IOverlayV1Market market,
+        Oracle.Data memory data,
+        uint256 fractionOfCapOi,
+        uint256 timestamp
+    ) internal view returns (uint256 volume_) {
+        Roller.Snapshot memory snapshot = _snapshotVolumeBid(market);
+        volume_ = _volumeFromSnapshot(snapshot, data, fractionOfCapOi, timestamp);
     }
 
-    function _volumeBid(
+    /// @dev rolling volume on the ask at the given timestamp
+    function _volumeAskAt(
         IOverlayV1Market market,
         Oracle.Data memory data,
-        uint256 fractionOfCapOi
+        uint256 fractionOfCapOi,
+        uint256 timestamp
     ) internal view returns (uint256 volume_) {
-        // assemble the rolling volume snapshot
+        Roller.Snapshot memory snapshot = _snapshotVolumeAsk(market);
+        volume_ = _volumeFromSnapshot(snapshot, data, fractionOfCapOi, timestamp);
+    }
+
+    /// @dev rolling volume snapshot on the bid stored by the market
+    function _snapshotVolumeBid(IOverlayV1Market market)
+        internal
+        view
+        returns (Roller.Snapshot memory snapshot_)
+    {
         (uint32 timestamp, uint32 window, int192 accumulator) = market.snapshotVolumeBid();
-        Roller.Snapshot memory snapshot = Roller.Snapshot({
+        snapshot_ = Roller.Snapshot({
             timestamp: timestamp,
             window: window,
             accumulator: accumulator
         });
-        int256 value = int256(fractionOfCapOi);
-
-        // calculate the decay in rolling volume since last snapshot
-        snapshot = snapshot.transform(block.timestamp, data.microWindow, value);
-        volume_ = uint256(snapshot.cumulative());
     }
 
-    function _volumeAsk(
-        IOverlayV1Market market,
-        Oracle.Data memory data,
-        uint256 fractionOfCapOi
-    ) internal view returns (uint256 volume_) {
-        // assemble the rolling volume snapshot
+    /// @dev rolling volume snapshot on the ask stored by the market
+    function _snapshotVolumeAsk(IOverlayV1Market market)
+        internal
+        view
+        returns (Roller.Snapshot memory snapshot_)
+    {
         (uint32 timestamp, uint32 window, int192 accumulator) = market.snapshotVolumeAsk();
-        Roller.Snapshot memory snapshot = Roller.Snapshot({
+        snapshot_ = Roller.Snapshot({
             timestamp: timestamp,
             window: window,
             accumulator: accumulator
         });
+    }
+
+    /// @dev rolling volume at the given timestamp after adding the trade
+    /// @dev to the given snapshot. Leaves the snapshot untouched so
+    /// @dev batch views can reuse it across positions
+    function _volumeFromSnapshot(
+        Roller.Snapshot memory snapshot,
+        Oracle.Data memory data,
+        uint256 fractionOfCapOi,
+        uint256 timestamp
+    ) internal view returns (uint256 volume_) {
+        Roller.Snapshot memory rolled = Roller.Snapshot({
+            timestamp: snapshot.timestamp,
+            window: snapshot.window,
+            accumulator: snapshot.accumulator
+        });
         int256 value = int256(fractionOfCapOi);
 
         // calculate the decay in rolling volume since last snapshot
-        snapshot = snapshot.transform(block.timestamp, data.microWindow, value);
-        volume_ = uint256(snapshot.cumulative());
+        rolled = rolled.transform(timestamp, data.microWindow, value);
+        volume_ = uint256(rolled.cumulative());
     }
 
     /// @notice Gets the bid price trader will receive on the Overlay market
@@ -0,0 +1,78 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Oracle.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Position.sol";
+
+import "../interfaces/state/IOverlayV1ProjectionState.sol";
+
+import "./OverlayV1BaseState.sol";
+import "./OverlayV1OIState.sol";
+import "./OverlayV1PositionState.sol";
+import "./OverlayV1PriceState.sol";
+
+abstract contract OverlayV1ProjectionState is
+    IOverlayV1ProjectionState,
+    OverlayV1BaseState,
+    OverlayV1PriceState,
+    OverlayV1OIState,
+    OverlayV1PositionState
+{
+    /// @notice Gets the open interest values and funding rate on the Overlay
+    /// @notice market projected forward to each of the given timestamps
+    /// @dev assumes no market updates occur before each timestamp
+    /// @dev reverts if any timestamp is before the current block timestamp
+    /// @return projections_ as the projected market values at each timestamp
+    function marketProjection(IOverlayV1Market market, uint256[] memory timestamps)
+        external
+        view
+        returns (MarketProjection[] memory projections_)
+    {
+        projections_ = new MarketProjection[](timestamps.length);
+        for (uint256 i = 0; i < timestamps.length; i++) {
+            uint256 timestamp = timestamps[i];
+            require(timestamp >= block.timestamp, "OVLV1: timestamp < now");
+
+            (uint256 oiLong, uint256 oiShort) = _oisAt(market, timestamp);
+            projections_[i] = MarketProjection({
+                timestamp: timestamp,
+                oiLong: oiLong,
+                oiShort: oiShort,
+                fundingRate: _fundingRateAt(market, timestamp)
+            });
+        }
+    }
+
+    /// @notice Gets the value, notional and liquidation state of the position
+    /// @notice on the Overlay market for the given position owner, id
+    /// @notice projected forward to each of the given timestamps
+    /// @dev holds oracle data fixed at latest values so only funding and
+    /// @dev rolling volume decay change with time
+    /// @dev assumes no market updates occur before each timestamp
+    /// @dev reverts if any timestamp is before the current block timestamp
+    /// @return projections_ as the projected position values at each timestamp
+    function positionProjection(
+        IOverlayV1Market market,
+        address owner,
+        uint256 id,
+        uint256[] memory timestamps
+    ) external view returns (PositionProjection[] memory projections_) {
+        address feed = market.feed();
+        Oracle.Data memory data = _getOracleData(feed);
+        Position.Info memory position = _getPosition(market, owner, id);
+
+        projections_ = new PositionProjection[](timestamps.length);
+        for (uint256 i = 0; i < timestamps.length; i++) {
+            uint256 timestamp = timestamps[i];
+            require(timestamp >= block.timestamp, "OVLV1: timestamp < now");
+
+            projections_[i] = PositionProjection({
+                timestamp: timestamp,
+                value: _valueAt(market, data, position, timestamp),
+                notional: _notionalAt(market, data, position, timestamp),
+                liquidatable: _liquidatableAt(market, data, position, timestamp)
+            });
+        }
+    }
+}
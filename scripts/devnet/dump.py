@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import subprocess
+from typing import Any, Dict, Iterable, Optional
+
+import click
+from brownie import network
+
+
+# version of the dump format. Bump on any change to the manifest fields
+DUMP_VERSION = 1
+
+MANIFEST_FILENAME = "manifest.json"
+STATE_FILENAME = "state.json"
+
+# default location of dumps, one subdirectory per test suite
+DEFAULT_DEVNET_DIR = os.path.join("build", "devnet")
+
+# environment variable to override the dump location
+DEVNET_DIR_ENV = "DEVNET_DIR"
+
+# environment variable to force the fixtures to rebuild the dump
+DEVNET_REBUILD_ENV = "DEVNET_REBUILD"
+
+# conftest fixture checks that run the setup of each suite
+SETUP_TESTS = (
+    "tests/state/test_conftest.py",
+    "tests/feedisperser/test_conftest.py",
+)
+
+
+def devnet_dir(suite: str) -> str:
+    """
+    Returns the directory of the dump for the given test suite
+    """
+    return os.path.join(
+        os.environ.get(DEVNET_DIR_ENV, DEFAULT_DEVNET_DIR), suite)
+
+
+def fingerprint(contracts: Iterable[Any], files: Iterable[str],
+                extra: Any = None) -> str:
+    """
+    Returns the fingerprint of a setup from the bytecode of the contract
+    containers it deploys, the source of the files that drive it (e.g.
+    conftest with fixture params) and any extra json serializable
+    inputs like network and accounts. The dump is rebuilt when any of
+    these change
+    """
+    h = hashlib.sha256()
+    for (name, bytecode) in sorted((c._name, c.bytecode) for c in contracts):
+        h.update(name.encode())
+        h.update(bytes.fromhex(bytecode.removeprefix("0x")))
+    for path in sorted(files):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    h.update(json.dumps(extra, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def supports_dump(web3) -> bool:
+    """
+    Returns whether the node can dump and load its state over rpc.
+    Only anvil supports anvil_dumpState and anvil_loadState
+    """
+    return web3.clientVersion.lower().startswith("anvil")
+
+
+def _write_atomic(path: str, data: str):
+    # temp file per process as parallel test workers share the directory
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def save_devnet(web3, path: str, fingerprint: str,
+                contracts: Dict[str, Any]) -> bool:
+    """
+    Dumps the node state to path with a manifest of the addresses of
+    the given contracts by fixture name. Returns whether the dump was
+    saved, which is never on nodes without state dumps
+    """
+    if not supports_dump(web3):
+        return False
+
+    os.makedirs(path, exist_ok=True)
+    response = web3.provider.make_request("anvil_dumpState", [])
+    if "error" in response:
+        raise ValueError(f"anvil_dumpState failed: {response['error']}")
+    _write_atomic(os.path.join(path, STATE_FILENAME),
+                  json.dumps(response["result"]))
+
+    # write manifest last so an interrupted dump is never loaded
+    manifest = {
+        "version": DUMP_VERSION,
+        "fingerprint": fingerprint,
+        "chain_id": web3.eth.chain_id,
+        "block": web3.eth.block_number,
+        "addresses": {name: str(c.address) for (name, c)
+                      in contracts.items()},
+    }
+    _write_atomic(os.path.join(path, MANIFEST_FILENAME),
+                  json.dumps(manifest, indent=2))
+    return True
+
+
+def load_devnet(web3, path: str,
+                fingerprint: str) -> Optional[Dict[str, str]]:
+    """
+    Loads the node state dumped at path and returns the addresses of
+    the contracts by fixture name. Returns None if the node cannot load
+    state, there is no dump, the dump is stale or a rebuild is forced
+    """
+    if os.environ.get(DEVNET_REBUILD_ENV) or not supports_dump(web3):
+        return None
+
+    try:
+        with open(os.path.join(path, MANIFEST_FILENAME)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    if manifest.get("version") != DUMP_VERSION \
+            or manifest.get("fingerprint") != fingerprint \
+            or manifest.get("chain_id") != web3.eth.chain_id:
+        return None
+
+    with open(os.path.join(path, STATE_FILENAME)) as f:
+        state = json.load(f)
+    response = web3.provider.make_request("anvil_loadState", [state])
+    if "error" in response or not response.get("result"):
+        raise ValueError(f"anvil_loadState failed: {response.get('error')}")
+    return manifest["addresses"]
+
+
+def main():
+    # the conftest fixtures build and save the dumps when run with a
+    # forced rebuild
+    active = network.show_active()
+    click.echo(f"Rebuilding devnet dumps on the '{active}' network")
+    env = dict(os.environ, **{DEVNET_REBUILD_ENV: "1"})
+    subprocess.run(["brownie", "test", *SETUP_TESTS, "--network", active],
+                   env=env, check=True)
+    for suite in ("state", "feedisperser"):
+        click.echo(f"Dump saved [{devnet_dir(suite)}]")
@@ -0,0 +1,51 @@
+from brownie import chain, web3
+from web3.exceptions import BlockNotFound
+
+
+class ChainSnapshot:
+    """
+    Snapshot of the chain that can be reverted to any number of times,
+    alongside the single snapshot brownie keeps for chain.snapshot() and
+    chain.revert(), which fn_isolation uses.
+
+    Relies on brownie's private Chain._snapshot_id and Chain._revert, as
+    the public api only reverts to its one snapshot. Chain._revert
+    reverts the node and updates brownie's history and deployments the
+    same way chain.revert() does. Written against brownie 1.17 - 1.19,
+    check both on upgrade.
+
+        snapshot = ChainSnapshot()
+        ...
+        snapshot.revert()
+    """
+
+    def __init__(self):
+        # keep the public snapshot, e.g. of fn_isolation, untouched
+        previous = chain._snapshot_id
+        chain.snapshot()
+        self.id = chain._snapshot_id
+        chain._snapshot_id = previous
+
+        # block at the snapshot, to tell whether the chain was reset
+        self.height = web3.eth.block_number
+        self.hash = web3.eth.get_block(self.height).hash
+
+    def _on_chain(self) -> bool:
+        try:
+            return web3.eth.get_block(self.height).hash == self.hash
+        except BlockNotFound:
+            return False
+
+    def revert(self):
+        """
+        Reverts the chain to the snapshot. Reverting consumes the node
+        snapshot, so stores the one retaken. Raises if the chain was
+        reset since, e.g. by brownie's module_isolation, as the node
+        then drops the snapshot or reuses its id for a later one
+        """
+        self.id = chain._revert(self.id)
+        if not self._on_chain():
+            raise RuntimeError(
+                f"chain snapshot at block {self.height} was lost to a chain "
+                "reset. Use the module_isolation of tests/conftest.py, which "
+                "reverts rather than resets")
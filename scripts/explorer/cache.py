@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import requests
+
+
+# default location of the cache, shared across checkouts and sessions
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "overlay", "explorer")
+
+# environment variable to override the cache location, e.g. to a
+# directory committed alongside the tests or restored in CI
+CACHE_DIR_ENV = "EXPLORER_CACHE_DIR"
+
+# explorer api urls and token environment variables by chain id
+EXPLORER_APIS = {
+    1: ("https://api.etherscan.io/api", "ETHERSCAN_TOKEN"),
+    42161: ("https://api.arbiscan.io/api", "ARBISCAN_TOKEN"),
+}
+
+# timeout on explorer api requests in seconds
+DEFAULT_TIMEOUT = 30
+
+
+class ExplorerContract(NamedTuple):
+    name: str
+    abi: List[Dict[str, Any]]
+    sources: List[Dict[str, Any]]
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _write_atomic(path: str, data: bytes):
+    # temp file per process as parallel test workers share the directory
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ExplorerCache:
+    """
+    On-disk cache of verified contract ABIs and sources fetched from a
+    block explorer, keyed by chain id and address.
+
+    ABIs and sources are stored once as content addressed objects
+    under their sha256 digest, so contracts sharing an ABI (e.g. pools,
+    tokens) share the stored object. Index entries per chain and
+    address point to the object digests.
+
+        cache = ExplorerCache()
+        contract = cache.get_or_fetch(1, address)
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 fetch: Optional[Callable[[int, str],
+                                          ExplorerContract]] = None):
+        if path is None:
+            path = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+        self.path = path
+        self.fetch = fetch if fetch is not None else fetch_contract
+
+        # number of contracts fetched from the explorer
+        self.misses = 0
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.path, "objects", digest[:2], digest)
+
+    def _index_path(self, chain_id: int, address: str) -> str:
+        return os.path.join(self.path, "index", str(chain_id),
+                            address.lower() + ".json")
+
+    def _put_object(self, obj: Any) -> str:
+        data = _dumps(obj)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_atomic(path, data)
+        return digest
+
+    def _get_object(self, digest: str) -> Any:
+        with open(self._object_path(digest), "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"cache object {digest} is corrupt")
+        return json.loads(data)
+
+    def get(self, chain_id: int, address: str) -> Optional[ExplorerContract]:
+        """
+        Returns the cached contract at address on chain, if any
+        """
+        try:
+            with open(self._index_path(chain_id, address)) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        return ExplorerContract(
+            name=entry["name"],
+            abi=self._get_object(entry["abi"]),
+            sources=self._get_object(entry["sources"]),
+        )
+
+    def put(self, chain_id: int, address: str, contract: ExplorerContract):
+        """
+        Stores the contract at address on chain. Objects are written
+        before the index entry, so a partial write is never read back
+        """
+        entry = {
+            "name": contract.name,
+            "abi": self._put_object(contract.abi),
+            "sources": self._put_object(contract.sources),
+        }
+        path = self._index_path(chain_id, address)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, _dumps(entry))
+
+    def get_or_fetch(self, chain_id: int, address: str) -> ExplorerContract:
+        """
+        Returns the cached contract at address on chain, fetching it
+        from the explorer and storing it on a miss
+        """
+        contract = self.get(chain_id, address)
+        if contract is None:
+            contract = self.fetch(chain_id, address)
+            self.misses += 1
+            self.put(chain_id, address, contract)
+        return contract
+
+
+def _get_source_code(chain_id: int, address: str,
+                     timeout: int) -> Dict[str, Any]:
+    if chain_id not in EXPLORER_APIS:
+        raise ValueError(f"no explorer api for chain id {chain_id}")
+    url, token_env = EXPLORER_APIS[chain_id]
+    params = {
+        "module": "contract",
+        "action": "getsourcecode",
+        "address": address,
+        "apikey": os.environ.get(token_env, ""),
+    }
+    response = requests.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("status") != "1":
+        raise ValueError(
+            f"explorer error for {address}: {data.get('result')}")
+
+    result = data["result"][0]
+    if result["ABI"] == "Contract source code not verified":
+        raise ValueError(f"source for {address} not verified")
+    return result
+
+
+def fetch_contract(chain_id: int, address: str,
+                   timeout: int = DEFAULT_TIMEOUT) -> ExplorerContract:
+    """
+    Returns the verified contract at address on chain from the explorer
+    api. For proxies, uses the ABI of the implementation as
+    Contract.from_explorer does, keeping the sources of both proxy
+    and implementation
+    """
+    result = _get_source_code(chain_id, address, timeout)
+    name = result["ContractName"]
+    abi = json.loads(result["ABI"])
+    sources = [result]
+
+    implementation = result.get("Implementation")
+    if result.get("Proxy") == "1" and implementation:
+        impl = _get_source_code(chain_id, implementation, timeout)
+        abi = json.loads(impl["ABI"])
+        sources.append(impl)
+
+    return ExplorerContract(name=name, abi=abi, sources=sources)
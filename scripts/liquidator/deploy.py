@@ -0,0 +1,18 @@
+import click
+from brownie import OverlayV1BatchLiquidator, OverlayV1State, accounts, network
+
+
+def main():
+    click.echo(f"You are using the '{network.show_active()}' network")
+    dev = accounts.load(click.prompt(
+        "Account", type=click.Choice(accounts.load())))
+
+    # overlay market state deployed with scripts/state/deploy.py. Raises
+    # if there is no contract at the address
+    state = OverlayV1State.at(click.prompt("State address"))
+    click.echo(f"State of factory [{state.factory()}]")
+
+    # deploy batch liquidator contract
+    liquidator = OverlayV1BatchLiquidator.deploy(
+        state, {"from": dev}, publish_source=True)
+    click.echo(f"Liquidator deployed [{liquidator.address}]")
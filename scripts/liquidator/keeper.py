@@ -0,0 +1,243 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from web3 import Web3
+
+from scripts.state.book import Key, PositionBook
+from scripts.state.checkpoint import load_checkpoint
+from scripts.state.offline import liquidatable_at, to_raw_market_data
+
+
+# default number of positions per liquidatablesFromPositions call
+DEFAULT_CHUNK_SIZE = 500
+
+# default fraction past the liquidation threshold within which positions
+# pass the offline screen. The offline mirror approximates the State
+# math, so positions just inside the threshold on chain aren't missed.
+# Screened positions are confirmed exactly on chain
+DEFAULT_SCREEN_MARGIN = 50000000000000000  # 5%
+
+# fraction of the block gas limit a single OverlayV1BatchLiquidator
+# .liquidate tx may use. Batches estimated over it are split
+BLOCK_GAS_FRACTION = 0.8
+
+# step to raise a batch's gas estimate by until it liquidates every
+# position the liquidatable view expects
+GAS_ESTIMATE_STEP = 1.25
+
+# default number of positions per OverlayV1BatchLiquidator.liquidate tx,
+# before splitting batches that don't fit in a block
+DEFAULT_BATCH_SIZE = 100
+
+# odd 64 bit constants to mix position key columns into a shard hash
+_MIX_MARKET = np.uint64(0x9E3779B97F4A7C15)
+_MIX_ID = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+class ShardResult(NamedTuple):
+    shard: int
+    evaluated: int
+    screened: int
+    candidates: List[Key]
+
+
+def shard_rows(book: PositionBook, shards: int) -> np.ndarray:
+    """
+    Returns the shard of each record on the book, hashed from the
+    position key columns. Stable across processes, unlike hash()
+    """
+    records = book.records
+    owners = np.frombuffer(
+        np.ascontiguousarray(records["owner"]).tobytes(), dtype="u1"
+    ).reshape(-1, 20)
+    owner_words = np.ascontiguousarray(owners[:, 12:]).view("<u8")[:, 0]
+
+    with np.errstate(over="ignore"):
+        h = owner_words \
+            ^ (records["market"].astype(np.uint64) * _MIX_MARKET) \
+            ^ (records["id"].astype(np.uint64) * _MIX_ID)
+        h ^= h >> np.uint64(29)
+    return (h % np.uint64(shards)).astype(np.int64)
+
+
+def evaluate_shard(rpc_url: str, state_address: str, state_abi: List[Dict],
+                   path: str, shard: int, rows: np.ndarray,
+                   checkpoint_block: int, block: int,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   margin: int = DEFAULT_SCREEN_MARGIN) -> ShardResult:
+    """
+    Returns the liquidation candidates among the given rows of the
+    checkpoint at path, the open positions of the shard, as of block.
+    Raises if the checkpoint is no longer the one at checkpoint_block
+    the rows were taken from.
+
+    Fetches raw market data for the shard's markets in one batched
+    State query, screens positions offline, then confirms the screened
+    positions on chain with liquidatablesFromPositions in chunks.
+    Opens its own RPC connection so can run in a separate process
+    """
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    state = w3.eth.contract(address=state_address, abi=state_abi)
+    timestamp = w3.eth.get_block(block)["timestamp"]
+
+    checkpoint = load_checkpoint(path)
+    if checkpoint.block != checkpoint_block:
+        raise ValueError(
+            f"checkpoint at {checkpoint_block} replaced by {checkpoint.block}")
+    book = checkpoint.book
+    market_indices = np.unique(book.records["market"][rows])
+    markets = [Web3.toChecksumAddress(book.markets[i])
+               for i in market_indices]
+    raw_data = state.functions.rawMarketDataBatch(markets).call(
+        block_identifier=block)
+
+    screened = 0
+    candidates = []
+    for (index, market, raw) in zip(market_indices, markets, raw_data):
+        raw = to_raw_market_data(raw)
+        market_rows = rows[book.records["market"][rows] == index]
+
+        # screen offline then confirm on chain in chunks
+        keys, positions = [], []
+        for row in market_rows:
+            position = book.position(row)
+            if liquidatable_at(raw, position, timestamp, margin):
+                keys.append(book.key(row))
+                positions.append(tuple(position))
+        screened += len(keys)
+
+        for start in range(0, len(positions), chunk_size):
+            liquidatable = state.functions.liquidatablesFromPositions(
+                market, positions[start:start+chunk_size]
+            ).call(block_identifier=block)
+            candidates += [key for key, ok in zip(
+                keys[start:start+chunk_size], liquidatable) if ok]
+
+    return ShardResult(shard, len(rows), screened, candidates)
+
+
+def batch_gas(liquidator, liquidations: List[Tuple[str, str, int]],
+              sender: str, gas_limit: int) -> int:
+    """
+    Returns the gas to send the liquidations with in a single
+    OverlayV1BatchLiquidator.liquidate tx, or gas_limit if the batch
+    needs at least the block gas limit.
+
+    Starts from eth_estimateGas on the batch. Liquidations that run out
+    of gas are caught and skipped by the liquidator rather than failing
+    the tx (63/64 rule), so the estimate can stop short of liquidating
+    the whole batch. It's raised until a call at that gas liquidates
+    every position the liquidatable view expects
+    """
+    expect = liquidator.functions.liquidatable(liquidations).call()
+    liquidate = liquidator.functions.liquidate(liquidations)
+    gas = liquidate.estimateGas({"from": sender})
+    while gas < gas_limit:
+        (liquidated, _) = liquidate.call({"from": sender, "gas": gas})
+        if list(liquidated) == list(expect):
+            return gas
+        gas = min(int(gas * GAS_ESTIMATE_STEP), gas_limit)
+    return gas_limit
+
+
+class ShardedKeeper:
+    """
+    Finds liquidatable positions across Overlay markets by sharding the
+    positions on a checkpointed book across a pool of processes.
+
+        save_checkpoint(path, book, block)
+        keeper = ShardedKeeper(rpc_url, state.address, state.abi, shards=4)
+        candidates = keeper.candidates(path, block)
+        keeper.submit(liquidator, candidates, sender)
+    """
+
+    def __init__(self, rpc_url: str, state_address: str,
+                 state_abi: List[Dict], shards: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 margin: int = DEFAULT_SCREEN_MARGIN,
+                 executor: Optional[ProcessPoolExecutor] = None):
+        if shards <= 0:
+            raise ValueError("shards must be > 0")
+        self.rpc_url = rpc_url
+        self.state_address = state_address
+        self.state_abi = state_abi
+        self.shards = shards
+        self.chunk_size = chunk_size
+        self.margin = margin
+        self.executor = executor
+
+    def evaluate(self, path: str, block: int) -> List[ShardResult]:
+        """
+        Returns the results of evaluating each shard of the checkpoint
+        at path as of block
+        """
+        # hash the book into shards once here rather than in each shard
+        checkpoint = load_checkpoint(path)
+        book = checkpoint.book
+        shards = np.where(book.mask(), shard_rows(book, self.shards), -1)
+        args = [(self.rpc_url, self.state_address, self.state_abi, path,
+                 shard, np.flatnonzero(shards == shard), checkpoint.block,
+                 block,
+                 self.chunk_size, self.margin)
+                for shard in range(self.shards)]
+        if self.shards == 1 and self.executor is None:
+            return [evaluate_shard(*args[0])]
+
+        executor = self.executor or ProcessPoolExecutor(self.shards)
+        try:
+            futures = [executor.submit(evaluate_shard, *a) for a in args]
+            return [future.result() for future in futures]
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+
+    def candidates(self, path: str, block: int) -> List[Key]:
+        """
+        Returns the de-duplicated liquidation candidates merged from all
+        shards, sorted by key
+        """
+        merged = set()
+        for result in self.evaluate(path, block):
+            merged.update(result.candidates)
+        return sorted(merged)
+
+    def submit(self, liquidator, candidates: Sequence[Key], sender,
+               batch_size: int = DEFAULT_BATCH_SIZE) -> List:
+        """
+        Liquidates the candidates through OverlayV1BatchLiquidator in
+        batches of up to batch_size and returns the transactions.
+
+        Each batch is sent with the gas from batch_gas. Batches needing
+        more than BLOCK_GAS_FRACTION of the block gas limit are shrunk in
+        proportion to their gas until they fit
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+
+        w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        contract = w3.eth.contract(address=liquidator.address,
+                                   abi=liquidator.abi)
+        gas_limit = w3.eth.get_block("latest")["gasLimit"]
+        budget = int(BLOCK_GAS_FRACTION * gas_limit)
+
+        txs = []
+        start = 0
+        while start < len(candidates):
+            size = min(batch_size, len(candidates) - start)
+            while True:
+                liquidations = [
+                    (Web3.toChecksumAddress(market),
+                     Web3.toChecksumAddress(owner), id)
+                    for (market, owner, id) in candidates[start:start+size]
+                ]
+                gas = batch_gas(contract, liquidations, sender.address,
+                                gas_limit)
+                if gas <= budget or size == 1:
+                    break
+                size = max(1, size * budget // gas)
+
+            txs.append(liquidator.liquidate(
+                liquidations, {"from": sender, "gas_limit": gas}))
+            start += size
+        return txs
@@ -0,0 +1,18 @@
+import click
+from brownie import OverlayV1Router, accounts, network
+
+
+# overlay market factory address, as in scripts/state/deploy.py
+FACTORY = "0x8cCD181113c7Ae40f31D5e8178a98A1A60B55c4C"
+
+
+def main():
+    click.echo(f"You are using the '{network.show_active()}' network")
+    dev = accounts.load(click.prompt(
+        "Account", type=click.Choice(accounts.load())))
+    factory = click.prompt("Factory address", default=FACTORY)
+
+    # deploy router contract
+    router = OverlayV1Router.deploy(
+        factory, {"from": dev}, publish_source=True)
+    click.echo(f"Router deployed [{router.address}]")
@@ -0,0 +1,233 @@
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from web3.providers.base import BaseProvider
+
+
+# environment variables to write the report and check the budget to
+RPC_REPORT_ENV = "RPC_REPORT"
+RPC_BUDGET_ENV = "RPC_BUDGET"
+
+# environment variable to rewrite the budget from this run
+RPC_BUDGET_UPDATE_ENV = "RPC_BUDGET_UPDATE"
+
+# environment variable to also estimate the gas of each eth_call
+RPC_CALL_GAS_ENV = "RPC_CALL_GAS"
+
+# methods that count toward the rpc budget of a test
+BUDGET_METHODS = ("eth_call", "eth_sendTransaction", "eth_sendRawTransaction")
+
+# test phases timed and counted separately
+SETUP = "setup"
+CALL = "call"
+TEARDOWN = "teardown"
+
+
+class Regression(NamedTuple):
+    nodeid: str
+    budget: int
+    actual: int
+
+
+class Usage:
+    """
+    RPC requests, gas and durations of a test by phase
+    """
+
+    def __init__(self, nodeid: str):
+        self.nodeid = nodeid
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: defaultdict(int))
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.tx_gas: List[int] = []
+        self.call_gas: List[int] = []
+
+    def rpc_count(self, phase: str = CALL) -> int:
+        """
+        Returns the number of budgeted requests made in the phase
+        """
+        return sum(self.counts[phase][m] for m in BUDGET_METHODS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodeid": self.nodeid,
+            "counts": {p: dict(c) for (p, c) in self.counts.items()},
+            "durations": dict(self.durations),
+            "rpc_count": self.rpc_count(),
+            "tx_gas": sum(self.tx_gas),
+            "txs": len(self.tx_gas),
+            "call_gas": sum(self.call_gas),
+            "calls": len(self.call_gas),
+        }
+
+
+class RpcLedger:
+    """
+    Accounts json rpc requests, gas used and durations to the test and
+    phase running when they are made.
+
+        ledger = RpcLedger()
+        web3.provider = AccountingProvider(web3.provider, ledger)
+        ledger.start(item.nodeid, "call")
+        ...
+        ledger.stop()
+    """
+
+    def __init__(self):
+        self.tests: Dict[str, Usage] = {}
+        self._current: Optional[Usage] = None
+        self._phase: Optional[str] = None
+        self._started = 0.0
+
+        # tx hashes already accounted, as receipts are polled
+        self._receipts = set()
+
+    def start(self, nodeid: str, phase: str):
+        if nodeid not in self.tests:
+            self.tests[nodeid] = Usage(nodeid)
+        self._current = self.tests[nodeid]
+        self._phase = phase
+        self._started = time.perf_counter()
+
+    def stop(self):
+        if self._current is not None:
+            self._current.durations[self._phase] += \
+                time.perf_counter() - self._started
+        self._current = None
+        self._phase = None
+
+    def count(self, method: str):
+        if self._current is not None:
+            self._current.counts[self._phase][method] += 1
+
+    def receipt(self, tx_hash: str, gas_used: int):
+        if self._current is not None and tx_hash not in self._receipts:
+            self._receipts.add(tx_hash)
+            self._current.tx_gas.append(gas_used)
+
+    def call_gas(self, gas: int):
+        if self._current is not None:
+            self._current.call_gas.append(gas)
+
+    def export(self) -> List[Dict[str, Any]]:
+        """
+        Returns the raw usage of each test to merge into another ledger,
+        e.g. from a parallel test worker into the controller
+        """
+        return [{
+            "nodeid": usage.nodeid,
+            "counts": {p: dict(c) for (p, c) in usage.counts.items()},
+            "durations": dict(usage.durations),
+            "tx_gas": list(usage.tx_gas),
+            "call_gas": list(usage.call_gas),
+        } for usage in self.tests.values()]
+
+    def merge(self, exported: List[Dict[str, Any]]):
+        """
+        Adds the usage exported from another ledger to this one
+        """
+        for raw in exported:
+            nodeid = raw["nodeid"]
+            usage = self.tests.setdefault(nodeid, Usage(nodeid))
+            for (phase, counts) in raw["counts"].items():
+                for (method, n) in counts.items():
+                    usage.counts[phase][method] += n
+            for (phase, seconds) in raw["durations"].items():
+                usage.durations[phase] += seconds
+            usage.tx_gas += raw["tx_gas"]
+            usage.call_gas += raw["call_gas"]
+
+    def ranked(self, key: str = "rpc_count") -> List[Dict[str, Any]]:
+        """
+        Returns the usage of each test, most expensive first by key
+        """
+        usages = [u.to_dict() for u in self.tests.values()]
+        if key == "duration":
+            return sorted(usages, key=lambda u: -sum(u["durations"].values()))
+        return sorted(usages, key=lambda u: -u[key])
+
+    def write_report(self, path: str):
+        """
+        Writes the usage of all tests ranked by rpc count to path
+        """
+        totals = defaultdict(int)
+        for usage in self.tests.values():
+            for counts in usage.counts.values():
+                for (method, n) in counts.items():
+                    totals[method] += n
+        report = {"totals": dict(totals), "tests": self.ranked()}
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    def budget(self) -> Dict[str, int]:
+        """
+        Returns the rpc count of each test body as a budget
+        """
+        return {nodeid: usage.rpc_count()
+                for (nodeid, usage) in sorted(self.tests.items())}
+
+    def regressions(self, budget: Dict[str, int]) -> List[Regression]:
+        """
+        Returns the tests whose rpc count exceeds their budget. Tests
+        without a budget are not checked
+        """
+        return [Regression(nodeid, budget[nodeid], usage.rpc_count())
+                for (nodeid, usage) in sorted(self.tests.items())
+                if nodeid in budget and usage.rpc_count() > budget[nodeid]]
+
+
+def load_budget(path: str) -> Dict[str, int]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_budget(path: str, budget: Dict[str, int]):
+    """
+    Merges the budget into the one at path, keeping budgets of tests
+    not run
+    """
+    merged = {}
+    if os.path.exists(path):
+        merged = load_budget(path)
+    merged.update(budget)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(merged.items())), f, indent=2)
+
+
+class AccountingProvider(BaseProvider):
+    """
+    Provider that forwards requests to the given provider and accounts
+    them in the ledger. Gas used by transactions is read from the
+    receipts requested. Gas of calls is estimated with an extra
+    eth_estimateGas, not accounted, if estimate_calls
+    """
+
+    def __init__(self, provider: BaseProvider, ledger: RpcLedger,
+                 estimate_calls: bool = False):
+        super().__init__()
+        self.provider = provider
+        self.ledger = ledger
+        self.estimate_calls = estimate_calls
+
+    def make_request(self, method, params):
+        self.ledger.count(method)
+        response = self.provider.make_request(method, params)
+
+        result = response.get("result")
+        if method == "eth_getTransactionReceipt" and result:
+            self.ledger.receipt(result["transactionHash"],
+                                int(result["gasUsed"], 16))
+        elif method == "eth_call" and self.estimate_calls \
+                and "error" not in response:
+            estimate = self.provider.make_request(
+                "eth_estimateGas", params[:1])
+            if "result" in estimate:
+                self.ledger.call_gas(int(estimate["result"], 16))
+
+        return response
+
+    def isConnected(self) -> bool:
+        return self.provider.isConnected()
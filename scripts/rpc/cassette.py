@@ -0,0 +1,162 @@
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+
+from web3.providers.base import BaseProvider
+
+
+# version of the cassette format. Bump on any change to the file layout
+CASSETTE_VERSION = 1
+
+# environment variables to record or replay the rpc of a test session
+CASSETTE_ENV = "RPC_CASSETTE"
+CASSETTE_MODE_ENV = "RPC_CASSETTE_MODE"
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(KeyError):
+    pass
+
+
+def cassette_path(path: str) -> str:
+    """
+    Returns the cassette path for this process, suffixed by worker id
+    when tests run in parallel as each worker has its own chain
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"{path}.{worker}" if worker else path
+
+
+def request_key(method: str, params: Any) -> str:
+    """
+    Returns the lookup key of a json rpc request. Excludes the request
+    id, which differs between sessions
+    """
+    data = json.dumps([method, params], sort_keys=True,
+                      separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded json rpc responses indexed by request.
+
+    Repeated requests, e.g. eth_blockNumber, keep every response in
+    order and are replayed in the same order, repeating the last once
+    exhausted. Saved as gzipped json.
+
+        cassette = Cassette.load(path)
+        response = cassette.play("eth_chainId", [])
+    """
+
+    def __init__(self):
+        self._responses: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._methods: Dict[str, str] = {}
+        self._plays: Dict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._responses.values())
+
+    def record(self, method: str, params: Any, response: Dict[str, Any]):
+        """
+        Records the result or error of the response to the request
+        """
+        key = request_key(method, params)
+        entry = {k: response[k] for k in ("result", "error") if k in response}
+        self._responses[key].append(entry)
+        self._methods[key] = method
+
+    def play(self, method: str, params: Any) -> Dict[str, Any]:
+        """
+        Returns the next recorded response to the request
+        """
+        key = request_key(method, params)
+        responses = self._responses.get(key)
+        if not responses:
+            raise CassetteMissError(f"no recorded response for {method}")
+
+        i = min(self._plays[key], len(responses) - 1)
+        self._plays[key] += 1
+        return {"jsonrpc": "2.0", "id": 0, **responses[i]}
+
+    def rewind(self):
+        """
+        Replays all requests from their first recorded response
+        """
+        self._plays.clear()
+
+    def interactions(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Returns an iterator over the (key, method, response) of every
+        recorded response, e.g. to feed microbenchmarks
+        """
+        for (key, responses) in self._responses.items():
+            for response in responses:
+                yield (key, self._methods[key], response)
+
+    def save(self, path: str):
+        data = {
+            "version": CASSETTE_VERSION,
+            "methods": self._methods,
+            "responses": self._responses,
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with gzip.open(path, "rt") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"cassette version {data.get('version')} != "
+                f"{CASSETTE_VERSION}")
+
+        cassette = cls()
+        cassette._methods = data["methods"]
+        cassette._responses.update(data["responses"])
+        return cassette
+
+
+class RecordingProvider(BaseProvider):
+    """
+    Provider that forwards requests to the given provider and records
+    every response in the cassette
+    """
+
+    def __init__(self, provider: BaseProvider, cassette: Cassette):
+        super().__init__()
+        self.provider = provider
+        self.cassette = cassette
+
+    def make_request(self, method, params):
+        response = self.provider.make_request(method, params)
+        self.cassette.record(method, params, response)
+        return response
+
+    def isConnected(self) -> bool:
+        return self.provider.isConnected()
+
+
+class ReplayProvider(BaseProvider):
+    """
+    Provider that serves requests from the cassette without a node.
+    Raises CassetteMissError on requests that were not recorded
+    """
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def make_request(self, method, params):
+        return self.cassette.play(method, params)
+
+    def isConnected(self) -> bool:
+        return True
@@ -0,0 +1,146 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Context, Decimal
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from web3 import Web3
+
+from scripts.state.planner import plan_chunks
+from scripts.state.shared import MarketState, decode_market_state_data
+
+
+# default number of blocks per range written to a file
+DEFAULT_RANGE_SIZE = 1000
+
+# default number of ranges backfilled at once
+DEFAULT_WORKERS = 8
+
+# directory under the output tracking ranges already written
+PROGRESS_DIR = "_progress"
+
+# fixed point values from the market as decimals in 1e18 units. 76 is
+# the widest decimal arrow supports, so raw values up to 1e76 (~2**252)
+# fit where decimal128 overflowed at 1e20 units
+_PRECISION = 76
+_FIXED_POINT = pa.decimal256(_PRECISION, 18)
+
+# context to scale raw values exactly, beyond the default 28 digits
+_CONTEXT = Context(prec=_PRECISION)
+
+SCHEMA = pa.schema(
+    [("block", pa.int64())]
+    + [(field, _FIXED_POINT) for field in MarketState._fields]
+)
+
+
+def _range_name(start: int, end: int) -> str:
+    return f"blocks-{start:012d}-{end:012d}"
+
+
+def _partition(out_dir: str, market: str) -> str:
+    return os.path.join(out_dir, f"market={market.lower()}")
+
+
+def _done_path(out_dir: str, start: int, end: int) -> str:
+    return os.path.join(out_dir, PROGRESS_DIR, _range_name(start, end))
+
+
+def _to_decimal(value: int) -> Decimal:
+    return Decimal(value).scaleb(-18, _CONTEXT)
+
+
+def backfill_range(rpc_url: str, state_address: str, state_abi: List[Dict],
+                   markets: List[str], start: int, end: int, out_dir: str,
+                   step: int = 1) -> int:
+    """
+    Writes the market state of each market at every step blocks in
+    [start, end) to a parquet file per market partition, then marks the
+    range done. Returns the number of rows written.
+
+    Batches the marketState calls for all markets into one tryBatch
+    call per block. Markets whose call fails at a block, e.g. before
+    the market was deployed, have no row for that block
+    """
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    state = w3.eth.contract(address=state_address, abi=state_abi)
+    markets = [Web3.toChecksumAddress(m) for m in markets]
+    calls = [state.encodeABI(fn_name="marketState", args=[m])
+             for m in markets]
+
+    columns: Dict[str, Dict[str, list]] = {
+        market: {name: [] for name in SCHEMA.names} for market in markets}
+    for block in range(start, end, step):
+        results = state.functions.tryBatch(calls).call(
+            block_identifier=block)
+        for market, (success, data) in zip(markets, results):
+            if not success:
+                continue
+            market_state = decode_market_state_data(bytes(data))
+            columns[market]["block"].append(block)
+            for name, value in zip(MarketState._fields, market_state):
+                columns[market][name].append(_to_decimal(value))
+
+    # write each partition file atomically then mark range done. Temp
+    # and progress files are prefixed so pyarrow datasets skip them
+    rows = 0
+    name = _range_name(start, end)
+    for market, data in columns.items():
+        if not data["block"]:
+            continue
+        partition = _partition(out_dir, market)
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, name + ".parquet")
+        tmp = os.path.join(partition, "." + name + ".parquet.tmp")
+        pq.write_table(pa.table(data, schema=SCHEMA), tmp)
+        os.replace(tmp, path)
+        rows += len(data["block"])
+
+    done = _done_path(out_dir, start, end)
+    os.makedirs(os.path.dirname(done), exist_ok=True)
+    with open(done, "w") as f:
+        f.write(str(rows))
+    return rows
+
+
+def pending_ranges(out_dir: str, start: int, end: int,
+                   range_size: int = DEFAULT_RANGE_SIZE) -> List[tuple]:
+    """
+    Returns the block ranges in [start, end) not yet marked done in
+    out_dir
+    """
+    return [(s, e) for (s, e) in plan_chunks(start, end, range_size)
+            if not os.path.exists(_done_path(out_dir, s, e))]
+
+
+def backfill(rpc_url: str, state_address: str, state_abi: List[Dict],
+             markets: List[str], start: int, end: int, out_dir: str,
+             range_size: int = DEFAULT_RANGE_SIZE, step: int = 1,
+             workers: int = DEFAULT_WORKERS,
+             executor: Optional[ProcessPoolExecutor] = None) -> int:
+    """
+    Backfills the market state history of the markets over blocks
+    [start, end) to parquet files under out_dir partitioned by market,
+    splitting the blocks into ranges across a pool of processes. Ranges
+    already done are skipped so an interrupted backfill resumes where
+    it left off. Returns the number of rows written.
+
+    Keep range_size the same between runs so done ranges line up.
+    Read back with pyarrow.dataset.dataset(out_dir, partitioning="hive")
+    """
+    if range_size % step != 0:
+        raise ValueError("range_size must be a multiple of step")
+
+    ranges = pending_ranges(out_dir, start, end, range_size)
+    pool = executor or ProcessPoolExecutor(workers)
+    try:
+        futures = [
+            pool.submit(backfill_range, rpc_url, state_address, state_abi,
+                        markets, s, e, out_dir, step)
+            for (s, e) in ranges
+        ]
+        return sum(future.result() for future in as_completed(futures))
+    finally:
+        if executor is None:
+            pool.shutdown()
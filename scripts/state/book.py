@@ -0,0 +1,320 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from scripts.state.offline import (
+    PositionInfo,
+    RawMarketData,
+    liquidatable_at,
+    value_at
+)
+
+
+# position key on the book as (market, owner, id)
+Key = Tuple[str, str, int]
+
+# record layout of positions on the book. Market is an index into the
+# book's list of markets. uint96 values are split into little-endian
+# (uint64, uint32) lo/hi words. Oi shares (uint240) are kept as 30 raw
+# big-endian bytes as in the packed views, so scripts.state.packed
+# helpers like uint_to_int apply to the column
+BOOK_DTYPE = np.dtype([
+    ("market", "<u2"),
+    ("owner", "S20"),
+    ("id", "<u8"),
+    ("notional_initial_lo", "<u8"),
+    ("notional_initial_hi", "<u4"),
+    ("debt_initial_lo", "<u8"),
+    ("debt_initial_hi", "<u4"),
+    ("mid_tick", "<i4"),
+    ("entry_tick", "<i4"),
+    ("is_long", "?"),
+    ("liquidated", "?"),
+    ("oi_shares", "u1", (30,)),
+    ("fraction_remaining", "<u2"),
+])
+
+# default number of records to allocate for on a new book
+DEFAULT_CAPACITY = 1024
+
+MASK_64 = 2**64 - 1
+
+# width in bytes of the oi shares column
+OI_SHARES_BYTES = 30
+
+
+def _address_to_bytes(address: str) -> bytes:
+    """
+    Returns the 20 raw bytes of the hex address
+    """
+    return bytes.fromhex(address[2:] if address.startswith("0x")
+                         else address)
+
+
+def _bytes_to_address(owner: bytes) -> str:
+    """
+    Returns the lowercase hex address of the raw owner bytes. Pads back
+    trailing zero bytes numpy strips from fixed width bytes
+    """
+    return "0x" + owner.ljust(20, b"\x00").hex()
+
+
+def _split(value: int, hi_bits: int) -> Tuple[int, int]:
+    """
+    Returns the (lo, hi) words of value with a 64 bit lo word
+    """
+    if value < 0 or value >> (64 + hi_bits) != 0:
+        raise OverflowError(f"{value} does not fit in {64 + hi_bits} bits")
+    return (value & MASK_64, value >> 64)
+
+
+class PositionBook:
+    """
+    In-memory book of positions across Overlay markets backed by a numpy
+    structured array, indexed by (market, owner, id).
+
+        book = PositionBook()
+        book.append(market, owner, pos_id, to_position_info(
+            state.position(market, owner, pos_id)))
+        longs = book.rows(market=market, is_long=True)
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._records = np.zeros(max(capacity, 1), dtype=BOOK_DTYPE)
+        self._size = 0
+        self._index: Optional[Dict[Key, int]] = {}
+        self._markets: List[str] = []
+        self._market_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_records(cls, records: np.ndarray,
+                     markets: List[str]) -> "PositionBook":
+        """
+        Returns the book over existing records without copying them,
+        e.g. records memory mapped from a checkpoint. The key index is
+        only built from the market, owner and id columns on the first
+        lookup by key, so readers working by row never pay for it
+        """
+        if records.dtype != BOOK_DTYPE:
+            raise ValueError(f"records dtype {records.dtype} != book dtype")
+
+        book = cls.__new__(cls)
+        book._records = records
+        book._size = len(records)
+        book._markets = [str(market).lower() for market in markets]
+        book._market_index = {
+            market: i for i, market in enumerate(book._markets)}
+        book._index = None
+        return book
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Key) -> bool:
+        return self._key(*key) in self._rows()
+
+    @property
+    def records(self) -> np.ndarray:
+        """
+        Returns the view over records currently on the book
+        """
+        return self._records[:self._size]
+
+    @property
+    def markets(self) -> List[str]:
+        """
+        Returns the markets on the book in order of market index
+        """
+        return list(self._markets)
+
+    def _rows(self) -> Dict[Key, int]:
+        """
+        Returns the row of each position by key, indexing the records on
+        first use
+        """
+        if self._index is None:
+            records = self.records
+            self._index = {
+                (self._markets[market], _bytes_to_address(owner), int(id)):
+                    row
+                for row, (market, owner, id) in enumerate(zip(
+                    records["market"].tolist(), records["owner"].tolist(),
+                    records["id"].tolist()))
+            }
+        return self._index
+
+    def _key(self, market: str, owner: str, id: int) -> Key:
+        return (str(market).lower(), str(owner).lower(), int(id))
+
+    def _market(self, market: str) -> int:
+        """
+        Returns the index of the market, adding it if new
+        """
+        market = str(market).lower()
+        if market not in self._market_index:
+            self._market_index[market] = len(self._markets)
+            self._markets.append(market)
+        return self._market_index[market]
+
+    def _grow(self):
+        records = np.zeros(max(2 * len(self._records), DEFAULT_CAPACITY),
+                           dtype=BOOK_DTYPE)
+        records[:self._size] = self._records[:self._size]
+        self._records = records
+
+    def _write(self, row: int, position: PositionInfo):
+        record = self._records[row]
+        (record["notional_initial_lo"],
+         record["notional_initial_hi"]) = _split(position.notional_initial,
+                                                 32)
+        (record["debt_initial_lo"],
+         record["debt_initial_hi"]) = _split(position.debt_initial, 32)
+        record["mid_tick"] = position.mid_tick
+        record["entry_tick"] = position.entry_tick
+        record["is_long"] = position.is_long
+        record["liquidated"] = position.liquidated
+        record["oi_shares"] = np.frombuffer(
+            position.oi_shares.to_bytes(OI_SHARES_BYTES, "big"), dtype="u1")
+        record["fraction_remaining"] = position.fraction_remaining
+
+    def append(self, market: str, owner: str, id: int,
+               position: PositionInfo) -> int:
+        """
+        Adds the position to the book and returns its row. Raises if the
+        position is already on the book
+        """
+        key = self._key(market, owner, id)
+        if key in self._rows():
+            raise ValueError(f"position {key} already on book")
+        if self._size == len(self._records):
+            self._grow()
+
+        row = self._size
+        record = self._records[row]
+        record["market"] = self._market(market)
+        record["owner"] = _address_to_bytes(key[1])
+        record["id"] = key[2]
+        self._write(row, position)
+
+        self._index[key] = row
+        self._size += 1
+        return row
+
+    def update(self, market: str, owner: str, id: int,
+               position: PositionInfo) -> int:
+        """
+        Replaces the position on the book and returns its row. Raises
+        KeyError if the position is not on the book
+        """
+        row = self._rows()[self._key(market, owner, id)]
+        self._write(row, position)
+        return row
+
+    def upsert(self, market: str, owner: str, id: int,
+               position: PositionInfo) -> int:
+        """
+        Updates the position if on the book, else appends it
+        """
+        if (market, owner, id) in self:
+            return self.update(market, owner, id, position)
+        return self.append(market, owner, id, position)
+
+    def row(self, market: str, owner: str, id: int) -> int:
+        """
+        Returns the row of the position. Raises KeyError if not on book
+        """
+        return self._rows()[self._key(market, owner, id)]
+
+    def key(self, row: int) -> Key:
+        """
+        Returns the (market, owner, id) key of the position at row
+        """
+        record = self._records[row]
+        return (self._markets[record["market"]],
+                _bytes_to_address(record["owner"]), int(record["id"]))
+
+    def position(self, row: int) -> PositionInfo:
+        """
+        Returns the position info at row for use with the offline
+        valuation helpers
+        """
+        record = self._records[row]
+        return PositionInfo(
+            int(record["notional_initial_lo"])
+            | int(record["notional_initial_hi"]) << 64,
+            int(record["debt_initial_lo"])
+            | int(record["debt_initial_hi"]) << 64,
+            int(record["mid_tick"]),
+            int(record["entry_tick"]),
+            bool(record["is_long"]),
+            bool(record["liquidated"]),
+            int.from_bytes(record["oi_shares"].tobytes(), "big"),
+            int(record["fraction_remaining"])
+        )
+
+    def get(self, market: str, owner: str, id: int) -> PositionInfo:
+        """
+        Returns the position info for the key. Raises KeyError if not
+        on book
+        """
+        return self.position(self.row(market, owner, id))
+
+    def mask(self, market: Optional[str] = None,
+             is_long: Optional[bool] = None,
+             include_closed: bool = False) -> np.ndarray:
+        """
+        Returns the boolean mask over records matching the filters.
+        Excludes liquidated and fully unwound positions unless
+        include_closed
+        """
+        records = self.records
+        mask = np.ones(self._size, dtype=bool)
+        if market is not None:
+            index = self._market_index.get(str(market).lower())
+            if index is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= records["market"] == index
+        if is_long is not None:
+            mask &= records["is_long"] == is_long
+        if not include_closed:
+            mask &= ~records["liquidated"]
+            mask &= records["fraction_remaining"] > 0
+        return mask
+
+    def rows(self, market: Optional[str] = None,
+             is_long: Optional[bool] = None,
+             include_closed: bool = False) -> np.ndarray:
+        """
+        Returns the rows of records matching the filters
+        """
+        return np.flatnonzero(self.mask(market, is_long, include_closed))
+
+    def positions(
+            self, rows: np.ndarray) -> Iterator[Tuple[Key, PositionInfo]]:
+        """
+        Yields the (key, position info) for each of the given rows
+        """
+        for row in rows:
+            yield (self.key(row), self.position(row))
+
+    def values_at(self, market: str, raw: RawMarketData, cap_oi: int,
+                  timestamp: int) -> Dict[Key, int]:
+        """
+        Returns the value at timestamp of each open position on the
+        market using the offline mirror of OverlayV1State
+        """
+        return {
+            key: value_at(raw, cap_oi, position, timestamp)
+            for key, position in self.positions(self.rows(market))
+        }
+
+    def liquidatable_at(self, market: str, raw: RawMarketData,
+                        timestamp: int) -> List[Key]:
+        """
+        Returns the keys of open positions on the market liquidatable at
+        timestamp using the offline mirror of OverlayV1State
+        """
+        return [
+            key for key, position in self.positions(self.rows(market))
+            if liquidatable_at(raw, position, timestamp)
+        ]
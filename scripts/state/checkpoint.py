@@ -0,0 +1,187 @@
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from scripts.state.book import BOOK_DTYPE, Key, PositionBook
+from scripts.state.offline import (
+    RawMarketData,
+    to_position_info,
+    to_raw_market_data
+)
+
+
+# version of the checkpoint format. Bump on any change to the header
+# fields or the record layout
+CHECKPOINT_VERSION = 2
+
+HEADER_FILENAME = "header.json"
+
+
+class Checkpoint(NamedTuple):
+    book: PositionBook
+    block: int
+    market_data: Dict[str, RawMarketData]
+
+
+def _records_filename(block: int) -> str:
+    return f"positions-{block}.bin"
+
+
+def save_checkpoint(path: str, book: PositionBook, block: int,
+                    market_data: Optional[Dict[str, RawMarketData]] = None):
+    """
+    Writes the position book and market data indexed up to and
+    including block to the checkpoint directory at path.
+
+    Records are written as raw fixed width rows in a file per block and
+    the header is replaced atomically last, so readers of the previous
+    checkpoint are unaffected. The records of the previous checkpoint
+    are kept for one more generation, for readers that read its header
+    just before the swap, and older records files are removed, which
+    is safe for processes that still have them mapped
+    """
+    os.makedirs(path, exist_ok=True)
+    filename = _records_filename(block)
+    previous = _read_header(path)
+
+    # write records then header to temp files and swap in
+    tmp = os.path.join(path, filename + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(book.records.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(path, filename))
+
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "block": block,
+        "count": len(book),
+        "dtype": np.lib.format.dtype_to_descr(BOOK_DTYPE),
+        "records": filename,
+        "markets": book.markets,
+        "market_data": {
+            str(market).lower(): data
+            for market, data in (market_data or {}).items()
+        },
+    }
+    tmp = os.path.join(path, HEADER_FILENAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(header, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(path, HEADER_FILENAME))
+
+    # clean up records from checkpoints before the previous one
+    keep = {filename, previous["records"] if previous else None}
+    for name in os.listdir(path):
+        if name.startswith("positions-") and name not in keep:
+            os.remove(os.path.join(path, name))
+
+
+def _read_header(path: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(path, HEADER_FILENAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """
+    Returns the position book and market data from the checkpoint
+    directory at path, with records memory mapped copy-on-write. Pages
+    are shared between processes loading the same checkpoint until
+    written to. Reloads the header if its records were removed by
+    newer checkpoints while loading
+    """
+    with open(os.path.join(path, HEADER_FILENAME)) as f:
+        header = json.load(f)
+
+    if header["version"] != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"checkpoint version {header['version']} != "
+            f"{CHECKPOINT_VERSION}")
+    dtype = np.lib.format.descr_to_dtype(
+        [tuple(field) for field in header["dtype"]])
+    if dtype != BOOK_DTYPE:
+        raise ValueError("checkpoint record layout != book record layout")
+
+    count = header["count"]
+    if count == 0:
+        records = np.zeros(0, dtype=BOOK_DTYPE)
+    else:
+        try:
+            records = np.memmap(os.path.join(path, header["records"]),
+                                dtype=BOOK_DTYPE, mode="c", shape=(count,))
+        except FileNotFoundError:
+            if _read_header(path) == header:
+                raise
+            return load_checkpoint(path)
+
+    book = PositionBook.from_records(records, header["markets"])
+    market_data = {
+        market: to_raw_market_data(data)
+        for market, data in header["market_data"].items()
+    }
+    return Checkpoint(book, header["block"], market_data)
+
+
+def touched_positions(web3, market, from_block: int,
+                      to_block: int) -> Set[Key]:
+    """
+    Returns the keys of positions on the market built, unwound or
+    liquidated between from_block and to_block inclusive
+    """
+    contract = web3.eth.contract(address=market.address, abi=market.abi)
+    address = market.address.lower()
+    keys = set()
+    for name in ("Build", "Unwind"):
+        logs = getattr(contract.events, name).getLogs(
+            fromBlock=from_block, toBlock=to_block)
+        for log in logs:
+            keys.add((address, log.args.sender.lower(),
+                      int(log.args.positionId)))
+
+    logs = contract.events.Liquidate.getLogs(
+        fromBlock=from_block, toBlock=to_block)
+    for log in logs:
+        keys.add((address, log.args.owner.lower(), int(log.args.positionId)))
+    return keys
+
+
+def catch_up(book: PositionBook, state, markets: List,
+             keys: Iterable[Key]) -> int:
+    """
+    Refreshes the given positions on the book from OverlayV1State and
+    returns the number refreshed. Use with touched_positions over the
+    blocks since the checkpoint
+    """
+    by_address: Dict[str, object] = {
+        market.address.lower(): market for market in markets}
+    count = 0
+    for (market, owner, id) in sorted(keys):
+        position = to_position_info(
+            state.position(by_address[market], owner, id))
+        book.upsert(market, owner, id, position)
+        count += 1
+    return count
+
+
+def warm_start(path: str, web3, state, markets: List,
+               to_block: int) -> Tuple[PositionBook, int]:
+    """
+    Returns the position book loaded from the checkpoint at path and
+    caught up to to_block, with the block it is current as of
+    """
+    checkpoint = load_checkpoint(path)
+    if to_block <= checkpoint.block:
+        return (checkpoint.book, checkpoint.block)
+
+    keys: Set[Key] = set()
+    for market in markets:
+        keys |= touched_positions(web3, market, checkpoint.block + 1,
+                                  to_block)
+    catch_up(checkpoint.book, state, markets, keys)
+    return (checkpoint.book, to_block)
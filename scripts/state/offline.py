@@ -0,0 +1,422 @@
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List, NamedTuple, Tuple
+
+
+# fixed point conventions used by the market
+ONE = 10 ** 18
+ONE_16 = 10 ** 4
+
+
+class RiskParameter(Enum):
+    K = 0
+    LMBDA = 1
+    DELTA = 2
+    CAP_PAYOFF = 3
+    CAP_NOTIONAL = 4
+    CAP_LEVERAGE = 5
+    CIRCUIT_BREAKER_WINDOW = 6
+    CIRCUIT_BREAKER_MINT_TARGET = 7
+    MAINTENANCE_MARGIN_FRACTION = 8
+    MAINTENANCE_MARGIN_BURN_RATE = 9
+    LIQUIDATION_FEE_RATE = 10
+    TRADING_FEE_RATE = 11
+    MIN_COLLATERAL = 12
+    PRICE_DRIFT_UPPER_LIMIT = 13
+    AVERAGE_BLOCK_TIME = 14
+
+
+class Snapshot(NamedTuple):
+    timestamp: int
+    window: int
+    accumulator: int
+
+
+class OracleData(NamedTuple):
+    timestamp: int
+    micro_window: int
+    macro_window: int
+    price_over_micro_window: int
+    price_over_macro_window: int
+    price_one_macro_window_ago: int
+    reserve_over_micro_window: int
+    has_reserve: bool
+
+
+class RawMarketData(NamedTuple):
+    feed: str
+    oi_long: int
+    oi_short: int
+    oi_long_shares: int
+    oi_short_shares: int
+    timestamp_update_last: int
+    snapshot_volume_bid: Snapshot
+    snapshot_volume_ask: Snapshot
+    snapshot_minted: Snapshot
+    params: Tuple[int, ...]
+    data: OracleData
+
+
+class PositionInfo(NamedTuple):
+    notional_initial: int
+    debt_initial: int
+    mid_tick: int
+    entry_tick: int
+    is_long: bool
+    liquidated: bool
+    oi_shares: int
+    fraction_remaining: int
+
+
+class MarketProjection(NamedTuple):
+    timestamp: int
+    oi_long: int
+    oi_short: int
+    funding_rate: int
+
+
+class PositionProjection(NamedTuple):
+    timestamp: int
+    value: int
+    notional: int
+    liquidatable: bool
+
+
+def to_raw_market_data(raw: Any) -> RawMarketData:
+    """
+    Returns the raw market data from the tuple returned by
+    OverlayV1State.rawMarketData
+    """
+    (feed, oi_long, oi_short, oi_long_shares, oi_short_shares,
+     timestamp_update_last, snap_bid, snap_ask, snap_minted,
+     params, data) = raw
+    return RawMarketData(
+        feed, int(oi_long), int(oi_short), int(oi_long_shares),
+        int(oi_short_shares), int(timestamp_update_last),
+        Snapshot(*(int(x) for x in snap_bid)),
+        Snapshot(*(int(x) for x in snap_ask)),
+        Snapshot(*(int(x) for x in snap_minted)),
+        tuple(int(p) for p in params),
+        OracleData(*(int(x) for x in data[:7]), bool(data[7]))
+    )
+
+
+def to_position_info(position: Any) -> PositionInfo:
+    """
+    Returns the position info from the tuple returned by
+    market.positions or OverlayV1State.position
+    """
+    (notional_initial, debt_initial, mid_tick, entry_tick, is_long,
+     liquidated, oi_shares, fraction_remaining) = position
+    return PositionInfo(
+        int(notional_initial), int(debt_initial), int(mid_tick),
+        int(entry_tick), bool(is_long), bool(liquidated), int(oi_shares),
+        int(fraction_remaining)
+    )
+
+
+def param(raw: RawMarketData, name: RiskParameter) -> int:
+    """
+    Returns the risk parameter value stored on the market
+    """
+    return raw.params[name.value]
+
+
+def tick_to_price(tick: int) -> int:
+    """
+    Returns the price associated with a given tick
+    price = 1.0001 ** tick
+    """
+    return int((Decimal("1.0001") ** Decimal(tick)) * Decimal(ONE))
+
+
+def mid(data: OracleData) -> int:
+    """
+    Returns mid price from oracle feed data
+    """
+    return (data.price_over_micro_window + data.price_over_macro_window) // 2
+
+
+def transform_snapshot(snapshot: Snapshot, timestamp: int, window: int,
+                       value: int) -> Snapshot:
+    """
+    Returns the transformed snapshot factoring in
+    decay in accumulator value over prior rolling window
+    """
+    (snap_timestamp, snap_window, snap_accumulator) = snapshot
+    dt = timestamp - snap_timestamp
+
+    # decay the acccumulator value for time that has passed
+    if dt >= snap_window:
+        snap_accumulator = 0
+    else:
+        snap_accumulator -= snap_accumulator * dt // snap_window
+
+    # set accumulator value now
+    snap_accumulator_now = int(snap_accumulator + value)
+
+    # calculate the window_now
+    w1 = abs(snap_accumulator)
+    w2 = abs(value)
+    if snap_accumulator_now == 0:
+        snap_window_now = window
+    else:
+        snap_window_now = int((w1 * snap_window + w2 * window) / (w1 + w2))
+
+    return Snapshot(timestamp, snap_window_now, snap_accumulator_now)
+
+
+def ois_at(raw: RawMarketData, timestamp: int) -> Tuple[int, int]:
+    """
+    Returns the (oi_long, oi_short) values at the given timestamp
+    accounting for funding since the last market update
+    """
+    oi_long = raw.oi_long
+    oi_short = raw.oi_short
+    time_elapsed = timestamp - raw.timestamp_update_last
+    if time_elapsed <= 0:
+        return (oi_long, oi_short)
+
+    is_long_overweight = oi_long > oi_short
+    oi_over = oi_long if is_long_overweight else oi_short
+    oi_under = oi_short if is_long_overweight else oi_long
+
+    oi_tot = Decimal(oi_over + oi_under)
+    oi_imb = Decimal(oi_over - oi_under)
+    if oi_tot == 0 or oi_imb == 0:
+        return (oi_long, oi_short)
+
+    # draw down imbalance by e**(-2kt) and total by pro-rata burn
+    # OI_tot(t) = OI_tot(0) * sqrt(1 - (OI_imb(0)/OI_tot(0))**2
+    #                                  * (1 - e**(-4kt)))
+    k = Decimal(param(raw, RiskParameter.K)) / Decimal(ONE)
+    funding_factor = (-2 * k * Decimal(time_elapsed)).exp()
+    under_root = 1 - (oi_imb / oi_tot) ** 2 * (1 - funding_factor ** 2)
+    oi_tot *= under_root.sqrt()
+    oi_imb *= funding_factor
+
+    oi_over = int((oi_tot + oi_imb) / 2)
+    oi_under = int((oi_tot - oi_imb) / 2)
+    return (oi_over, oi_under) if is_long_overweight \
+        else (oi_under, oi_over)
+
+
+def funding_rate_at(raw: RawMarketData, timestamp: int) -> int:
+    """
+    Returns the funding rate at the given timestamp
+    f = 2 * k * ( oiLong - oiShort ) / (oiLong + oiShort)
+    """
+    oi_long, oi_short = ois_at(raw, timestamp)
+    oi_tot = oi_long + oi_short
+    oi_imb = oi_long - oi_short
+    if oi_tot == 0 or oi_imb == 0:
+        return 0
+
+    k = param(raw, RiskParameter.K)
+    return int(Decimal(2 * k) * Decimal(oi_imb) / Decimal(oi_tot))
+
+
+def volume_bid_at(raw: RawMarketData, fraction_of_cap_oi: int,
+                  timestamp: int) -> int:
+    """
+    Returns the rolling volume on the bid at the given timestamp
+    """
+    snap = transform_snapshot(raw.snapshot_volume_bid, timestamp,
+                              raw.data.micro_window, fraction_of_cap_oi)
+    return snap.accumulator
+
+
+def volume_ask_at(raw: RawMarketData, fraction_of_cap_oi: int,
+                  timestamp: int) -> int:
+    """
+    Returns the rolling volume on the ask at the given timestamp
+    """
+    snap = transform_snapshot(raw.snapshot_volume_ask, timestamp,
+                              raw.data.micro_window, fraction_of_cap_oi)
+    return snap.accumulator
+
+
+def _slippage(raw: RawMarketData, volume: int) -> Decimal:
+    """
+    Returns the exponent for static spread plus market impact
+    pow = delta + lmbda * volume
+    """
+    delta = Decimal(param(raw, RiskParameter.DELTA)) / Decimal(ONE)
+    lmbda = Decimal(param(raw, RiskParameter.LMBDA)) / Decimal(ONE)
+    return delta + lmbda * Decimal(volume) / Decimal(ONE)
+
+
+def bid_at(raw: RawMarketData, fraction_of_cap_oi: int,
+           timestamp: int) -> int:
+    """
+    Returns the bid price at the given timestamp
+    bid = min(priceMicro, priceMacro) * e**(-delta - lmbda * volume)
+    """
+    volume = volume_bid_at(raw, fraction_of_cap_oi, timestamp)
+    price = min(raw.data.price_over_micro_window,
+                raw.data.price_over_macro_window)
+    return int(Decimal(price) * (-_slippage(raw, volume)).exp())
+
+
+def ask_at(raw: RawMarketData, fraction_of_cap_oi: int,
+           timestamp: int) -> int:
+    """
+    Returns the ask price at the given timestamp
+    ask = max(priceMicro, priceMacro) * e**(delta + lmbda * volume)
+    """
+    volume = volume_ask_at(raw, fraction_of_cap_oi, timestamp)
+    price = max(raw.data.price_over_micro_window,
+                raw.data.price_over_macro_window)
+    return int(Decimal(price) * _slippage(raw, volume).exp())
+
+
+def notional_initial(position: PositionInfo) -> int:
+    """
+    Returns the initial notional of the position remaining
+    """
+    return position.notional_initial * position.fraction_remaining // ONE_16
+
+
+def debt_initial(position: PositionInfo) -> int:
+    """
+    Returns the initial debt of the position remaining
+    """
+    return position.debt_initial * position.fraction_remaining // ONE_16
+
+
+def oi_initial(position: PositionInfo) -> int:
+    """
+    Returns the initial oi of the position remaining
+    """
+    mid_price = tick_to_price(position.mid_tick)
+    return notional_initial(position) * ONE // mid_price
+
+
+def oi_current(position: PositionInfo, oi_total_on_side: int,
+               oi_total_shares_on_side: int) -> int:
+    """
+    Returns the current oi of the position given aggregate oi values
+    """
+    if position.oi_shares == 0 or oi_total_on_side == 0:
+        return 0
+    return position.oi_shares * oi_total_on_side // oi_total_shares_on_side
+
+
+def _oi_on_side(raw: RawMarketData, position: PositionInfo,
+                timestamp: int) -> Tuple[int, int]:
+    """
+    Returns the (oi, oi shares) totals on the side of the position
+    at the given timestamp
+    """
+    oi_long, oi_short = ois_at(raw, timestamp)
+    if position.is_long:
+        return (oi_long, raw.oi_long_shares)
+    return (oi_short, raw.oi_short_shares)
+
+
+def _value(position: PositionInfo, oi: int, current_price: int,
+           cap_payoff: int) -> int:
+    """
+    Returns the value of the position given current oi and price
+    V(t) = Q * OI(t) / OI(0) - D +/- OI(t) * [P(t) - P(0)]
+    """
+    q = notional_initial(position)
+    d = debt_initial(position)
+    oi_init = oi_initial(position)
+    if oi_init == 0:
+        return 0
+
+    entry_price = tick_to_price(position.entry_tick)
+    val = q * oi / oi_init
+    if position.is_long:
+        # longs have payoff capped at entry * (1 + capPayoff)
+        price = min(current_price, entry_price * (ONE + cap_payoff) // ONE)
+        val += oi * (price - entry_price) / ONE
+    else:
+        val += oi * (entry_price - current_price) / ONE
+    return max(int(val) - d, 0)
+
+
+def value_at(raw: RawMarketData, cap_oi: int, position: PositionInfo,
+             timestamp: int) -> int:
+    """
+    Returns the value of the position at the given timestamp holding
+    oracle data fixed. Longs exit on the bid, shorts on the ask
+    """
+    oi_tot, oi_tot_shares = _oi_on_side(raw, position, timestamp)
+    oi = oi_current(position, oi_tot, oi_tot_shares)
+    fraction = oi * ONE // cap_oi if cap_oi > 0 else 2**256 - 1
+    current_price = bid_at(raw, fraction, timestamp) if position.is_long \
+        else ask_at(raw, fraction, timestamp)
+    cap_payoff = param(raw, RiskParameter.CAP_PAYOFF)
+    return _value(position, oi, current_price, cap_payoff)
+
+
+def notional_at(raw: RawMarketData, cap_oi: int, position: PositionInfo,
+                timestamp: int) -> int:
+    """
+    Returns the notional (including PnL) of the position at the given
+    timestamp holding oracle data fixed
+    """
+    return value_at(raw, cap_oi, position, timestamp) \
+        + debt_initial(position)
+
+
+def liquidatable_at(raw: RawMarketData, position: PositionInfo,
+                    timestamp: int, margin: int = 0) -> bool:
+    """
+    Returns whether the position is liquidatable at the given timestamp
+    holding oracle data fixed. Liquidations exit at the mid price.
+    A margin (fixed point) widens the threshold by that fraction, to
+    screen for positions to then check exactly on chain
+    """
+    if position.liquidated or position.fraction_remaining == 0:
+        return False
+
+    oi_tot, oi_tot_shares = _oi_on_side(raw, position, timestamp)
+    oi = oi_current(position, oi_tot, oi_tot_shares)
+    cap_payoff = param(raw, RiskParameter.CAP_PAYOFF)
+    val = _value(position, oi, mid(raw.data), cap_payoff)
+
+    maintenance_margin = notional_initial(position) * param(
+        raw, RiskParameter.MAINTENANCE_MARGIN_FRACTION) // ONE
+    liquidation_fee = val * param(
+        raw, RiskParameter.LIQUIDATION_FEE_RATE) // ONE
+    return val < (maintenance_margin + liquidation_fee) * (ONE + margin) \
+        // ONE
+
+
+def market_projection(raw: RawMarketData,
+                      timestamps: List[int]) -> List[MarketProjection]:
+    """
+    Returns the oi values and funding rate projected forward to each
+    of the given timestamps. Mirrors OverlayV1State.marketProjection
+    """
+    projections = []
+    for timestamp in timestamps:
+        oi_long, oi_short = ois_at(raw, timestamp)
+        projections.append(MarketProjection(
+            timestamp, oi_long, oi_short, funding_rate_at(raw, timestamp)))
+    return projections
+
+
+def position_projection(raw: RawMarketData, cap_oi: int,
+                        position: PositionInfo,
+                        timestamps: List[int]) -> List[PositionProjection]:
+    """
+    Returns the position value, notional and liquidation state projected
+    forward to each of the given timestamps. Mirrors
+    OverlayV1State.positionProjection
+
+    NOTE: cap_oi is independent of time with oracle data held fixed so
+    can be fetched once from OverlayV1State.capOi
+    """
+    projections = []
+    for timestamp in timestamps:
+        projections.append(PositionProjection(
+            timestamp,
+            value_at(raw, cap_oi, position, timestamp),
+            notional_at(raw, cap_oi, position, timestamp),
+            liquidatable_at(raw, position, timestamp)
+        ))
+    return projections
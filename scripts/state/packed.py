@@ -0,0 +1,126 @@
+from typing import Dict
+
+import numpy as np
+
+
+# record layouts of the packed batch views on OverlayV1State. Fields are
+# big-endian and unaligned. Integers wider than 64 bits are kept as raw
+# bytes and converted exactly with uint_to_int below
+POSITION_DTYPE = np.dtype([
+    ("notional_initial", "u1", (12,)),  # uint96
+    ("debt_initial", "u1", (12,)),  # uint96
+    ("mid_tick", "u1", (3,)),  # int24
+    ("entry_tick", "u1", (3,)),  # int24
+    ("flags", "u1"),  # bit 0 = is_long, bit 1 = liquidated
+    ("oi_shares", "u1", (30,)),  # uint240
+    ("fraction_remaining", ">u2"),  # uint16
+])
+
+POSITION_VALUES_DTYPE = np.dtype([
+    ("value", "u1", (16,)),  # uint128
+    ("notional", "u1", (16,)),  # uint128
+    ("collateral", "u1", (16,)),  # uint128
+    ("liquidation_fee", "u1", (16,)),  # uint128
+    ("flags", "u1"),  # bit 0 = liquidatable
+])
+
+
+def decode(payload: bytes, dtype: np.dtype) -> np.ndarray:
+    """
+    Returns the structured array view over the packed payload without
+    copying
+    """
+    if len(payload) % dtype.itemsize != 0:
+        raise ValueError(
+            f"payload length {len(payload)} not a multiple of record "
+            f"size {dtype.itemsize}")
+    return np.frombuffer(payload, dtype=dtype)
+
+
+def decode_positions(payload: bytes) -> np.ndarray:
+    """
+    Returns the structured array of positions from the payload returned
+    by OverlayV1State.positionsPacked
+    """
+    return decode(payload, POSITION_DTYPE)
+
+
+def decode_position_values(payload: bytes) -> np.ndarray:
+    """
+    Returns the structured array of position values from the payload
+    returned by OverlayV1State.positionValuesPacked
+    """
+    return decode(payload, POSITION_VALUES_DTYPE)
+
+
+def uint_to_int(field: np.ndarray) -> np.ndarray:
+    """
+    Returns the exact values of the big-endian unsigned integers held as
+    raw bytes in the last axis of field, as an object array of python ints.
+    Bytes are read as big-endian uint64 words and the words combined, so
+    the python int arithmetic is per word rather than per byte
+    """
+    width = field.shape[-1]
+    words = -(-width // 8)
+    padded = np.zeros(field.shape[:-1] + (words * 8,), dtype=np.uint8)
+    padded[..., words * 8 - width:] = field
+    lanes = padded.view(">u8")
+
+    value = np.zeros(field.shape[:-1], dtype=object)
+    for k in range(words):
+        value = (value << 64) | lanes[..., k].astype(object)
+    return value
+
+
+def uint_to_float(field: np.ndarray) -> np.ndarray:
+    """
+    Returns the float64 values of the big-endian unsigned integers held
+    as raw bytes in the last axis of field. Lossy: values above 2**53 are
+    rounded, so use uint_to_int wherever exact amounts matter
+    """
+    width = field.shape[-1]
+    weights = 256.0 ** np.arange(width - 1, -1, -1)
+    return field.astype(np.float64) @ weights
+
+
+def int24_to_int(field: np.ndarray) -> np.ndarray:
+    """
+    Returns the int32 values of the big-endian int24 values held as raw
+    bytes in the last axis of field
+    """
+    b = field.astype(np.int32)
+    value = (b[..., 0] << 16) | (b[..., 1] << 8) | b[..., 2]
+    return np.where(value >= 1 << 23, value - (1 << 24), value)
+
+
+def position_columns(positions: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Returns the columns of positions decoded by decode_positions as
+    plain arrays. Integers wider than 64 bits are exact python ints
+    """
+    return {
+        "notional_initial": uint_to_int(positions["notional_initial"]),
+        "debt_initial": uint_to_int(positions["debt_initial"]),
+        "mid_tick": int24_to_int(positions["mid_tick"]),
+        "entry_tick": int24_to_int(positions["entry_tick"]),
+        "is_long": (positions["flags"] & 1).astype(bool),
+        "liquidated": (positions["flags"] & 2).astype(bool),
+        "oi_shares": uint_to_int(positions["oi_shares"]),
+        "fraction_remaining": positions["fraction_remaining"].astype(
+            np.uint16),
+    }
+
+
+def position_values_columns(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Returns the columns of position values decoded by
+    decode_position_values as plain arrays. Integers wider than 64 bits
+    are exact python ints
+    """
+    return {
+        "value": uint_to_int(values["value"]),
+        "notional": uint_to_int(values["notional"]),
+        "collateral": uint_to_int(values["collateral"]),
+        "liquidation_fee": uint_to_int(values["liquidation_fee"]),
+        "liquidatable": (values["flags"] & 1).astype(bool),
+    }
@@ -0,0 +1,152 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import requests
+
+
+# default eth_call gas cap on most nodes (geth --rpc.gascap)
+DEFAULT_GAS_BUDGET = 50000000
+
+# default number of chunks in flight at once
+DEFAULT_MAX_WORKERS = 8
+
+# fraction of the gas budget to plan for to leave headroom for
+# variance in per item gas between positions and markets
+DEFAULT_HEADROOM = 0.8
+
+# error messages nodes return when an eth_call exceeds the gas cap
+# or the request takes too long to serve
+OUT_OF_GAS_MESSAGES = (
+    "out of gas",
+    "gas required exceeds",
+    "exceeds block gas limit",
+    "gas limit reached",
+)
+TIMEOUT_MESSAGES = (
+    "timeout",
+    "timed out",
+    "execution aborted",
+    "response size exceeded",
+)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """
+    Returns whether the error from a batch call is due to the chunk being
+    too large (out of gas, timeout) and so may succeed if split
+    """
+    if isinstance(exc, (TimeoutError, requests.exceptions.Timeout)):
+        return True
+    message = str(exc).lower()
+    return any(m in message for m in OUT_OF_GAS_MESSAGES + TIMEOUT_MESSAGES)
+
+
+def plan_chunks(start: int, end: int,
+                chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Returns the (start, end) ranges splitting items [start, end) into
+    chunks of at most chunk_size items
+    """
+    return [(i, min(i + chunk_size, end))
+            for i in range(start, end, chunk_size)]
+
+
+def estimate_gas_per_item(estimate: Callable[[Sequence[Any]], int],
+                          sample: Sequence[Any]) -> int:
+    """
+    Returns the gas per item from a gas estimate of a batch call on the
+    given sample of items, e.g.
+
+        estimate = lambda chunk: state.valuesFromPositions.estimate_gas(
+            market, chunk)
+    """
+    if len(sample) == 0:
+        raise ValueError("sample is empty")
+    gas = estimate(sample)
+    return -(-gas // len(sample))
+
+
+class BatchPlanner:
+    """
+    Splits large batch queries on OverlayV1State into chunks that fit a
+    gas budget and runs them concurrently, halving the chunk size when
+    a chunk runs out of gas or times out.
+
+        planner = BatchPlanner(gas_per_item=60000)
+        values = planner.run(
+            lambda chunk: state.valuesFromPositions(market, chunk),
+            positions)
+    """
+
+    def __init__(self, gas_per_item: int,
+                 gas_budget: int = DEFAULT_GAS_BUDGET,
+                 max_items: Optional[int] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 headroom: float = DEFAULT_HEADROOM):
+        if gas_per_item <= 0:
+            raise ValueError("gas_per_item must be > 0")
+
+        self.gas_per_item = gas_per_item
+        self.gas_budget = gas_budget
+        self.max_workers = max_workers
+
+        # largest chunk that fits budget, capped by max items per
+        # response if given
+        chunk_size = max(int(gas_budget * headroom) // gas_per_item, 1)
+        if max_items is not None:
+            chunk_size = min(chunk_size, max_items)
+        self.chunk_size = chunk_size
+
+        # number of chunks split after out of gas or timeout errors
+        self.retries = 0
+
+    def _shrink(self, failed_size: int):
+        """
+        Halves the chunk size below the size of the chunk that failed
+        """
+        self.chunk_size = max(min(self.chunk_size, failed_size) // 2, 1)
+        self.retries += 1
+
+    def run(self, call: Callable[[Sequence[Any]], Sequence[Any]],
+            items: Sequence[Any]) -> List[Any]:
+        """
+        Returns the results of call over all items, in order, calling
+        it on chunks of items concurrently. call must return one result
+        per item in the chunk given
+        """
+        results: List[Any] = [None] * len(items)
+        queue = deque(plan_chunks(0, len(items), self.chunk_size))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+            while queue or pending:
+                # keep max workers busy with chunks
+                while queue and len(pending) < self.max_workers:
+                    (start, end) = queue.popleft()
+                    future = pool.submit(call, items[start:end])
+                    pending[future] = (start, end)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    (start, end) = pending.pop(future)
+                    try:
+                        output = future.result()
+                    except Exception as exc:
+                        # split chunk and retry if too large, else fail
+                        if not is_retryable(exc) or end - start <= 1:
+                            raise
+                        self._shrink(end - start)
+                        queue.appendleft((start, end))
+                        queue = deque(
+                            chunk for (s, e) in queue
+                            for chunk in plan_chunks(s, e, self.chunk_size))
+                        continue
+
+                    if len(output) != end - start:
+                        raise ValueError(
+                            f"call returned {len(output)} results "
+                            f"for {end - start} items")
+                    results[start:end] = list(output)
+
+        return results
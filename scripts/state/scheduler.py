@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class Priority(IntEnum):
+    # lower value is served first
+    LIQUIDATION = 0
+    KEEPER = 1
+    DASHBOARD = 2
+
+
+# default number of requests in flight at once across all classes
+DEFAULT_MAX_WORKERS = 16
+
+# default max requests in flight per class. Lower classes are capped
+# below max workers so liquidations always find a free worker
+DEFAULT_LIMITS = {
+    Priority.LIQUIDATION: 16,
+    Priority.KEEPER: 8,
+    Priority.DASHBOARD: 4,
+}
+
+
+class StaleRequestError(Exception):
+    """
+    Raised on the future of a request dropped for passing its deadline
+    before it was sent
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter allowing rate requests per second on
+    average with bursts of up to burst requests
+    """
+
+    def __init__(self, rate: float, burst: int,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be > 0")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token if one is available
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """
+        Returns the seconds until a token is available
+        """
+        self._refill()
+        return max((1 - self.tokens) / self.rate, 0.0)
+
+
+class _Request:
+    __slots__ = ("fn", "args", "kwargs", "priority", "endpoint",
+                 "deadline", "future")
+
+    def __init__(self, fn, args, kwargs, priority, endpoint, deadline):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.endpoint = endpoint
+        self.deadline = deadline
+        self.future: Future = Future()
+
+
+class RpcScheduler:
+    """
+    Schedules RPC requests from keeper and dashboard workloads sharing
+    nodes. Serves priority classes in order with a concurrency limit per
+    class, rate limits requests per endpoint with token buckets and drops
+    queued requests that pass their deadline before being sent.
+
+        scheduler = RpcScheduler(rates={"alchemy": (25, 50)})
+        future = scheduler.submit(state.marketState, market,
+                                  priority=Priority.DASHBOARD,
+                                  endpoint="alchemy", timeout=2)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 limits: Optional[Dict[Priority, int]] = None,
+                 rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.max_workers = max_workers
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.buckets = {
+            endpoint: TokenBucket(rate, burst, clock)
+            for endpoint, (rate, burst) in (rates or {}).items()
+        }
+
+        self._queues: Dict[Priority, Deque[_Request]] = {
+            p: deque() for p in Priority}
+        self._in_flight: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # number of requests dropped per class for passing deadline
+        self.dropped: Dict[Priority, int] = {p: 0 for p in Priority}
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._dispatcher = threading.Thread(target=self._dispatch,
+                                            daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any,
+               priority: Priority = Priority.DASHBOARD,
+               endpoint: Optional[str] = None,
+               timeout: Optional[float] = None, **kwargs: Any) -> Future:
+        """
+        Queues fn(*args, **kwargs) and returns its future. Requests not
+        sent within timeout seconds fail with StaleRequestError
+        """
+        deadline = self.clock() + timeout if timeout is not None else None
+        request = _Request(fn, args, kwargs, priority, endpoint, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is closed")
+            self._queues[priority].append(request)
+            self._cond.notify()
+        return request.future
+
+    def _next(self) -> Tuple[Optional[_Request], Optional[float]]:
+        """
+        Returns the next request to send, else the seconds to wait before
+        checking again (None to wait for a notify). Call holding lock
+        """
+        now = self.clock()
+        wait = None
+        busy = sum(self._in_flight.values()) >= self.max_workers
+        for priority in Priority:
+            queue = self._queues[priority]
+
+            # drop stale requests from this class
+            for request in [r for r in queue
+                            if r.deadline is not None and r.deadline < now]:
+                queue.remove(request)
+                self.dropped[priority] += 1
+                if not request.future.cancelled():
+                    request.future.set_exception(StaleRequestError(
+                        f"{priority.name} request passed deadline"))
+
+            # wake at next deadline in class to drop it on time
+            for request in queue:
+                if request.deadline is not None:
+                    t = request.deadline - now
+                    wait = t if wait is None else min(wait, t)
+
+            if busy or not queue \
+                    or self._in_flight[priority] >= self.limits[priority]:
+                continue
+
+            # first request in class whose endpoint has a token
+            for request in queue:
+                bucket = self.buckets.get(request.endpoint)
+                if bucket is None or bucket.try_acquire():
+                    queue.remove(request)
+                    return request, None
+                t = bucket.wait_time()
+                wait = t if wait is None else min(wait, t)
+        return None, wait
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                request, wait = self._next()
+                while request is None:
+                    if self._closed:
+                        return
+                    self._cond.wait(wait)
+                    request, wait = self._next()
+                self._in_flight[request.priority] += 1
+
+            if not request.future.set_running_or_notify_cancel():
+                self._done(request.priority)
+                continue
+            self._pool.submit(self._run, request)
+
+    def _run(self, request: _Request):
+        try:
+            result = request.fn(*request.args, **request.kwargs)
+        except BaseException as exc:
+            request.future.set_exception(exc)
+        else:
+            request.future.set_result(result)
+        finally:
+            self._done(request.priority)
+
+    def _done(self, priority: Priority):
+        with self._cond:
+            self._in_flight[priority] -= 1
+            self._cond.notify()
+
+    def pending(self, priority: Priority) -> int:
+        """
+        Returns the number of requests queued for the class
+        """
+        with self._cond:
+            return len(self._queues[priority])
+
+    def close(self):
+        """
+        Stops accepting requests, cancels queued requests and waits for
+        requests in flight
+        """
+        with self._cond:
+            self._closed = True
+            for queue in self._queues.values():
+                while queue:
+                    queue.popleft().future.cancel()
+            self._cond.notify()
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,308 @@
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from web3 import Web3
+
+from scripts.state.offline import RawMarketData, to_raw_market_data
+
+
+# identifies a shared memory block written by SnapshotPublisher
+MAGIC = 0x4F564C31  # "OVL1"
+
+# version of the shared memory layout. Bump on any change to the dtypes
+LAYOUT_VERSION = 1
+
+WORD = 32
+
+# words in the abi encoded return data of OverlayV1State.marketState and
+# each element of OverlayV1State.rawMarketDataBatch (all static fields)
+MARKET_STATE_WORDS = 10
+RAW_MARKET_DATA_WORDS = 38
+
+# header at the start of the block. generation is the seqlock counter:
+# odd while the publisher is writing, even once all records are written
+HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"),
+    ("version", "<u4"),
+    ("capacity", "<u4"),
+    ("count", "<u4"),
+    ("generation", "<u8"),
+    ("block", "<u8"),
+    ("timestamp", "<u8"),
+    ("reserved", "V24"),
+])
+
+# snapshot record per market. market_state and raw_market_data hold the
+# abi encoded return data of the State views as is
+SNAPSHOT_DTYPE = np.dtype([
+    ("market", "V20"),
+    ("reserved", "V4"),
+    ("block", "<u8"),
+    ("market_state", "u1", (MARKET_STATE_WORDS * WORD,)),
+    ("raw_market_data", "u1", (RAW_MARKET_DATA_WORDS * WORD,)),
+])
+
+
+class MarketState(NamedTuple):
+    bid: int
+    ask: int
+    mid: int
+    volume_bid: int
+    volume_ask: int
+    oi_long: int
+    oi_short: int
+    cap_oi: int
+    circuit_breaker_level: int
+    funding_rate: int
+
+
+class Snapshot(NamedTuple):
+    generation: int
+    block: int
+    timestamp: int
+    records: np.ndarray
+
+
+def _size(capacity: int) -> int:
+    return HEADER_DTYPE.itemsize + capacity * SNAPSHOT_DTYPE.itemsize
+
+
+def _views(buf: memoryview, capacity: int):
+    header = np.ndarray((), dtype=HEADER_DTYPE, buffer=buf)
+    records = np.ndarray((capacity,), dtype=SNAPSHOT_DTYPE, buffer=buf,
+                         offset=HEADER_DTYPE.itemsize)
+    return header, records
+
+
+def _words(data: bytes, signed: Optional[List[int]] = None) -> List[int]:
+    """
+    Returns the abi encoded words in data as ints, signed at the given
+    word indices
+    """
+    signed = signed or []
+    return [
+        int.from_bytes(data[i*WORD:(i+1)*WORD], "big",
+                       signed=(i in signed))
+        for i in range(len(data) // WORD)
+    ]
+
+
+def decode_market_state_data(data: bytes) -> MarketState:
+    """
+    Returns the market state from the abi encoded return data of
+    OverlayV1State.marketState
+    """
+    return MarketState(*_words(data, signed=[9]))
+
+
+def decode_market_state(record: np.void) -> MarketState:
+    """
+    Returns the market state in the snapshot record
+    """
+    return decode_market_state_data(record["market_state"].tobytes())
+
+
+def decode_raw_market_data(record: np.void) -> RawMarketData:
+    """
+    Returns the raw market data in the snapshot record for use with the
+    offline helpers
+    """
+    # accumulators on roller snapshots are int192
+    words = _words(record["raw_market_data"].tobytes(),
+                   signed=[8, 11, 14])
+    feed = Web3.toChecksumAddress(words[0].to_bytes(20, "big"))
+    return to_raw_market_data((
+        feed, *words[1:6], words[6:9], words[9:12], words[12:15],
+        words[15:30], words[30:38]
+    ))
+
+
+class SnapshotPublisher:
+    """
+    Publishes the marketState and rawMarketData of each market from
+    OverlayV1State into shared memory once per block, for readers in
+    other processes on the same host.
+
+        publisher = SnapshotPublisher(w3, state.address, state.abi,
+                                      markets, name="ovl-markets")
+        publisher.run()
+    """
+
+    def __init__(self, w3: Web3, state_address: str, state_abi: List[Dict],
+                 markets: List[str], name: Optional[str] = None,
+                 capacity: Optional[int] = None):
+        capacity = capacity or len(markets)
+        if len(markets) > capacity:
+            raise ValueError("more markets than capacity")
+
+        self.w3 = w3
+        self.state = w3.eth.contract(address=state_address, abi=state_abi)
+        self.markets = [Web3.toChecksumAddress(m) for m in markets]
+        self.capacity = capacity
+
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_size(capacity))
+        self.header, self.records = _views(self.shm.buf, capacity)
+        self.header["magic"] = MAGIC
+        self.header["version"] = LAYOUT_VERSION
+        self.header["capacity"] = capacity
+        self.header["count"] = 0
+        self.header["generation"] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _call(self, fn_name: str, args: List, block: int) -> bytes:
+        data = self.state.encodeABI(fn_name=fn_name, args=args)
+        return bytes(self.w3.eth.call(
+            {"to": self.state.address, "data": data}, block))
+
+    def publish(self, block: int):
+        """
+        Fetches the snapshot of every market as of block and writes it
+        to shared memory under the seqlock
+        """
+        timestamp = self.w3.eth.get_block(block)["timestamp"]
+
+        # raw data for all markets in one call: static struct elements
+        # are laid out back to back after the array offset and length
+        size = RAW_MARKET_DATA_WORDS * WORD
+        raw = self._call("rawMarketDataBatch", [self.markets], block)[2*WORD:]
+        states = [self._call("marketState", [market], block)
+                  for market in self.markets]
+
+        # odd generation marks write in progress
+        self.header["generation"] += 1
+        for i, market in enumerate(self.markets):
+            record = self.records[i]
+            record["market"] = bytes.fromhex(market[2:])
+            record["block"] = block
+            record["market_state"] = np.frombuffer(states[i], dtype="u1")
+            record["raw_market_data"] = np.frombuffer(
+                raw[i*size:(i+1)*size], dtype="u1")
+        self.header["count"] = len(self.markets)
+        self.header["block"] = block
+        self.header["timestamp"] = timestamp
+        self.header["generation"] += 1
+
+    def run(self, poll_interval: float = 1.0):
+        """
+        Publishes snapshots on each new block until interrupted
+        """
+        last = None
+        while True:
+            block = self.w3.eth.block_number
+            if block != last:
+                self.publish(block)
+                last = block
+            time.sleep(poll_interval)
+
+    def close(self):
+        """
+        Detaches from and removes the shared memory block
+        """
+        del self.header, self.records
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SnapshotReader:
+    """
+    Reads consistent market snapshots written to shared memory by
+    SnapshotPublisher, without any RPC calls.
+
+    view returns the records in place without copying. The publisher may
+    overwrite them at any time, so check valid once done with the view
+    and discard what was decoded from it if not:
+
+        reader = SnapshotReader("ovl-markets")
+        while True:
+            snapshot = reader.view()
+            state = decode_market_state(snapshot.records[0])
+            if reader.valid(snapshot):
+                break
+
+    read returns a copy taken under the seqlock instead, for snapshots
+    held past the next publish
+    """
+
+    def __init__(self, name: str):
+        self.shm = shared_memory.SharedMemory(name=name)
+
+        # publisher owns the block, so stop the resource tracker from
+        # removing it when this process exits
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if header["magic"] != MAGIC:
+            raise ValueError(f"shared memory {name} not a market snapshot")
+        if header["version"] != LAYOUT_VERSION:
+            raise ValueError(
+                f"layout version {header['version']} != {LAYOUT_VERSION}")
+        self.header, self.records = _views(self.shm.buf,
+                                           int(header["capacity"]))
+
+    def _snapshot(self, timeout: float, copy: bool) -> Snapshot:
+        deadline = time.monotonic() + timeout
+        while True:
+            generation = int(self.header["generation"])
+            if generation % 2 == 0:
+                count = int(self.header["count"])
+                block = int(self.header["block"])
+                timestamp = int(self.header["timestamp"])
+                records = self.records[:count]
+                if copy:
+                    records = records.copy()
+                else:
+                    records.flags.writeable = False
+                if int(self.header["generation"]) == generation:
+                    return Snapshot(generation, block, timestamp, records)
+            if time.monotonic() > deadline:
+                raise TimeoutError("snapshot publisher stuck mid write")
+            time.sleep(0)
+
+    def view(self, timeout: float = 1.0) -> Snapshot:
+        """
+        Returns the latest snapshot as a read-only view of the records in
+        shared memory, without copying. Consistent only while valid
+        returns True for it. Retries while the publisher is mid write and
+        raises TimeoutError if it does not finish within timeout
+        """
+        return self._snapshot(timeout, copy=False)
+
+    def valid(self, snapshot: Snapshot) -> bool:
+        """
+        Returns whether the publisher has not written since the snapshot
+        was taken, so everything read from a view of it so far is
+        consistent
+        """
+        return int(self.header["generation"]) == snapshot.generation
+
+    def read(self, timeout: float = 1.0) -> Snapshot:
+        """
+        Returns a consistent copy of the latest snapshot. Retries while
+        the publisher is mid write and raises TimeoutError if it does
+        not finish within timeout
+        """
+        return self._snapshot(timeout, copy=True)
+
+    def market(self, snapshot: Snapshot, market: str) -> np.void:
+        """
+        Returns the record for the market in the snapshot
+        """
+        key = bytes.fromhex(Web3.toChecksumAddress(market)[2:])
+        for record in snapshot.records:
+            if record["market"].tobytes() == key:
+                return record
+        raise KeyError(market)
+
+    def close(self):
+        """
+        Detaches from the shared memory block. Views must be dropped
+        first
+        """
+        del self.header, self.records
+        self.shm.close()
@@ -0,0 +1,161 @@
+import struct
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+
+from scripts.state.shared import MarketState, Snapshot, decode_market_state
+
+
+# version of the frame format. Bump on any change to the framing
+STREAM_VERSION = 1
+
+# frame kinds. Keyframes carry every field, deltas only changed fields
+KEYFRAME = 0
+DELTA = 1
+
+# default number of frames per market between keyframes
+DEFAULT_KEYFRAME_INTERVAL = 100
+
+# frame header after the u32 length prefix: version, kind, block,
+# market address, mask of fields present by index in MarketState
+_HEADER = struct.Struct(">BBQ20sH")
+_LENGTH = struct.Struct(">I")
+
+_FIELDS = len(MarketState._fields)
+_ALL_FIELDS = (1 << _FIELDS) - 1
+
+
+class Update(NamedTuple):
+    block: int
+    market: str
+    kind: int
+    changed: List[str]
+    state: MarketState
+
+
+def _encode_int(value: int) -> bytes:
+    """
+    Returns value as a u8 length followed by its minimal big-endian
+    two's complement bytes
+    """
+    length = (value + (value < 0)).bit_length() // 8 + 1
+    return bytes([length]) + value.to_bytes(length, "big", signed=True)
+
+
+class MarketStateEncoder:
+    """
+    Diffs successive market states per market and encodes only the
+    changed fields into length-prefixed binary frames, with a full
+    keyframe every keyframe_interval frames for late joiners.
+
+    Frame: u32 length | u8 version | u8 kind | u64 block | 20 byte market
+    | u16 field mask | per field in mask: u8 length | signed int
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval <= 0:
+            raise ValueError("keyframe_interval must be > 0")
+        self.keyframe_interval = keyframe_interval
+        self._last: Dict[bytes, MarketState] = {}
+        self._since_keyframe: Dict[bytes, int] = {}
+
+    def encode(self, block: int, market: str,
+               state: MarketState) -> Optional[bytes]:
+        """
+        Returns the frame for the market state at block, or None if no
+        field changed since the last frame and no keyframe is due. Call
+        once per block per market
+        """
+        key = bytes.fromhex(market[2:])
+        last = self._last.get(key)
+        since = self._since_keyframe.get(key, 0)
+
+        # count blocks not frames so quiet markets still get keyframes
+        if last is None or since + 1 >= self.keyframe_interval:
+            kind, mask = KEYFRAME, _ALL_FIELDS
+            self._since_keyframe[key] = 0
+        else:
+            kind, mask = DELTA, 0
+            for i, (a, b) in enumerate(zip(last, state)):
+                if a != b:
+                    mask |= 1 << i
+            self._since_keyframe[key] = since + 1
+            if mask == 0:
+                return None
+        self._last[key] = state
+
+        body = _HEADER.pack(STREAM_VERSION, kind, block, key, mask) \
+            + b"".join(_encode_int(state[i]) for i in range(_FIELDS)
+                       if mask & (1 << i))
+        return _LENGTH.pack(len(body)) + body
+
+    def encode_snapshot(self, snapshot: Snapshot) -> List[bytes]:
+        """
+        Returns the frames for the markets in a snapshot read from
+        shared memory, skipping markets that did not change
+        """
+        frames = []
+        for record in snapshot.records:
+            market = "0x" + record["market"].tobytes().hex()
+            frame = self.encode(int(record["block"]), market,
+                                decode_market_state(record))
+            if frame is not None:
+                frames.append(frame)
+        return frames
+
+
+class MarketStateDecoder:
+    """
+    Applies frames from MarketStateEncoder to rebuild the full market
+    state per market. Deltas for a market are ignored until its first
+    keyframe arrives
+    """
+
+    def __init__(self):
+        self.states: Dict[str, MarketState] = {}
+
+    def decode(self, frame: bytes) -> Optional[Update]:
+        """
+        Returns the update from the frame, or None for a delta on a
+        market without a keyframe yet
+        """
+        body = memoryview(frame)[_LENGTH.size:]
+        (version, kind, block, key, mask) = _HEADER.unpack_from(body)
+        if version != STREAM_VERSION:
+            raise ValueError(
+                f"stream version {version} != {STREAM_VERSION}")
+
+        market = "0x" + key.hex()
+        last = self.states.get(market)
+        if kind == DELTA and last is None:
+            return None
+        if kind == KEYFRAME and mask != _ALL_FIELDS:
+            raise ValueError("keyframe missing fields")
+
+        values = list(last) if last is not None else [0] * _FIELDS
+        changed = []
+        offset = _HEADER.size
+        for i in range(_FIELDS):
+            if mask & (1 << i):
+                length = body[offset]
+                values[i] = int.from_bytes(body[offset+1:offset+1+length],
+                                           "big", signed=True)
+                offset += 1 + length
+                changed.append(MarketState._fields[i])
+
+        state = MarketState(*values)
+        self.states[market] = state
+        return Update(block, market, kind, changed, state)
+
+
+def read_frames(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Yields the length-prefixed frames from the stream until it ends
+    """
+    while True:
+        prefix = stream.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(prefix)
+        body = stream.read(length)
+        if len(body) < length:
+            raise EOFError("stream ended mid frame")
+        yield prefix + body
@@ -0,0 +1,132 @@
+import os
+
+import pytest
+from brownie import web3
+
+from scripts.devnet.snapshot import ChainSnapshot
+from scripts.rpc.accounting import (
+    CALL,
+    RPC_BUDGET_ENV,
+    RPC_BUDGET_UPDATE_ENV,
+    RPC_CALL_GAS_ENV,
+    RPC_REPORT_ENV,
+    SETUP,
+    TEARDOWN,
+    AccountingProvider,
+    RpcLedger,
+    load_budget,
+    save_budget
+)
+
+
+# number of tests listed in the terminal summary of rpc usage
+SUMMARY_TESTS = 10
+
+# key of the usage parallel test workers hand back to the controller
+WORKER_OUTPUT_KEY = "rpc_usage"
+
+# accounts rpc requests, gas and durations when a report or budget is
+# requested, e.g. RPC_REPORT=rpc.json RPC_BUDGET=rpc-budget.json
+LEDGER = RpcLedger() if os.environ.get(RPC_REPORT_ENV) \
+    or os.environ.get(RPC_BUDGET_ENV) else None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def rpc_accounting():
+    if LEDGER is None:
+        yield None
+        return
+
+    provider = web3.provider
+    estimate_calls = bool(os.environ.get(RPC_CALL_GAS_ENV))
+    web3.provider = AccountingProvider(provider, LEDGER, estimate_calls)
+    yield LEDGER
+    web3.provider = provider
+
+
+# overrides brownie module_isolation, which resets the chain, to revert
+# the changes of each module instead. A reset would also discard session
+# snapshots like the tests/state deployment, lost whenever xdist runs a
+# module of another suite between two state modules on the same worker
+@pytest.fixture(scope="module")
+def module_isolation():
+    snapshot = ChainSnapshot()
+    yield
+    snapshot.revert()
+
+
+def _account(item, phase):
+    if LEDGER is not None:
+        LEDGER.start(item.nodeid, phase)
+    try:
+        yield
+    finally:
+        if LEDGER is not None:
+            LEDGER.stop()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    yield from _account(item, SETUP)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield from _account(item, CALL)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    yield from _account(item, TEARDOWN)
+
+
+# under xdist each worker hands its usage to the controller, which
+# merges them to write one report and check the budget once
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    if LEDGER is not None:
+        LEDGER.merge(getattr(node, "workeroutput", {}).get(
+            WORKER_OUTPUT_KEY, []))
+
+
+def pytest_sessionfinish(session):
+    if LEDGER is None:
+        return
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput[WORKER_OUTPUT_KEY] = LEDGER.export()
+        return
+    if not LEDGER.tests:
+        return
+
+    report = os.environ.get(RPC_REPORT_ENV)
+    if report:
+        LEDGER.write_report(report)
+
+    # fail the run when a test body makes more rpc requests than budget
+    budget = os.environ.get(RPC_BUDGET_ENV)
+    if budget and os.environ.get(RPC_BUDGET_UPDATE_ENV):
+        save_budget(budget, LEDGER.budget())
+    elif budget and os.path.exists(budget):
+        if LEDGER.regressions(load_budget(budget)):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter):
+    if LEDGER is None or not LEDGER.tests:
+        return
+
+    terminalreporter.section("rpc usage")
+    for usage in LEDGER.ranked()[:SUMMARY_TESTS]:
+        durations = usage["durations"]
+        terminalreporter.write_line(
+            f"{usage['rpc_count']:>6} rpc {usage['tx_gas']:>12} gas "
+            f"{durations.get(SETUP, 0):>7.2f}s setup "
+            f"{durations.get(CALL, 0):>7.2f}s call  {usage['nodeid']}")
+
+    budget = os.environ.get(RPC_BUDGET_ENV)
+    if budget and os.path.exists(budget) \
+            and not os.environ.get(RPC_BUDGET_UPDATE_ENV):
+        for r in LEDGER.regressions(load_budget(budget)):
+            terminalreporter.write_line(
+                f"rpc budget exceeded: {r.nodeid} {r.actual} > {r.budget}",
+                red=True)
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+from scripts.devnet.dump import fingerprint, load_devnet, save_devnet
+
+
+class FakeProvider:
+    def __init__(self):
+        self.state = "0x1f8b00"
+        self.loaded = None
+
+    def make_request(self, method, params):
+        if method == "anvil_dumpState":
+            return {"result": self.state}
+        if method == "anvil_loadState":
+            self.loaded = params[0]
+            return {"result": True}
+        return {"error": {"message": f"{method} not supported"}}
+
+
+def fake_web3(client_version="anvil/v0.2.0", chain_id=1337):
+    return SimpleNamespace(
+        clientVersion=client_version,
+        eth=SimpleNamespace(chain_id=chain_id, block_number=42),
+        provider=FakeProvider(),
+    )
+
+
+def fake_container(name, bytecode):
+    return SimpleNamespace(_name=name, bytecode=bytecode)
+
+
+def test_fingerprint_changes_with_bytecode(tmp_path):
+    conftest = tmp_path / "conftest.py"
+    conftest.write_text("params = [1]")
+    files = [str(conftest)]
+
+    expect = fingerprint([fake_container("A", "0x6080")], files, ["dev"])
+    actual = fingerprint([fake_container("A", "0x6080")], files, ["dev"])
+    assert actual == expect
+
+    actual = fingerprint([fake_container("A", "0x6081")], files, ["dev"])
+    assert actual != expect
+
+    actual = fingerprint([fake_container("A", "0x6080")], files, ["fork"])
+    assert actual != expect
+
+    conftest.write_text("params = [2]")
+    actual = fingerprint([fake_container("A", "0x6080")], files, ["dev"])
+    assert actual != expect
+
+
+def test_save_load_devnet(tmp_path):
+    path = str(tmp_path)
+    web3 = fake_web3()
+    contracts = {"ovl": SimpleNamespace(address="0x01"),
+                 "state": SimpleNamespace(address="0x02")}
+    assert save_devnet(web3, path, "abc", contracts)
+
+    web3 = fake_web3()
+    actual = load_devnet(web3, path, "abc")
+    assert actual == {"ovl": "0x01", "state": "0x02"}
+    assert web3.provider.loaded == "0x1f8b00"
+
+
+def test_load_devnet_when_stale(tmp_path, monkeypatch):
+    path = str(tmp_path)
+    assert load_devnet(fake_web3(), path, "abc") is None
+
+    save_devnet(fake_web3(), path, "abc",
+                {"ovl": SimpleNamespace(address="0x01")})
+    assert load_devnet(fake_web3(), path, "def") is None
+    assert load_devnet(fake_web3(chain_id=1), path, "abc") is None
+
+    monkeypatch.setenv("DEVNET_REBUILD", "1")
+    assert load_devnet(fake_web3(), path, "abc") is None
+
+
+def test_save_load_devnet_when_not_anvil(tmp_path):
+    path = str(tmp_path)
+    web3 = fake_web3(client_version="EthereumJS TestRPC/v2.13.2/ethereum-js")
+    assert not save_devnet(web3, path, "abc", {})
+    assert load_devnet(web3, path, "abc") is None
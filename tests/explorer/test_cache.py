@@ -0,0 +1,107 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from scripts.explorer.cache import ExplorerCache, ExplorerContract
+
+
+ERC20_ABI = [
+    {"type": "function", "name": "name", "inputs": [],
+     "outputs": [{"name": "", "type": "string"}],
+     "stateMutability": "view"},
+    {"type": "function", "name": "decimals", "inputs": [],
+     "outputs": [{"name": "", "type": "uint8"}],
+     "stateMutability": "view"},
+]
+
+DAI = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+class FakeExplorer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, chain_id, address):
+        self.calls.append((chain_id, address))
+        return ExplorerContract(
+            name=f"Token{len(self.calls)}",
+            abi=ERC20_ABI,
+            sources=[{"SourceCode": f"contract at {address}"}],
+        )
+
+
+def test_get_or_fetch_fetches_once(tmp_path):
+    fetch = FakeExplorer()
+    cache = ExplorerCache(str(tmp_path), fetch=fetch)
+
+    expect = cache.get_or_fetch(1, DAI)
+    actual = cache.get_or_fetch(1, DAI)
+    assert actual == expect
+    assert fetch.calls == [(1, DAI)]
+    assert cache.misses == 1
+
+    # new cache on same path reads from disk without fetching
+    fetch = FakeExplorer()
+    cache = ExplorerCache(str(tmp_path), fetch=fetch)
+    actual = cache.get_or_fetch(1, DAI.lower())
+    assert actual == expect
+    assert fetch.calls == []
+    assert cache.misses == 0
+
+
+def fetch_all(path, addresses):
+    cache = ExplorerCache(path, fetch=FakeExplorer())
+    return [cache.get_or_fetch(1, address).abi for address in addresses]
+
+
+def test_get_or_fetch_from_concurrent_processes(tmp_path):
+    # parallel test workers populating the same cache
+    path = str(tmp_path)
+    addresses = [DAI, WETH] * 8
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(fetch_all, [path] * 4, [addresses] * 4))
+
+    assert all(abi == ERC20_ABI for abis in results for abi in abis)
+    cache = ExplorerCache(path, fetch=FakeExplorer())
+    assert cache.get(1, DAI).abi == ERC20_ABI
+    assert not [f for (_, _, files) in os.walk(tmp_path) for f in files
+                if f.endswith(".tmp")]
+
+
+def test_get_keyed_by_chain_id(tmp_path):
+    cache = ExplorerCache(str(tmp_path), fetch=FakeExplorer())
+    cache.get_or_fetch(1, DAI)
+    assert cache.get(1, DAI) is not None
+    assert cache.get(42161, DAI) is None
+
+
+def test_put_shares_objects_by_content(tmp_path):
+    cache = ExplorerCache(str(tmp_path), fetch=FakeExplorer())
+    cache.get_or_fetch(1, DAI)
+    cache.get_or_fetch(1, WETH)
+
+    # one shared abi object, one sources object per address
+    objects = [f for (_, _, files) in os.walk(tmp_path / "objects")
+               for f in files]
+    assert len(objects) == 3
+    assert cache.get(1, DAI).abi == cache.get(1, WETH).abi
+
+
+def test_get_raises_when_object_corrupt(tmp_path):
+    cache = ExplorerCache(str(tmp_path), fetch=FakeExplorer())
+    cache.get_or_fetch(1, DAI)
+    for (root, _, files) in os.walk(tmp_path / "objects"):
+        for f in files:
+            with open(os.path.join(root, f), "ab") as obj:
+                obj.write(b" ")
+
+    with pytest.raises(ValueError, match="corrupt"):
+        cache.get(1, DAI)
+
+
+def test_cache_dir_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPLORER_CACHE_DIR", str(tmp_path))
+    cache = ExplorerCache(fetch=FakeExplorer())
+    assert cache.path == str(tmp_path)
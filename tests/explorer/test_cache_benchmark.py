@@ -0,0 +1,49 @@
+import time
+
+from scripts.explorer.cache import ExplorerCache
+
+from .test_cache import FakeExplorer
+
+
+# explorer contracts resolved by the conftest fixtures
+ADDRESSES = [
+    "0x6B175474E89094C44Da98b954EedeAC495271d0F",  # dai
+    "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",  # weth
+    "0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984",  # uni
+    "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",  # usdc
+    "0xC2e9F25Be6257c210d7Adf0D4Cd6E3E881ba25f8",  # pool_daiweth_30bps
+    "0x1d42064Fc4Beb5F8aAF85F4617AE8b3b5B8Bd801",  # pool_uniweth_30bps
+    "0x6c6Bc977E13Df9b0de53b251522280BB72383700",  # pool_daiusdc_5bps
+    "0x1F98431c8aD98523631AE4a59f267346ea31F984",  # uni_factory
+    "0xC36442b4a4522E871399CD717aBDD847Ab11FE88",  # pos_manager
+    "0xf574E14f28ACb46aF71c42d827CD4Ff389E7723D",  # staker
+]
+
+# explorer round trip, free api tier is also limited to 5 calls/s
+EXPLORER_LATENCY = 0.2
+
+
+class SlowExplorer(FakeExplorer):
+    def __call__(self, chain_id, address):
+        time.sleep(EXPLORER_LATENCY)
+        return super().__call__(chain_id, address)
+
+
+def startup(cache):
+    start = time.perf_counter()
+    for address in ADDRESSES:
+        cache.get_or_fetch(1, address)
+    return time.perf_counter() - start
+
+
+def test_cache_cold_warm_startup(tmp_path):
+    cold = startup(ExplorerCache(str(tmp_path), fetch=SlowExplorer()))
+
+    # new session on the same cache dir
+    cache = ExplorerCache(str(tmp_path), fetch=SlowExplorer())
+    warm = startup(cache)
+
+    assert cache.misses == 0
+    assert warm < cold / 10
+    print(f"\ncontracts: {len(ADDRESSES)}, cold: {cold:.3f}s, "
+          f"warm: {warm:.3f}s, speedup: {cold / warm:.0f}x")
@@ -1,54 +1,136 @@
+import math
+from typing import List
+
 import pytest
-from brownie import Contract, OverlayV1FeeDisperser, web3
+from brownie import (
+    Contract, ERC20Mock, NonfungiblePositionManagerMock,
+    OverlayV1FeeDisperser, UniswapV3FactoryMock, UniswapV3PoolMock,
+    UniswapV3StakerMock, network, web3
+)
 from dotenv import load_dotenv
 
+from scripts.devnet.dump import (
+    devnet_dir, fingerprint, load_devnet, save_devnet, supports_dump
+)
+from scripts.devnet.snapshot import ChainSnapshot
+from scripts.explorer.cache import ExplorerCache
+
 load_dotenv()
 
 
-@pytest.fixture(scope="module")
+# mainnet tokens stood in for when offline as (name, symbol, decimals),
+# in order of mainnet address
+OFFLINE_TOKENS = {
+    "uni": ("Uniswap", "UNI", 18),
+    "dai": ("Dai Stablecoin", "DAI", 18),
+    "usdc": ("USD Coin", "USDC", 6),
+    "weth": ("Wrapped Ether", "WETH", 18),
+}
+
+
+# supply of the ovl token set up by the session deployment. A constant
+# rather than a fixture param as pytest only allows requesting fixtures
+# dynamically when they are not parametrized
+TOKEN_SUPPLY = 8000000
+
+# fixtures the session deployment sets up when any collected test uses
+# them, in deploy order
+DEPLOYMENT_FIXTURES = (
+    "ovl",
+    "offline_tokens",
+    "uni_factory",
+    "pool_daiweth_30bps",
+    "pool_uniweth_30bps",
+    "pool_daiusdc_5bps",
+    "pos_manager",
+    "staker",
+)
+
+
+def used_fixtures(session) -> List[str]:
+    """
+    Returns the deployment fixtures used by any collected test
+    """
+    names = set()
+    for item in session.items:
+        names.update(getattr(item, "fixturenames", ()))
+    return [name for name in DEPLOYMENT_FIXTURES if name in names]
+
+
+def deploy_tokens(deployer, tokens):
+    """
+    Deploys ERC20 mocks for the tokens with addresses sorted in the same
+    order as given, so pool token0, token1 match mainnet
+    """
+    nonce = deployer.nonce
+    addresses = [deployer.get_deployment_address(nonce + i)
+                 for i in range(len(tokens))]
+    ranks = sorted(range(len(tokens)), key=lambda i: int(addresses[i], 16))
+
+    names = list(tokens.keys())
+    deployed = {}
+    for i in range(len(tokens)):
+        name = names[ranks.index(i)]
+        deployed[name] = deployer.deploy(ERC20Mock, *tokens[name])
+    return deployed
+
+
+def create_pool(factory, base, quote, fee, price, liquidity, deployer):
+    """
+    Creates a mock pool with constant price of base in terms of quote
+    """
+    raw_price = price * 10 ** quote.decimals() / 10 ** base.decimals()
+    if int(base.address, 16) > int(quote.address, 16):
+        raw_price = 1 / raw_price
+    tick = math.floor(math.log(raw_price) / math.log(1.0001))
+    tx = factory.createPool(base, quote, fee, tick, liquidity,
+                            {"from": deployer})
+    return UniswapV3PoolMock.at(tx.return_value)
+
+
+@pytest.fixture(scope="session")
 def ovl_v1_core(pm):
     return pm("overlay-market/v1-core@1.0.0-rc.0")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gov(accounts):
     yield accounts[0]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def alice(accounts):
     yield accounts[1]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def bob(accounts):
     yield accounts[2]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def rando(accounts):
     yield accounts[3]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def minter_role():
     yield web3.solidityKeccak(['string'], ["MINTER"])
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def burner_role():
     yield web3.solidityKeccak(['string'], ["BURNER"])
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def governor_role():
     yield web3.solidityKeccak(['string'], ["GOVERNOR"])
 
 
-@pytest.fixture(scope="module", params=[8000000])
-def create_token(ovl_v1_core, gov, alice, bob, minter_role, governor_role,
-                 request):
-    sup = request.param
+@pytest.fixture(scope="session")
+def create_token(ovl_v1_core, gov, alice, bob, minter_role, governor_role):
+    sup = TOKEN_SUPPLY
 
     def create_token(supply=sup):
         ovl = ovl_v1_core.OverlayV1Token
@@ -69,62 +151,209 @@ def create_token(ovl_v1_core, gov, alice, bob, minter_role, governor_role,
     yield create_token
 
 
-@pytest.fixture(scope="module")
-def ovl(create_token):
-    yield create_token()
-
-
-@pytest.fixture(scope="module")
-def dai():
-    yield Contract.from_explorer("0x6B175474E89094C44Da98b954EedeAC495271d0F")
-
-
-@pytest.fixture(scope="module")
-def weth():
-    yield Contract.from_explorer("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
-
-
-@pytest.fixture(scope="module")
-def uni():
+@pytest.fixture(scope="session")
+def ovl(create_token, ovl_v1_core, devnet):
+    if "ovl" in devnet:
+        yield ovl_v1_core.OverlayV1Token.at(devnet["ovl"])
+    else:
+        yield create_token()
+
+
+@pytest.fixture(scope="session")
+def devnet_fingerprint(ovl_v1_core, accounts):
+    # rebuild the dump when deployed bytecode, this setup, the network
+    # or the accounts change
+    contracts = [
+        ERC20Mock,
+        NonfungiblePositionManagerMock,
+        UniswapV3FactoryMock,
+        UniswapV3PoolMock,
+        UniswapV3StakerMock,
+        ovl_v1_core.OverlayV1Token,
+    ]
+    extra = [network.show_active(), [str(a) for a in accounts]]
+    yield fingerprint(contracts, [__file__], extra)
+
+
+# addresses of contracts by fixture name when loaded from the devnet
+# dump, else empty and fixtures deploy as usual
+@pytest.fixture(scope="session")
+def devnet(devnet_fingerprint):
+    addresses = load_devnet(web3, devnet_dir("feedisperser"),
+                            devnet_fingerprint)
+    yield addresses if addresses is not None else {}
+
+
+# deploy the contracts used by the collected tests once per session,
+# before any module snapshots so fixtures are never deployed within a
+# reverted test
+@pytest.fixture(scope="session")
+def deployment(devnet, devnet_fingerprint, request):
+    # deploy everything when saving a dump, as later sessions load it
+    # whichever tests they collect, else only what these tests use
+    dumping = not devnet and supports_dump(web3)
+    names = DEPLOYMENT_FIXTURES if dumping \
+        else used_fixtures(request.session)
+
+    contracts = {}
+    for name in names:
+        value = request.getfixturevalue(name)
+        if isinstance(value, dict):
+            contracts.update(value)
+        else:
+            contracts[name] = value
+
+    # save the setup for the next session if not loaded from a dump
+    if dumping:
+        save_devnet(web3, devnet_dir("feedisperser"), devnet_fingerprint,
+                    contracts)
+
+    yield ChainSnapshot()
+
+
+# overrides module_isolation to revert to the session deployment before
+# and after each module instead of redeploying for each module
+@pytest.fixture(scope="module", autouse=True)
+def module_isolation(deployment):
+    deployment.revert()
+    yield
+    deployment.revert()
+
+
+@pytest.fixture(scope="session")
+def explorer_cache():
+    yield ExplorerCache()
+
+
+# builds mainnet contracts from ABIs in the local explorer cache, only
+# fetching from the explorer the first time an address is used
+@pytest.fixture(scope="session")
+def explorer(explorer_cache):
+    def explorer(address, chain_id=1):
+        contract = explorer_cache.get_or_fetch(chain_id, address)
+        return Contract.from_abi(contract.name, address, contract.abi)
+
+    yield explorer
+
+
+# use local stand ins for mainnet contracts unless on a fork, e.g.
+# brownie test --network development
+@pytest.fixture(scope="session")
+def offline():
+    yield "fork" not in network.show_active()
+
+
+@pytest.fixture(scope="session")
+def offline_tokens(offline, gov, devnet):
+    if not offline:
+        yield {}
+    elif "dai" in devnet:
+        yield {name: ERC20Mock.at(devnet[name]) for name in OFFLINE_TOKENS}
+    else:
+        yield deploy_tokens(gov, OFFLINE_TOKENS)
+
+
+@pytest.fixture(scope="session")
+def dai(offline, offline_tokens, explorer):
+    if offline:
+        yield offline_tokens["dai"]
+    else:
+        yield explorer("0x6B175474E89094C44Da98b954EedeAC495271d0F")
+
+
+@pytest.fixture(scope="session")
+def weth(offline, offline_tokens, explorer):
+    if offline:
+        yield offline_tokens["weth"]
+    else:
+        yield explorer("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+
+
+@pytest.fixture(scope="session")
+def uni(offline, offline_tokens, explorer):
     # to be used as example ovl
-    yield Contract.from_explorer("0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984")
-
-
-@pytest.fixture(scope="module")
-def usdc():
-    yield Contract.from_explorer("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
-
-
-@pytest.fixture(scope="module")
-def pool_daiweth_30bps():
-    yield Contract.from_explorer("0xC2e9F25Be6257c210d7Adf0D4Cd6E3E881ba25f8")
-
-
-@pytest.fixture(scope="module")
-def pool_uniweth_30bps():
+    if offline:
+        yield offline_tokens["uni"]
+    else:
+        yield explorer("0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984")
+
+
+@pytest.fixture(scope="session")
+def usdc(offline, offline_tokens, explorer):
+    if offline:
+        yield offline_tokens["usdc"]
+    else:
+        yield explorer("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48")
+
+
+@pytest.fixture(scope="session")
+def pool_daiweth_30bps(offline, uni_factory, dai, weth, gov, explorer,
+                       devnet):
+    if offline and "pool_daiweth_30bps" in devnet:
+        yield UniswapV3PoolMock.at(devnet["pool_daiweth_30bps"])
+    elif offline:
+        yield create_pool(uni_factory, weth, dai, 3000, 3000,
+                          900000000000000000000000, gov)
+    else:
+        yield explorer("0xC2e9F25Be6257c210d7Adf0D4Cd6E3E881ba25f8")
+
+
+@pytest.fixture(scope="session")
+def pool_uniweth_30bps(offline, uni_factory, uni, weth, gov, explorer,
+                       devnet):
     # to be used as example ovlweth pool
-    yield Contract.from_explorer("0x1d42064Fc4Beb5F8aAF85F4617AE8b3b5B8Bd801")
-
-
-@pytest.fixture(scope="module")
-def pool_daiusdc_5bps():
-    yield Contract.from_explorer("0x6c6Bc977E13Df9b0de53b251522280BB72383700")
-
-
-@pytest.fixture(scope="module")
-def uni_factory():
-    yield Contract.from_explorer("0x1F98431c8aD98523631AE4a59f267346ea31F984")
-
-
-@pytest.fixture(scope="module")
-def pos_manager():
-    yield Contract.from_explorer("0xC36442b4a4522E871399CD717aBDD847Ab11FE88")
-
-
-@pytest.fixture(scope="module")
-def staker():
+    if offline and "pool_uniweth_30bps" in devnet:
+        yield UniswapV3PoolMock.at(devnet["pool_uniweth_30bps"])
+    elif offline:
+        yield create_pool(uni_factory, weth, uni, 3000, 300,
+                          100000000000000000000000, gov)
+    else:
+        yield explorer("0x1d42064Fc4Beb5F8aAF85F4617AE8b3b5B8Bd801")
+
+
+@pytest.fixture(scope="session")
+def pool_daiusdc_5bps(offline, uni_factory, dai, usdc, gov, explorer,
+                      devnet):
+    if offline and "pool_daiusdc_5bps" in devnet:
+        yield UniswapV3PoolMock.at(devnet["pool_daiusdc_5bps"])
+    elif offline:
+        yield create_pool(uni_factory, dai, usdc, 500, 1,
+                          50000000000000000000, gov)
+    else:
+        yield explorer("0x6c6Bc977E13Df9b0de53b251522280BB72383700")
+
+
+@pytest.fixture(scope="session")
+def uni_factory(offline, gov, explorer, devnet):
+    if offline and "uni_factory" in devnet:
+        yield UniswapV3FactoryMock.at(devnet["uni_factory"])
+    elif offline:
+        yield gov.deploy(UniswapV3FactoryMock)
+    else:
+        yield explorer("0x1F98431c8aD98523631AE4a59f267346ea31F984")
+
+
+@pytest.fixture(scope="session")
+def pos_manager(offline, uni_factory, gov, explorer, devnet):
+    if offline and "pos_manager" in devnet:
+        yield NonfungiblePositionManagerMock.at(devnet["pos_manager"])
+    elif offline:
+        yield gov.deploy(NonfungiblePositionManagerMock, uni_factory)
+    else:
+        yield explorer("0xC36442b4a4522E871399CD717aBDD847Ab11FE88")
+
+
+@pytest.fixture(scope="session")
+def staker(offline, uni_factory, pos_manager, gov, explorer, devnet):
     # NOTE: For testing only
-    yield Contract.from_explorer("0xf574E14f28ACb46aF71c42d827CD4Ff389E7723D")
+    if offline and "staker" in devnet:
+        yield UniswapV3StakerMock.at(devnet["staker"])
+    elif offline:
+        # same max lead time and duration as mainnet staker
+        yield gov.deploy(UniswapV3StakerMock, uni_factory, pos_manager,
+                         2592000, 63072000)
+    else:
+        yield explorer("0xf574E14f28ACb46aF71c42d827CD4Ff389E7723D")
 
 
 @pytest.fixture(scope="module", params=[(2592000, 86400, 31536000)])
@@ -0,0 +1,91 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "forge-std/Test.sol";
+
+import "@overlay-protocol/v1-core/contracts/OverlayV1Token.sol";
+
+import "../../contracts/OverlayV1FeeDisperser.sol";
+import "../../contracts/mocks/ERC20Mock.sol";
+import "../../contracts/mocks/NonfungiblePositionManagerMock.sol";
+import "../../contracts/mocks/UniswapV3FactoryMock.sol";
+import "../../contracts/mocks/UniswapV3StakerMock.sol";
+
+/// @title Deploys the fee disperser on the local Uniswap V3 staker mock
+/// @title with a pool of mock pools to incentivize, mirroring the offline
+/// @title fixtures in tests/feedisperser
+abstract contract FeeDisperserSetUp is Test {
+    // token supply minted to this as the fee source
+    uint256 internal constant TOKEN_SUPPLY = 8000000e18;
+
+    // same max lead time and duration as mainnet staker
+    uint256 internal constant MAX_INCENTIVE_START_LEAD_TIME = 2592000;
+    uint256 internal constant MAX_INCENTIVE_DURATION = 63072000;
+
+    // same as create_fee_disperser params in tests/feedisperser/conftest.py
+    uint256 internal constant MIN_REPLENISH_DURATION = 2592000;
+    uint256 internal constant INCENTIVE_LEAD_TIME = 86400;
+    uint256 internal constant INCENTIVE_DURATION = 31536000;
+
+    // pools available to incentivize, one per (quote token, fee)
+    uint256 internal constant QUOTE_TOKENS = 40;
+    uint24[3] internal fees = [uint24(500), 3000, 10000];
+
+    OverlayV1Token internal ovl;
+    UniswapV3FactoryMock internal uniFactory;
+    NonfungiblePositionManagerMock internal posManager;
+    UniswapV3StakerMock internal staker;
+    OverlayV1FeeDisperser internal feeDisperser;
+
+    ERC20Mock internal weth;
+    UniswapV3PoolMock[] internal pools;
+
+    function setUp() public virtual {
+        vm.warp(1650000000);
+
+        // mint the token then renounce minter role, this as governor
+        ovl = new OverlayV1Token();
+        ovl.grantRole(MINTER_ROLE, address(this));
+        ovl.mint(address(this), TOKEN_SUPPLY);
+        ovl.renounceRole(MINTER_ROLE, address(this));
+        ovl.grantRole(GOVERNOR_ROLE, address(this));
+
+        uniFactory = new UniswapV3FactoryMock();
+        posManager = new NonfungiblePositionManagerMock(address(uniFactory));
+        staker = new UniswapV3StakerMock(
+            uniFactory,
+            address(posManager),
+            MAX_INCENTIVE_START_LEAD_TIME,
+            MAX_INCENTIVE_DURATION
+        );
+        feeDisperser = new OverlayV1FeeDisperser(
+            IOverlayV1Token(address(ovl)),
+            IUniswapV3Staker(address(staker)),
+            MIN_REPLENISH_DURATION,
+            INCENTIVE_LEAD_TIME,
+            INCENTIVE_DURATION
+        );
+
+        // weth paired with each quote token at each fee tier
+        weth = new ERC20Mock("Wrapped Ether", "WETH", 18);
+        for (uint256 i = 0; i < QUOTE_TOKENS; i++) {
+            ERC20Mock quote = new ERC20Mock("Quote", "QUOTE", 18);
+            for (uint256 j = 0; j < fees.length; j++) {
+                address pool = uniFactory.createPool(
+                    address(weth),
+                    address(quote),
+                    fees[j],
+                    0,
+                    1e24
+                );
+                pools.push(UniswapV3PoolMock(pool));
+            }
+        }
+    }
+
+    /// @dev adds an incentive on the pool at index with weight
+    function addIncentive(uint256 index, uint256 weight) internal {
+        UniswapV3PoolMock pool = pools[index];
+        feeDisperser.addIncentive(pool.token0(), pool.token1(), pool.fee(), weight);
+    }
+}
@@ -0,0 +1,127 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "./FeeDisperserSetUp.sol";
+
+/// @title Fuzzes replenishIncentives over large numbers of incentives with
+/// @title arbitrary weights and rewards
+contract OverlayV1FeeDisperserTest is FeeDisperserSetUp {
+    // max tick for uniswap v3 pools, as in the staker mock
+    int24 internal constant MAX_TICK = 887272;
+
+    /// @dev weight spanning many orders of magnitude so small incentives
+    /// @dev round down to zero reward and are skipped
+    function weightFromSeed(uint256 seed, uint256 index) internal pure returns (uint256) {
+        uint256 rand = uint256(keccak256(abi.encode(seed, index)));
+        return ((rand % 1e20) >> ((rand >> 128) % 64)) + 1;
+    }
+
+    /// @dev reward the fee disperser should give the incentive at index
+    function expectReward(
+        uint256 index,
+        uint256 totalReward,
+        uint256 totalWeight
+    ) internal view returns (uint256) {
+        (address token0, address token1, uint24 fee, uint256 weight) = feeDisperser.incentives(
+            index
+        );
+        return
+            feeDisperser.calcIncentiveReward(
+                OverlayV1FeeDisperser.Incentive({
+                    token0: token0,
+                    token1: token1,
+                    fee: fee,
+                    weight: weight
+                }),
+                totalReward,
+                totalWeight
+            );
+    }
+
+    /// @dev reward the staker holds for the incentive at index
+    function stakerReward(
+        uint256 index,
+        uint256 startTime,
+        uint256 endTime
+    ) internal view returns (uint256 reward_) {
+        (address token0, address token1, uint24 fee, ) = feeDisperser.incentives(index);
+        int24 tickSpacing = uniFactory.feeAmountTickSpacing(fee);
+        bytes32 id = feeDisperser.getStakerIncentiveId(
+            IUniswapV3Staker.IncentiveKey({
+                rewardToken: IERC20Minimal(address(ovl)),
+                pool: IUniswapV3Pool(uniFactory.getPool(token0, token1, fee)),
+                startTime: startTime,
+                endTime: endTime,
+                minWidth: 2 * ((MAX_TICK / tickSpacing) * tickSpacing),
+                refundee: address(feeDisperser)
+            })
+        );
+        (reward_, , ) = staker.incentives(id);
+    }
+
+    function testFuzz_ReplenishIncentives(
+        uint256 count,
+        uint256 totalReward,
+        uint256 seed
+    ) public {
+        count = bound(count, 1, pools.length);
+        totalReward = bound(totalReward, 1, TOKEN_SUPPLY);
+
+        for (uint256 i = 0; i < count; i++) {
+            addIncentive(i, weightFromSeed(seed, i));
+        }
+        ovl.transfer(address(feeDisperser), totalReward);
+
+        vm.warp(block.timestamp + MIN_REPLENISH_DURATION + 1);
+        feeDisperser.replenishIncentives();
+
+        // each incentive on the staker gets its weighted share of reward
+        // NOTE: incentive at index 0 is the empty entry
+        uint256 startTime = block.timestamp + INCENTIVE_LEAD_TIME;
+        uint256 endTime = startTime + INCENTIVE_DURATION;
+        uint256 totalWeight = feeDisperser.totalWeight();
+        uint256 distributed;
+        for (uint256 i = 1; i <= count; i++) {
+            uint256 reward = expectReward(i, totalReward, totalWeight);
+            assertEq(stakerReward(i, startTime, endTime), reward);
+            distributed += reward;
+        }
+
+        // all reward sent to staker less rounding dust of at most
+        // 1 wei + totalReward / 1e18 per incentive
+        assertEq(ovl.balanceOf(address(staker)), distributed);
+        assertEq(ovl.balanceOf(address(feeDisperser)), totalReward - distributed);
+        assertLe(totalReward - distributed, count * (totalReward / 1e18 + 1));
+        assertEq(feeDisperser.blockTimestampLast(), block.timestamp);
+    }
+
+    function testFuzz_ReplenishIncentivesRevertsWithinMinDuration(uint256 elapsed) public {
+        elapsed = bound(elapsed, 0, MIN_REPLENISH_DURATION);
+        addIncentive(0, 1e18);
+        ovl.transfer(address(feeDisperser), 100e18);
+
+        vm.warp(block.timestamp + MIN_REPLENISH_DURATION + 1);
+        feeDisperser.replenishIncentives();
+
+        ovl.transfer(address(feeDisperser), 100e18);
+        vm.warp(block.timestamp + elapsed);
+        vm.expectRevert("OVLV1: duration<min");
+        feeDisperser.replenishIncentives();
+    }
+}
+
+/// @title Gas benchmark of replenishIncentives over all pools
+contract OverlayV1FeeDisperserGasTest is FeeDisperserSetUp {
+    function setUp() public override {
+        super.setUp();
+        for (uint256 i = 0; i < pools.length; i++) {
+            addIncentive(i, 1e18);
+        }
+        ovl.transfer(address(feeDisperser), 100000e18);
+        vm.warp(block.timestamp + MIN_REPLENISH_DURATION + 1);
+    }
+
+    function test_gas_replenishIncentives() public {
+        feeDisperser.replenishIncentives();
+    }
+}
@@ -0,0 +1,153 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/libraries/FixedPoint.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Oracle.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Position.sol";
+import "@overlay-protocol/v1-core/contracts/libraries/Risk.sol";
+
+import "./StateSetUp.sol";
+
+/// @title Fuzzes the OverlayV1State views against the calculations the
+/// @title market itself makes on build, update, unwind and liquidate
+contract OverlayV1StateTest is StateSetUp {
+    using FixedPoint for uint256;
+
+    // bounds on fuzzed build params, within cap notional at the mock price
+    uint256 internal constant MIN_COLLATERAL = 1e16;
+    uint256 internal constant MAX_COLLATERAL = 1000e18;
+    uint256 internal constant MIN_LEVERAGE = 1e18;
+    uint256 internal constant MAX_LEVERAGE = 5e18;
+
+    // relative tolerance on values the market rounds differently
+    uint256 internal constant TOLERANCE = 1e12;
+
+    function boundCollateral(uint256 collateral) internal returns (uint256) {
+        return bound(collateral, MIN_COLLATERAL, MAX_COLLATERAL);
+    }
+
+    function boundLeverage(uint256 leverage) internal returns (uint256) {
+        return bound(leverage, MIN_LEVERAGE, MAX_LEVERAGE);
+    }
+
+    function testFuzz_PositionEstimateMatchesBuild(
+        uint256 collateral,
+        uint256 leverage,
+        bool isLong
+    ) public {
+        collateral = boundCollateral(collateral);
+        leverage = boundLeverage(leverage);
+
+        Position.Info memory expect = state.positionEstimate(market, collateral, leverage, isLong);
+        uint256 positionId = build(alice, collateral, leverage, isLong);
+        Position.Info memory actual = state.position(market, alice, positionId);
+
+        assertEq(uint256(expect.notionalInitial), uint256(actual.notionalInitial));
+        assertEq(uint256(expect.debtInitial), uint256(actual.debtInitial));
+        assertEq(int256(expect.midTick), int256(actual.midTick));
+        assertEq(int256(expect.entryTick), int256(actual.entryTick));
+        assertEq(expect.isLong, actual.isLong);
+        assertEq(expect.liquidated, actual.liquidated);
+        assertEq(uint256(expect.oiShares), uint256(actual.oiShares));
+        assertEq(uint256(expect.fractionRemaining), uint256(actual.fractionRemaining));
+    }
+
+    function testFuzz_OisMatchMarketAfterFunding(
+        uint256 collateralLong,
+        uint256 collateralShort,
+        uint32 timeElapsed
+    ) public {
+        build(alice, boundCollateral(collateralLong), MIN_LEVERAGE, true);
+        build(bob, boundCollateral(collateralShort), MIN_LEVERAGE, false);
+
+        // state projects funding since the last update the market applies
+        vm.warp(block.timestamp + bound(timeElapsed, 0, 30 days));
+        (uint256 expectOiLong, uint256 expectOiShort) = state.ois(market);
+
+        market.update();
+        assertEq(expectOiLong, market.oiLong());
+        assertEq(expectOiShort, market.oiShort());
+    }
+
+    function testFuzz_CapOiMatchesMarketBounds(uint256 price, uint256 reserve) public {
+        feed.setPrice(bound(price, 1e14, 1e24));
+        feed.setReserve(bound(reserve, 1e18, 1e30));
+
+        Oracle.Data memory data = feed.latest();
+        uint256 capNotional = market.capNotionalAdjustedForBounds(
+            data,
+            market.params(uint256(Risk.Parameters.CapNotional))
+        );
+        uint256 expect = capNotional.divDown(state.mid(market));
+        uint256 actual = state.capOi(market);
+        assertEq(expect, actual);
+    }
+
+    function testFuzz_BidAskMatchMarket(uint256 fractionOfCapOi) public {
+        fractionOfCapOi = bound(fractionOfCapOi, 0, FixedPoint.ONE);
+        Oracle.Data memory data = feed.latest();
+
+        uint256 bid = state.bid(market, fractionOfCapOi);
+        uint256 ask = state.ask(market, fractionOfCapOi);
+        assertEq(bid, market.bid(data, state.volumeBid(market, fractionOfCapOi)));
+        assertEq(ask, market.ask(data, state.volumeAsk(market, fractionOfCapOi)));
+
+        // spread straddles the mid
+        uint256 mid = state.mid(market);
+        assertLe(bid, mid);
+        assertGe(ask, mid);
+    }
+
+    function testFuzz_UnwindPaysValueLessTradingFee(
+        uint256 collateral,
+        uint256 leverage,
+        bool isLong,
+        uint256 price
+    ) public {
+        uint256 positionId = build(
+            alice,
+            boundCollateral(collateral),
+            boundLeverage(leverage),
+            isLong
+        );
+        feed.setPrice(bound(price, (PRICE * 9) / 10, (PRICE * 11) / 10));
+        vm.assume(!state.liquidatable(market, alice, positionId));
+
+        uint256 value = state.value(market, alice, positionId);
+        uint256 tradingFee = state.tradingFee(market, alice, positionId);
+
+        uint256 balanceBefore = ovl.balanceOf(alice);
+        uint256 priceLimit = isLong ? 0 : type(uint256).max;
+        vm.prank(alice);
+        market.unwind(positionId, FixedPoint.ONE, priceLimit);
+
+        uint256 actual = ovl.balanceOf(alice) - balanceBefore;
+        uint256 expect = value > tradingFee ? value - tradingFee : 0;
+        assertApproxEqRel(expect, actual, TOLERANCE);
+    }
+
+    function testFuzz_LiquidatableMatchesMarket(
+        uint256 collateral,
+        uint256 leverage,
+        bool isLong,
+        uint256 price
+    ) public {
+        uint256 positionId = build(
+            alice,
+            boundCollateral(collateral),
+            boundLeverage(leverage),
+            isLong
+        );
+        feed.setPrice(bound(price, PRICE / 2, PRICE * 2));
+
+        bool expect = state.liquidatable(market, alice, positionId);
+        bool actual;
+        vm.prank(bob);
+        try market.liquidate(alice, positionId) {
+            actual = true;
+        } catch {
+            actual = false;
+        }
+        assertEq(expect, actual);
+    }
+}
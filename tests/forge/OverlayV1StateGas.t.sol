@@ -0,0 +1,91 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "@overlay-protocol/v1-core/contracts/libraries/Position.sol";
+
+import "./StateSetUp.sol";
+
+/// @title Gas benchmarks of the OverlayV1State views, one view per test
+/// @title so `forge snapshot` records the gas of each
+contract OverlayV1StateGasTest is StateSetUp {
+    // number of positions built on each side for the batch views
+    uint256 internal constant POSITIONS = 10;
+
+    address[] internal owners;
+    uint256[] internal ids;
+    Position.Info[] internal positions;
+
+    function setUp() public override {
+        super.setUp();
+
+        // positions on both sides so funding and oi shares are non-trivial
+        for (uint256 i = 0; i < POSITIONS; i++) {
+            owners.push(alice);
+            ids.push(build(alice, 20e18, 2e18, true));
+            owners.push(bob);
+            ids.push(build(bob, 10e18, 3e18, false));
+        }
+        for (uint256 i = 0; i < ids.length; i++) {
+            positions.push(state.position(market, owners[i], ids[i]));
+        }
+
+        // forward so views project funding since the last update
+        vm.warp(block.timestamp + 600);
+    }
+
+    function test_gas_marketState() public view {
+        state.marketState(market);
+    }
+
+    function test_gas_rawMarketData() public view {
+        state.rawMarketData(market);
+    }
+
+    function test_gas_ois() public view {
+        state.ois(market);
+    }
+
+    function test_gas_capOi() public view {
+        state.capOi(market);
+    }
+
+    function test_gas_fundingRate() public view {
+        state.fundingRate(market);
+    }
+
+    function test_gas_bid() public view {
+        state.bid(market, 1e16);
+    }
+
+    function test_gas_ask() public view {
+        state.ask(market, 1e16);
+    }
+
+    function test_gas_positionEstimate() public view {
+        state.positionEstimate(market, 20e18, 2e18, true);
+    }
+
+    function test_gas_value() public view {
+        state.value(market, alice, ids[0]);
+    }
+
+    function test_gas_notional() public view {
+        state.notional(market, alice, ids[0]);
+    }
+
+    function test_gas_liquidatable() public view {
+        state.liquidatable(market, alice, ids[0]);
+    }
+
+    function test_gas_liquidationPrice() public view {
+        state.liquidationPrice(market, alice, ids[0]);
+    }
+
+    function test_gas_valuesFromPositions() public view {
+        state.valuesFromPositions(market, positions);
+    }
+
+    function test_gas_positionValuesPacked() public view {
+        state.positionValuesPacked(market, owners, ids);
+    }
+}
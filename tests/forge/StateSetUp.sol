@@ -0,0 +1,98 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.10;
+
+import "forge-std/Test.sol";
+
+import "@overlay-protocol/v1-core/contracts/OverlayV1Factory.sol";
+import "@overlay-protocol/v1-core/contracts/OverlayV1Token.sol";
+import "@overlay-protocol/v1-core/contracts/interfaces/IOverlayV1Market.sol";
+import "@overlay-protocol/v1-core/contracts/mocks/OverlayV1FeedFactoryMock.sol";
+import "@overlay-protocol/v1-core/contracts/mocks/OverlayV1FeedMock.sol";
+
+import "../../contracts/OverlayV1State.sol";
+
+/// @title Deploys a market on a local mock feed and the state contract
+/// @title viewing it, mirroring the mock_market fixtures in tests/state
+abstract contract StateSetUp is Test {
+    // token supply minted to alice and bob
+    uint256 internal constant TOKEN_SUPPLY = 8000000e18;
+
+    // mock feed micro, macro windows and initial price, reserve
+    uint256 internal constant MICRO_WINDOW = 600;
+    uint256 internal constant MACRO_WINDOW = 1800;
+    uint256 internal constant PRICE = 1e18;
+    uint256 internal constant RESERVE = 2000000e18;
+
+    OverlayV1Token internal ovl;
+    OverlayV1Factory internal factory;
+    OverlayV1FeedFactoryMock internal feedFactory;
+    OverlayV1FeedMock internal feed;
+    IOverlayV1Market internal market;
+    OverlayV1State internal state;
+
+    address internal alice = address(0xa11ce);
+    address internal bob = address(0xb0b);
+
+    /// @dev same risk params as RISK_PARAMS in tests/state/conftest.py
+    function riskParams() internal pure returns (uint256[15] memory params_) {
+        params_ = [
+            uint256(1220000000000), // k
+            500000000000000000, // lmbda
+            2500000000000000, // delta
+            5000000000000000000, // capPayoff
+            800000000000000000000000, // capNotional
+            5000000000000000000, // capLeverage
+            2592000, // circuitBreakerWindow
+            66670000000000000000000, // circuitBreakerMintTarget
+            100000000000000000, // maintenanceMarginFraction
+            100000000000000000, // maintenanceMarginBurnRate
+            50000000000000000, // liquidationFeeRate
+            750000000000000, // tradingFeeRate
+            100000000000000, // minCollateral
+            25000000000000, // priceDriftUpperLimit
+            14 // averageBlockTime
+        ];
+    }
+
+    function setUp() public virtual {
+        vm.warp(1650000000);
+
+        // mint the token to alice and bob then renounce minter role
+        ovl = new OverlayV1Token();
+        ovl.grantRole(MINTER_ROLE, address(this));
+        ovl.mint(alice, TOKEN_SUPPLY / 2);
+        ovl.mint(bob, TOKEN_SUPPLY / 2);
+        ovl.renounceRole(MINTER_ROLE, address(this));
+
+        // market factory as token admin, this as governor
+        factory = new OverlayV1Factory(address(ovl), address(0xfee));
+        ovl.grantRole(ovl.DEFAULT_ADMIN_ROLE(), address(factory));
+        ovl.grantRole(GOVERNOR_ROLE, address(this));
+
+        // market on a mock feed with settable price and reserve
+        feedFactory = new OverlayV1FeedFactoryMock(MICRO_WINDOW, MACRO_WINDOW);
+        feed = OverlayV1FeedMock(feedFactory.deployFeed(PRICE, RESERVE));
+        factory.addFeedFactory(address(feedFactory));
+        factory.deployMarket(address(feedFactory), address(feed), riskParams());
+        market = IOverlayV1Market(factory.getMarket(address(feed)));
+
+        state = new OverlayV1State(IOverlayV1Factory(address(factory)));
+
+        vm.prank(alice);
+        ovl.approve(address(market), type(uint256).max);
+        vm.prank(bob);
+        ovl.approve(address(market), type(uint256).max);
+    }
+
+    /// @dev builds a position on the market for owner at any price
+    function build(
+        address owner,
+        uint256 collateral,
+        uint256 leverage,
+        bool isLong
+    ) internal returns (uint256 positionId_) {
+        uint256 priceLimit = isLong ? type(uint256).max : 0;
+        vm.prank(owner);
+        positionId_ = market.build(collateral, leverage, isLong, priceLimit);
+    }
+}
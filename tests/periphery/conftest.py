@@ -0,0 +1,177 @@
+import pytest
+from brownie import OverlayV1State, web3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@pytest.fixture(scope="module")
+def ovl_v1_core(pm):
+    return pm("overlay-market/v1-core@1.0.0-rc.0")
+
+
+@pytest.fixture(scope="module")
+def gov(accounts):
+    yield accounts[0]
+
+
+@pytest.fixture(scope="module")
+def alice(accounts):
+    yield accounts[1]
+
+
+@pytest.fixture(scope="module")
+def bob(accounts):
+    yield accounts[2]
+
+
+@pytest.fixture(scope="module")
+def rando(accounts):
+    yield accounts[3]
+
+
+@pytest.fixture(scope="module")
+def fee_recipient(accounts):
+    yield accounts[4]
+
+
+@pytest.fixture(scope="module")
+def minter_role():
+    yield web3.solidityKeccak(['string'], ["MINTER"])
+
+
+@pytest.fixture(scope="module")
+def governor_role():
+    yield web3.solidityKeccak(['string'], ["GOVERNOR"])
+
+
+@pytest.fixture(scope="module", params=[8000000])
+def create_token(ovl_v1_core, gov, alice, bob, minter_role, request):
+    sup = request.param
+
+    def create_token(supply=sup):
+        ovl = ovl_v1_core.OverlayV1Token
+        tok = gov.deploy(ovl)
+
+        # mint the token then renounce minter role
+        tok.grantRole(minter_role, gov, {"from": gov})
+        tok.mint(gov, supply * 10 ** tok.decimals(), {"from": gov})
+        tok.renounceRole(minter_role, gov, {"from": gov})
+
+        tok.transfer(alice, (supply/2) * 10 ** tok.decimals(), {"from": gov})
+        tok.transfer(bob, (supply/2) * 10 ** tok.decimals(), {"from": gov})
+        return tok
+
+    yield create_token
+
+
+@pytest.fixture(scope="module")
+def ovl(create_token):
+    yield create_token()
+
+
+@pytest.fixture(scope="module", params=[(600, 1800)])
+def create_mock_feed_factory(ovl_v1_core, gov, request):
+    micro, macro = request.param
+
+    def create_mock_feed_factory(micro_window=micro, macro_window=macro):
+        feed_factory = gov.deploy(ovl_v1_core.OverlayV1FeedFactoryMock,
+                                  micro_window, macro_window)
+        return feed_factory
+
+    yield create_mock_feed_factory
+
+
+@pytest.fixture(scope="module")
+def mock_feed_factory(create_mock_feed_factory):
+    yield create_mock_feed_factory()
+
+
+# Mock feed to easily change price/reserve for testing of various conditions
+@pytest.fixture(scope="module", params=[
+    (1000000000000000000, 2000000000000000000000000)
+])
+def create_mock_feed(ovl_v1_core, gov, mock_feed_factory, request):
+    price, reserve = request.param
+
+    def create_mock_feed(price=price, reserve=reserve):
+        tx = mock_feed_factory.deployFeed(price, reserve)
+        mock_feed_addr = tx.return_value
+        mock_feed = ovl_v1_core.OverlayV1FeedMock.at(mock_feed_addr)
+        return mock_feed
+
+    yield create_mock_feed
+
+
+@pytest.fixture(scope="module")
+def mock_feed(create_mock_feed):
+    yield create_mock_feed()
+
+
+# feeds the factory deploys markets on, overridden by suites needing more
+@pytest.fixture(scope="module")
+def market_feeds(mock_feed):
+    yield [mock_feed]
+
+
+@pytest.fixture(scope="module", params=[(
+    1220000000000,  # k
+    500000000000000000,  # lmbda
+    2500000000000000,  # delta
+    5000000000000000000,  # capPayoff
+    800000000000000000000000,  # capNotional
+    5000000000000000000,  # capLeverage
+    2592000,  # circuitBreakerWindow
+    66670000000000000000000,  # circuitBreakerMintTarget
+    100000000000000000,  # maintenanceMarginFraction
+    100000000000000000,  # maintenanceMarginBurnRate
+    50000000000000000,  # liquidationFeeRate
+    750000000000000,  # tradingFeeRate
+    100000000000000,  # minCollateral
+    25000000000000,  # priceDriftUpperLimit
+    14,  # averageBlockTime
+)])
+def create_factory(ovl_v1_core, gov, governor_role, fee_recipient, ovl,
+                   mock_feed_factory, market_feeds, request):
+    params = request.param
+
+    def create_factory(tok=ovl, recipient=fee_recipient, risk_params=params):
+        ovl_factory = ovl_v1_core.OverlayV1Factory
+
+        # create the market factory
+        factory = gov.deploy(ovl_factory, tok, recipient)
+
+        # grant market factory token admin role
+        tok.grantRole(tok.DEFAULT_ADMIN_ROLE(), factory, {"from": gov})
+
+        # grant gov the governor role on token to access factory methods
+        tok.grantRole(governor_role, gov, {"from": gov})
+
+        # add mock feed factory as approved for factory to deploy markets on
+        factory.addFeedFactory(mock_feed_factory, {"from": gov})
+
+        # deploy a market on each mock feed
+        for feed in market_feeds:
+            factory.deployMarket(mock_feed_factory, feed,
+                                 risk_params, {"from": gov})
+
+        return factory
+
+    yield create_factory
+
+
+@pytest.fixture(scope="module")
+def factory(create_factory):
+    yield create_factory()
+
+
+@pytest.fixture(scope="module")
+def mock_market(ovl_v1_core, mock_feed, factory):
+    mock_market_addr = factory.getMarket(mock_feed)
+    mock_market = ovl_v1_core.OverlayV1Market.at(mock_market_addr)
+    yield mock_market
+
+
+@pytest.fixture(scope="module")
+def state(rando, factory):
+    yield rando.deploy(OverlayV1State, factory)
@@ -0,0 +1,16 @@
+import pytest
+from brownie import OverlayV1BatchLiquidator
+
+
+@pytest.fixture(scope="module")
+def create_liquidator(rando, state):
+    def create_liquidator(state=state, deployer=rando):
+        liquidator = deployer.deploy(OverlayV1BatchLiquidator, state)
+        return liquidator
+
+    yield create_liquidator
+
+
+@pytest.fixture(scope="module")
+def liquidator(create_liquidator):
+    yield create_liquidator()
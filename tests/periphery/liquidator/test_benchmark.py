@@ -0,0 +1,41 @@
+import pytest
+from brownie import chain, web3
+
+from scripts.liquidator.keeper import BLOCK_GAS_FRACTION, ShardedKeeper
+
+from .test_liquidate import build_positions
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.mark.parametrize("batch_size", [1, 10, 25, 50, 75, 100])
+def test_gas_per_liquidation(liquidator, state, mock_market, mock_feed, ovl,
+                             alice, rando, batch_size):
+    # build positions for alice that all become liquidatable
+    ids = build_positions(mock_market, ovl, alice, True, batch_size + 1)
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+
+    # liquidate the first position individually on the market
+    tx_single = mock_market.liquidate(alice.address, ids[0], {"from": rando})
+
+    # liquidate the rest through the keeper, which splits the batch from
+    # its gas estimate when it doesn't fit in a block
+    keeper = ShardedKeeper(web3.provider.endpoint_uri, state.address,
+                           state.abi, 1)
+    candidates = [(mock_market.address, alice.address, id)
+                  for id in ids[1:]]
+    txs = keeper.submit(liquidator, candidates, rando, batch_size=batch_size)
+
+    liquidated = [ok for tx in txs for ok in tx.return_value[0]]
+    assert len(liquidated) == batch_size
+    assert all(liquidated)
+    for tx in txs:
+        assert tx.gas_used <= BLOCK_GAS_FRACTION * chain.block_gas_limit
+
+    gas_per_liquidation = sum(tx.gas_used for tx in txs) / batch_size
+    print(f"\nbatch size: {batch_size}, txs: {len(txs)}, "
+          f"gas per liquidation (batch): {gas_per_liquidation:.0f}, "
+          f"gas per liquidation (single): {tx_single.gas_used}")
@@ -0,0 +1,7 @@
+def test_deploy_creates_liquidator(create_liquidator, state, factory, ovl):
+    liquidator = create_liquidator()
+
+    # check immutables set in constructor
+    assert liquidator.state() == state
+    assert liquidator.factory() == factory
+    assert liquidator.ovl() == ovl
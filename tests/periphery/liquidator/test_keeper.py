@@ -0,0 +1,115 @@
+import pytest
+from brownie import chain, web3
+
+from scripts.liquidator.keeper import (
+    ShardedKeeper,
+    batch_gas,
+    shard_rows
+)
+from scripts.state.book import PositionBook
+from scripts.state.checkpoint import save_checkpoint
+from scripts.state.offline import to_position_info
+
+from .test_liquidate import build_positions
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def index_positions(state, market, owner, ids, book):
+    for id in ids:
+        position = to_position_info(state.position(market, owner, id))
+        book.append(market.address, owner.address, id, position)
+
+
+@pytest.mark.parametrize("shards", [1, 3])
+def test_candidates(tmp_path, state, mock_market, mock_feed, ovl, alice, bob,
+                    rando, shards):
+    # build longs for alice and shorts for bob and index them
+    alice_ids = build_positions(mock_market, ovl, alice, True, 4)
+    bob_ids = build_positions(mock_market, ovl, bob, False, 2)
+    book = PositionBook()
+    index_positions(state, mock_market, alice, alice_ids, book)
+    index_positions(state, mock_market, bob, bob_ids, book)
+
+    # drop price so alice longs are liquidatable and bob shorts are not
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+    path = str(tmp_path)
+    block = chain.height
+    save_checkpoint(path, book, block)
+
+    keeper = ShardedKeeper(web3.provider.endpoint_uri, state.address,
+                           state.abi, shards)
+    results = keeper.evaluate(path, block)
+    assert sum(result.evaluated for result in results) == 6
+    assert sum(result.screened for result in results) >= len(alice_ids)
+
+    expect = sorted((mock_market.address.lower(), alice.address.lower(), id)
+                    for id in alice_ids)
+    actual = keeper.candidates(path, block)
+    assert actual == expect
+
+
+def test_shard_rows_partitions_book(state, mock_market, ovl, alice):
+    ids = build_positions(mock_market, ovl, alice, True, 8)
+    book = PositionBook()
+    index_positions(state, mock_market, alice, ids, book)
+
+    # each row in exactly one shard, same shard on every call
+    actual = shard_rows(book, 4)
+    assert len(actual) == 8
+    assert all(0 <= shard < 4 for shard in actual)
+    assert list(actual) == list(shard_rows(book, 4))
+
+
+def test_submit(tmp_path, liquidator, state, mock_market, mock_feed, ovl,
+                alice, rando):
+    ids = build_positions(mock_market, ovl, alice, True, 5)
+    book = PositionBook()
+    index_positions(state, mock_market, alice, ids, book)
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+
+    path = str(tmp_path)
+    block = chain.height
+    save_checkpoint(path, book, block)
+
+    keeper = ShardedKeeper(web3.provider.endpoint_uri, state.address,
+                           state.abi, 2)
+    candidates = keeper.candidates(path, block)
+    txs = keeper.submit(liquidator, candidates, rando, batch_size=2)
+    assert len(txs) == 3
+    for id in ids:
+        assert not state.liquidatable(mock_market, alice.address, id)
+        assert state.position(mock_market, alice.address, id)[5]
+
+
+def test_batch_gas(liquidator, mock_market, mock_feed, ovl, alice, rando):
+    ids = build_positions(mock_market, ovl, alice, True, 5)
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+    liquidations = [(mock_market.address, alice.address, id) for id in ids]
+
+    # estimated gas liquidates the whole batch and fits in the block
+    contract = web3.eth.contract(address=liquidator.address,
+                                 abi=liquidator.abi)
+    gas = batch_gas(contract, liquidations, rando.address,
+                    chain.block_gas_limit)
+    assert gas < chain.block_gas_limit
+
+    tx = liquidator.liquidate(liquidations, {"from": rando, "gas_limit": gas})
+    (actual_liquidated, _) = tx.return_value
+    assert all(actual_liquidated)
+
+
+def test_submit_raises_when_no_batch_size(liquidator, state, rando):
+    keeper = ShardedKeeper(web3.provider.endpoint_uri, state.address,
+                           state.abi, 2)
+    with pytest.raises(ValueError):
+        keeper.submit(liquidator, [], rando, batch_size=0)
+
+
+def test_keeper_raises_when_no_shards(state):
+    with pytest.raises(ValueError):
+        ShardedKeeper(web3.provider.endpoint_uri, state.address,
+                      state.abi, 0)
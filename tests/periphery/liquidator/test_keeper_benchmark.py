@@ -0,0 +1,43 @@
+import time
+
+import pytest
+from brownie import chain, web3
+
+from scripts.liquidator.keeper import ShardedKeeper
+from scripts.state.book import PositionBook
+from scripts.state.checkpoint import save_checkpoint
+
+from .test_keeper import index_positions
+from .test_liquidate import build_positions
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.mark.parametrize("shards", [1, 2, 4, 8])
+def test_keeper_throughput(tmp_path, state, mock_market, mock_feed, ovl,
+                           alice, bob, rando, shards):
+    # build positions on both sides, half of which become liquidatable
+    alice_ids = build_positions(mock_market, ovl, alice, True, 100)
+    bob_ids = build_positions(mock_market, ovl, bob, False, 100)
+    book = PositionBook()
+    index_positions(state, mock_market, alice, alice_ids, book)
+    index_positions(state, mock_market, bob, bob_ids, book)
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+
+    path = str(tmp_path)
+    block = chain.height
+    save_checkpoint(path, book, block)
+
+    keeper = ShardedKeeper(web3.provider.endpoint_uri, state.address,
+                           state.abi, shards)
+    start = time.perf_counter()
+    candidates = keeper.candidates(path, block)
+    elapsed = time.perf_counter() - start
+
+    assert len(candidates) == len(alice_ids)
+    print(f"\nshards: {shards}, positions: {len(book)}, "
+          f"elapsed: {elapsed:.3f}s, "
+          f"positions per second: {len(book) / elapsed:.0f}")
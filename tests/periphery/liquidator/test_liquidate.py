@@ -0,0 +1,105 @@
+import pytest
+from brownie import chain
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def build_positions(market, ovl, owner, is_long, count):
+    # build params
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 5000000000000000000  # 5
+    input_price_limit = 2**256-1 if is_long else 0
+
+    # approve max for owner
+    ovl.approve(market, 2**256-1, {"from": owner})
+
+    # build positions for owner
+    ids = []
+    for _ in range(count):
+        tx = market.build(input_collateral, input_leverage, is_long,
+                          input_price_limit, {"from": owner})
+        ids.append(tx.return_value)
+    return ids
+
+
+def test_liquidate(liquidator, state, mock_market, mock_feed, ovl, alice,
+                   bob, rando):
+    # build longs for alice and shorts for bob
+    alice_ids = build_positions(mock_market, ovl, alice, True, 3)
+    bob_ids = build_positions(mock_market, ovl, bob, False, 2)
+
+    # drop price so alice longs are liquidatable and bob shorts are not
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+    liquidations = [(mock_market, alice.address, id) for id in alice_ids] \
+        + [(mock_market, bob.address, id) for id in bob_ids]
+
+    # check liquidatable view matches state
+    expect = [state.liquidatable(market, owner, id)
+              for (market, owner, id) in liquidations]
+    actual = liquidator.liquidatable(liquidations)
+    assert expect == actual
+    assert actual == [True, True, True, False, False]
+
+    # expected fees from state views
+    expect_fees = sum(state.liquidationFee(market, owner, id)
+                      for (market, owner, id) in liquidations)
+    balance_before = ovl.balanceOf(rando)
+
+    # liquidate the batch
+    tx = liquidator.liquidate(liquidations, {"from": rando})
+    (actual_liquidated, actual_fees) = tx.return_value
+    assert actual_liquidated == [True, True, True, False, False]
+
+    # check fees forwarded to caller and none left on liquidator
+    assert ovl.balanceOf(rando) - balance_before == actual_fees
+    assert ovl.balanceOf(liquidator) == 0
+    assert int(actual_fees) == pytest.approx(int(expect_fees))
+
+    # check positions actually liquidated on market
+    for (market, owner, id) in liquidations:
+        (_, _, _, _, _, liquidated, _, _) = state.position(market, owner, id)
+        assert liquidated == (owner == alice.address)
+
+    # check event emitted
+    assert 'PositionsLiquidated' in tx.events
+    expect_event = {"user": rando.address, "count": 3, "fees": actual_fees}
+    assert tx.events['PositionsLiquidated'] == expect_event
+
+
+def test_liquidate_skips_failures(liquidator, mock_market, mock_feed, ovl,
+                                  alice, rando):
+    ids = build_positions(mock_market, ovl, alice, True, 2)
+    mock_feed.setPrice(700000000000000000, {"from": rando})
+
+    # include a position that doesn't exist, a market not from factory,
+    # and a duplicate of a position that will already be liquidated
+    liquidations = [
+        (mock_market, alice.address, ids[0]),
+        (mock_market, alice.address, 2**64),
+        (rando.address, alice.address, ids[1]),
+        (mock_market, alice.address, ids[0]),
+        (mock_market, alice.address, ids[1]),
+    ]
+    tx = liquidator.liquidate(liquidations, {"from": rando})
+    (actual_liquidated, actual_fees) = tx.return_value
+    assert actual_liquidated == [True, False, False, False, True]
+    assert actual_fees > 0
+    assert tx.events['PositionsLiquidated']['count'] == 2
+
+
+def test_liquidate_when_none_liquidatable(liquidator, mock_market, ovl,
+                                          alice, rando):
+    ids = build_positions(mock_market, ovl, alice, True, 2)
+    chain.mine(timedelta=600)
+
+    liquidations = [(mock_market, alice.address, id) for id in ids]
+    balance_before = ovl.balanceOf(rando)
+    tx = liquidator.liquidate(liquidations, {"from": rando})
+    (actual_liquidated, actual_fees) = tx.return_value
+
+    assert actual_liquidated == [False, False]
+    assert actual_fees == 0
+    assert ovl.balanceOf(rando) == balance_before
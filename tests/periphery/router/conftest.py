@@ -0,0 +1,33 @@
+import pytest
+from brownie import OverlayV1Router
+
+
+@pytest.fixture(scope="module")
+def mock_feed_two(create_mock_feed):
+    yield create_mock_feed(price=2000000000000000000)
+
+
+@pytest.fixture(scope="module")
+def market_feeds(mock_feed, mock_feed_two):
+    yield [mock_feed, mock_feed_two]
+
+
+@pytest.fixture(scope="module")
+def mock_market_two(ovl_v1_core, mock_feed_two, factory):
+    mock_market_addr = factory.getMarket(mock_feed_two)
+    mock_market = ovl_v1_core.OverlayV1Market.at(mock_market_addr)
+    yield mock_market
+
+
+@pytest.fixture(scope="module")
+def create_router(rando, factory):
+    def create_router(factory=factory, deployer=rando):
+        router = deployer.deploy(OverlayV1Router, factory)
+        return router
+
+    yield create_router
+
+
+@pytest.fixture(scope="module")
+def router(create_router):
+    yield create_router()
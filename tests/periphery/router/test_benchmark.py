@@ -0,0 +1,51 @@
+import pytest
+
+from scripts.devnet.snapshot import ChainSnapshot
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.mark.parametrize("count", [1, 5, 10, 20])
+def test_gas_batch_vs_individual(router, mock_market, mock_market_two, ovl,
+                                 alice, count):
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 2000000000000000000  # 2
+    markets = [mock_market, mock_market_two]
+
+    # run both paths from the same chain state, so neither builds on
+    # market storage the other already warmed
+    snapshot = ChainSnapshot()
+
+    # individual: approve then build on the market for each position
+    txs = []
+    for i in range(count):
+        market = markets[i % len(markets)]
+        txs.append(ovl.approve(market, 2 * input_collateral, {"from": alice}))
+        txs.append(market.build(input_collateral, input_leverage, True,
+                                2**256-1, {"from": alice}))
+    gas_individual = sum(tx.gas_used for tx in txs)
+    count_individual = len(txs)
+
+    snapshot.revert()
+
+    # batch: approve router once then execute all builds in single tx
+    ops = [(0, markets[i % len(markets)], input_collateral, input_leverage,
+            True, 0, 0, 2**256-1) for i in range(count)]
+    txs = [
+        ovl.approve(router, 2 * count * input_collateral, {"from": alice}),
+        router.execute(ops, 2 * count * input_collateral, {"from": alice}),
+    ]
+    gas_batch = sum(tx.gas_used for tx in txs)
+    count_batch = len(txs)
+
+    print(f"\npositions: {count}, "
+          f"individual: {count_individual} txs {gas_individual} gas, "
+          f"batch: {count_batch} txs {gas_batch} gas")
+    assert count_batch <= count_individual
+
+    # a single build pays for the router's transfers without saving a tx
+    if count > 1:
+        assert gas_batch < gas_individual
@@ -0,0 +1,6 @@
+def test_deploy_creates_router(create_router, factory, ovl):
+    router = create_router()
+
+    # check immutables set in constructor
+    assert router.factory() == factory
+    assert router.ovl() == ovl
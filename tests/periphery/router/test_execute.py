@@ -0,0 +1,149 @@
+import pytest
+from brownie import reverts
+
+
+# operation actions
+BUILD = 0
+UNWIND = 1
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def build_op(market, collateral, leverage, is_long, price_limit):
+    return (BUILD, market, collateral, leverage, is_long, 0, 0, price_limit)
+
+
+def unwind_op(market, position_id, fraction, price_limit):
+    return (UNWIND, market, 0, 0, False, position_id, fraction, price_limit)
+
+
+def test_execute_builds(router, state, mock_market, mock_market_two, ovl,
+                        alice):
+    # build params
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 2000000000000000000  # 2
+    amount_in = 100000000000000000000  # 100
+
+    ops = [
+        build_op(mock_market, input_collateral, input_leverage, True,
+                 2**256-1),
+        build_op(mock_market, input_collateral, input_leverage, False, 0),
+        build_op(mock_market_two, input_collateral, input_leverage, True,
+                 2**256-1),
+    ]
+
+    # approve router once then execute all builds in single tx
+    ovl.approve(router, 2**256-1, {"from": alice})
+    balance_before = ovl.balanceOf(alice)
+    tx = router.execute(ops, amount_in, {"from": alice})
+    (actual_ids, actual_amount_out) = tx.return_value
+
+    # check positions held by router owned by alice
+    markets = [mock_market, mock_market, mock_market_two]
+    for (market, id) in zip(markets, actual_ids):
+        assert router.ownerOf(market, id) == alice.address
+        (notional, debt, _, _, _, _, _, _) = state.position(
+            market, router.address, id)
+        assert notional - debt == pytest.approx(input_collateral)
+
+    # check only collateral + fees taken from alice with rest refunded
+    actual_spent = balance_before - ovl.balanceOf(alice)
+    assert actual_spent == amount_in - actual_amount_out
+    assert actual_spent > 3 * input_collateral
+    assert ovl.balanceOf(router) == 0
+
+    # check events emitted
+    assert len(tx.events['PositionBuilt']) == 3
+    expect_event = {"user": alice.address, "count": 3, "amountIn": amount_in,
+                    "amountOut": actual_amount_out}
+    assert tx.events['OperationsExecuted'] == expect_event
+
+
+def test_execute_builds_and_unwinds(router, state, mock_market, ovl, alice):
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 2000000000000000000  # 2
+    amount_in = 50000000000000000000  # 50
+
+    # build two positions through the router
+    ovl.approve(router, 2**256-1, {"from": alice})
+    ops = [
+        build_op(mock_market, input_collateral, input_leverage, True,
+                 2**256-1),
+        build_op(mock_market, input_collateral, input_leverage, True,
+                 2**256-1),
+    ]
+    tx = router.execute(ops, amount_in, {"from": alice})
+    (ids, _) = tx.return_value
+
+    # unwind the first fully and build a new one funded with proceeds
+    one = 1000000000000000000
+    ops = [
+        unwind_op(mock_market, ids[0], one, 0),
+        build_op(mock_market, input_collateral // 2, input_leverage, False,
+                 0),
+    ]
+    balance_before = ovl.balanceOf(alice)
+    tx = router.execute(ops, 0, {"from": alice})
+    (actual_ids, actual_amount_out) = tx.return_value
+
+    assert actual_ids[0] == ids[0]
+    assert router.ownerOf(mock_market, actual_ids[1]) == alice.address
+    (_, _, _, _, _, _, _, fraction_remaining) = state.position(
+        mock_market, router.address, ids[0])
+    assert fraction_remaining == 0
+
+    # check remaining proceeds returned to alice
+    assert ovl.balanceOf(alice) - balance_before == actual_amount_out
+    assert actual_amount_out > 0
+    assert ovl.balanceOf(router) == 0
+
+
+def test_execute_reverts_when_not_owner(router, mock_market, ovl, alice,
+                                        bob):
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 1000000000000000000  # 1
+
+    ovl.approve(router, 2**256-1, {"from": alice})
+    ops = [build_op(mock_market, input_collateral, input_leverage, True,
+                    2**256-1)]
+    tx = router.execute(ops, 2 * input_collateral, {"from": alice})
+    (ids, _) = tx.return_value
+
+    # bob can't unwind alice's position
+    one = 1000000000000000000
+    with reverts("OVLV1: !owner"):
+        router.execute([unwind_op(mock_market, ids[0], one, 0)], 0,
+                       {"from": bob})
+
+
+def test_execute_reverts_when_not_market(router, ovl, alice, rando):
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 1000000000000000000  # 1
+
+    ovl.approve(router, 2**256-1, {"from": alice})
+    ops = [build_op(rando, input_collateral, input_leverage, True, 2**256-1)]
+    with reverts("OVLV1: !market"):
+        router.execute(ops, 2 * input_collateral, {"from": alice})
+
+
+def test_execute_reverts_when_price_limit_exceeded(router, mock_market, ovl,
+                                                   alice):
+    input_collateral = 10000000000000000000  # 10
+    input_leverage = 1000000000000000000  # 1
+
+    # second build has a price limit below the ask
+    ovl.approve(router, 2**256-1, {"from": alice})
+    ops = [
+        build_op(mock_market, input_collateral, input_leverage, True,
+                 2**256-1),
+        build_op(mock_market, input_collateral, input_leverage, True, 0),
+    ]
+    balance_before = ovl.balanceOf(alice)
+    with reverts():
+        router.execute(ops, 3 * input_collateral, {"from": alice})
+
+    # check whole batch reverted
+    assert ovl.balanceOf(alice) == balance_before
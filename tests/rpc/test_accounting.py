@@ -0,0 +1,139 @@
+import json
+
+from web3.providers.base import BaseProvider
+
+from scripts.rpc.accounting import (
+    CALL,
+    SETUP,
+    AccountingProvider,
+    Regression,
+    RpcLedger,
+    load_budget,
+    save_budget
+)
+
+
+class GasNode(BaseProvider):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def make_request(self, method, params):
+        self.requests.append(method)
+        if method == "eth_getTransactionReceipt":
+            return {"jsonrpc": "2.0", "id": 0,
+                    "result": {"transactionHash": params[0],
+                               "gasUsed": hex(21000)}}
+        if method == "eth_estimateGas":
+            return {"jsonrpc": "2.0", "id": 0, "result": hex(30000)}
+        return {"jsonrpc": "2.0", "id": 0, "result": "0x01"}
+
+
+def test_ledger_counts_requests_by_test_and_phase():
+    ledger = RpcLedger()
+    provider = AccountingProvider(GasNode(), ledger)
+
+    ledger.start("test_a", SETUP)
+    provider.make_request("eth_sendTransaction", [{}])
+    ledger.stop()
+    ledger.start("test_a", CALL)
+    provider.make_request("eth_call", [{}, "latest"])
+    provider.make_request("eth_call", [{}, "latest"])
+    provider.make_request("eth_blockNumber", [])
+    ledger.stop()
+
+    # requests outside a test are not accounted
+    provider.make_request("eth_call", [{}, "latest"])
+
+    usage = ledger.tests["test_a"]
+    assert usage.rpc_count(SETUP) == 1
+    assert usage.rpc_count(CALL) == 2
+    assert usage.counts[CALL]["eth_blockNumber"] == 1
+    assert usage.durations[SETUP] >= 0
+    assert usage.durations[CALL] >= 0
+
+
+def test_ledger_accounts_receipt_gas_once():
+    ledger = RpcLedger()
+    provider = AccountingProvider(GasNode(), ledger)
+
+    ledger.start("test_a", CALL)
+    provider.make_request("eth_getTransactionReceipt", ["0xaa"])
+    provider.make_request("eth_getTransactionReceipt", ["0xaa"])
+    provider.make_request("eth_getTransactionReceipt", ["0xbb"])
+    ledger.stop()
+
+    assert ledger.tests["test_a"].tx_gas == [21000, 21000]
+
+
+def test_provider_estimates_call_gas_unaccounted():
+    node = GasNode()
+    ledger = RpcLedger()
+    provider = AccountingProvider(node, ledger, estimate_calls=True)
+
+    ledger.start("test_a", CALL)
+    provider.make_request("eth_call", [{"to": "0x01"}, "latest"])
+    ledger.stop()
+
+    usage = ledger.tests["test_a"]
+    assert node.requests == ["eth_call", "eth_estimateGas"]
+    assert usage.call_gas == [30000]
+    assert "eth_estimateGas" not in usage.counts[CALL]
+
+
+def test_write_report_ranks_tests_by_rpc_count(tmp_path):
+    ledger = RpcLedger()
+    for (nodeid, calls) in (("test_a", 1), ("test_b", 3), ("test_c", 2)):
+        ledger.start(nodeid, CALL)
+        for _ in range(calls):
+            ledger.count("eth_call")
+        ledger.stop()
+
+    path = tmp_path / "report.json"
+    ledger.write_report(str(path))
+    with open(path) as f:
+        report = json.load(f)
+
+    assert report["totals"] == {"eth_call": 6}
+    assert [t["nodeid"] for t in report["tests"]] == [
+        "test_b", "test_c", "test_a"]
+
+
+def test_budget_regressions(tmp_path):
+    ledger = RpcLedger()
+    for (nodeid, calls) in (("test_a", 2), ("test_b", 4)):
+        ledger.start(nodeid, CALL)
+        for _ in range(calls):
+            ledger.count("eth_call")
+        ledger.stop()
+
+    # merges into existing budget, keeping tests not run
+    path = str(tmp_path / "budget.json")
+    save_budget(path, {"test_a": 2, "test_b": 3, "test_c": 1})
+    save_budget(path, {"test_a": 2})
+    budget = load_budget(path)
+    assert budget == {"test_a": 2, "test_b": 3, "test_c": 1}
+
+    expect = [Regression("test_b", 3, 4)]
+    actual = ledger.regressions(budget)
+    assert expect == actual
+
+
+def test_merge_exported_usage():
+    workers = [RpcLedger(), RpcLedger()]
+    for (ledger, nodeid) in zip(workers, ("test_a", "test_b")):
+        provider = AccountingProvider(GasNode(), ledger)
+        ledger.start(nodeid, CALL)
+        provider.make_request("eth_call", [{}, "latest"])
+        provider.make_request("eth_getTransactionReceipt", ["0x" + nodeid])
+        ledger.stop()
+
+    # controller merges the usage handed back by each worker
+    controller = RpcLedger()
+    for ledger in workers:
+        controller.merge(json.loads(json.dumps(ledger.export())))
+
+    assert sorted(controller.tests) == ["test_a", "test_b"]
+    for ledger in workers:
+        for (nodeid, usage) in ledger.tests.items():
+            assert controller.tests[nodeid].to_dict() == usage.to_dict()
@@ -0,0 +1,109 @@
+import gzip
+
+import pytest
+from web3.providers.base import BaseProvider
+
+from scripts.rpc.cassette import (
+    Cassette,
+    CassetteMissError,
+    RecordingProvider,
+    ReplayProvider,
+    request_key
+)
+
+
+class CountingNode(BaseProvider):
+    def __init__(self):
+        super().__init__()
+        self.block = 100
+        self.requests = 0
+
+    def make_request(self, method, params):
+        self.requests += 1
+        if method == "eth_blockNumber":
+            self.block += 1
+            return {"jsonrpc": "2.0", "id": self.requests,
+                    "result": hex(self.block)}
+        if method == "eth_call":
+            return {"jsonrpc": "2.0", "id": self.requests,
+                    "result": "0x" + params[0]["data"][-8:].rjust(64, "0")}
+        return {"jsonrpc": "2.0", "id": self.requests,
+                "error": {"code": -32601, "message": "method not found"}}
+
+
+def call(data):
+    return [{"to": "0x" + "11" * 20, "data": data}, "latest"]
+
+
+def test_request_key_ignores_request_id_and_dict_order():
+    expect = request_key("eth_call", [{"to": "0x01", "data": "0x02"}])
+    actual = request_key("eth_call", [{"data": "0x02", "to": "0x01"}])
+    assert actual == expect
+    assert request_key("eth_call", [{"to": "0x01", "data": "0x03"}]) \
+        != expect
+
+
+def test_record_replay(tmp_path):
+    path = str(tmp_path / "state.cassette")
+    node = CountingNode()
+    cassette = Cassette()
+    recorder = RecordingProvider(node, cassette)
+
+    expect = [
+        recorder.make_request("eth_blockNumber", []),
+        recorder.make_request("eth_call", call("0xdeadbeef")),
+        recorder.make_request("eth_blockNumber", []),
+        recorder.make_request("eth_call", call("0xcafebabe")),
+        recorder.make_request("eth_foo", []),
+    ]
+    assert len(cassette) == 5
+    cassette.save(path)
+
+    # replays in order without the node, ignoring response ids
+    replay = ReplayProvider(Cassette.load(path))
+    actual = [
+        replay.make_request("eth_blockNumber", []),
+        replay.make_request("eth_call", call("0xdeadbeef")),
+        replay.make_request("eth_blockNumber", []),
+        replay.make_request("eth_call", call("0xcafebabe")),
+        replay.make_request("eth_foo", []),
+    ]
+    for (e, a) in zip(expect, actual):
+        assert {k: v for (k, v) in e.items() if k != "id"} \
+            == {k: v for (k, v) in a.items() if k != "id"}
+    assert node.requests == 5
+
+    # repeats the last response once exhausted
+    assert replay.make_request("eth_blockNumber", [])["result"] == hex(102)
+
+
+def test_replay_raises_on_miss():
+    replay = ReplayProvider(Cassette())
+    with pytest.raises(CassetteMissError):
+        replay.make_request("eth_call", call("0xdeadbeef"))
+
+
+def test_rewind():
+    cassette = Cassette()
+    recorder = RecordingProvider(CountingNode(), cassette)
+    recorder.make_request("eth_blockNumber", [])
+    recorder.make_request("eth_blockNumber", [])
+
+    assert cassette.play("eth_blockNumber", [])["result"] == hex(101)
+    assert cassette.play("eth_blockNumber", [])["result"] == hex(102)
+    cassette.rewind()
+    assert cassette.play("eth_blockNumber", [])["result"] == hex(101)
+
+    methods = [method for (_, method, _) in cassette.interactions()]
+    assert methods == ["eth_blockNumber", "eth_blockNumber"]
+
+
+def test_load_raises_when_version_mismatch(tmp_path):
+    path = str(tmp_path / "state.cassette")
+    cassette = Cassette()
+    cassette.save(path)
+
+    with gzip.open(path, "wt") as f:
+        f.write('{"version": 0, "methods": {}, "responses": {}}')
+    with pytest.raises(ValueError, match="version"):
+        Cassette.load(path)
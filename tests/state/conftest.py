@@ -1,58 +1,284 @@
+import math
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Tuple
+
 import pytest
-from brownie import Contract, OverlayV1State, web3
+from brownie import (
+    Contract, ERC20Mock, OverlayV1State, UniswapV3FactoryMock,
+    UniswapV3PoolMock, history, network, web3
+)
 from dotenv import load_dotenv
 
+from scripts.devnet.dump import (
+    devnet_dir, fingerprint, load_devnet, save_devnet, supports_dump
+)
+from scripts.devnet.snapshot import ChainSnapshot
+from scripts.explorer.cache import ExplorerCache
+from scripts.rpc.cassette import (
+    CASSETTE_ENV, CASSETTE_MODE_ENV, RECORD, Cassette, RecordingProvider,
+    ReplayProvider, cassette_path
+)
+
+from .utils import (
+    POOL_COLLATERALS, POOL_LEVERAGES, POOL_SHORT_COLLATERALS
+)
+
 load_dotenv()
 
 
-@pytest.fixture(scope="module")
+# mainnet tokens stood in for when offline as (name, symbol, decimals),
+# in order of mainnet address
+OFFLINE_TOKENS = {
+    "uni": ("Uniswap", "UNI", 18),
+    "dai": ("Dai Stablecoin", "DAI", 18),
+    "weth": ("Wrapped Ether", "WETH", 18),
+}
+
+
+def deploy_tokens(deployer, tokens):
+    """
+    Deploys ERC20 mocks for the tokens with addresses sorted in the same
+    order as given, so pool token0, token1 match mainnet
+    """
+    nonce = deployer.nonce
+    addresses = [deployer.get_deployment_address(nonce + i)
+                 for i in range(len(tokens))]
+    ranks = sorted(range(len(tokens)), key=lambda i: int(addresses[i], 16))
+
+    names = list(tokens.keys())
+    deployed = {}
+    for i in range(len(tokens)):
+        name = names[ranks.index(i)]
+        deployed[name] = deployer.deploy(ERC20Mock, *tokens[name])
+    return deployed
+
+
+def create_pool(factory, base, quote, fee, price, liquidity, deployer):
+    """
+    Creates a mock pool with constant price of base in terms of quote
+    """
+    raw_price = price * 10 ** quote.decimals() / 10 ** base.decimals()
+    if int(base.address, 16) > int(quote.address, 16):
+        raw_price = 1 / raw_price
+    tick = math.floor(math.log(raw_price) / math.log(1.0001))
+    tx = factory.createPool(base, quote, fee, tick, liquidity,
+                            {"from": deployer})
+    return UniswapV3PoolMock.at(tx.return_value)
+
+
+# params of the fixtures set up by the session deployment. Constants
+# rather than fixture params as pytest only allows requesting fixtures
+# dynamically when they are not parametrized
+TOKEN_SUPPLY = 8000000
+
+# micro window, macro window, cardinality min, average block time
+FEED_FACTORY_PARAMS = (600, 1800, 300, 12)
+
+# micro window, macro window
+MOCK_FEED_FACTORY_PARAMS = (600, 1800)
+
+# price, reserve
+MOCK_FEED_PARAMS = (1000000000000000000, 2000000000000000000000000)
+
+RISK_PARAMS = (
+    1220000000000,  # k
+    500000000000000000,  # lmbda
+    2500000000000000,  # delta
+    5000000000000000000,  # capPayoff
+    800000000000000000000000,  # capNotional
+    5000000000000000000,  # capLeverage
+    2592000,  # circuitBreakerWindow
+    66670000000000000000000,  # circuitBreakerMintTarget
+    100000000000000000,  # maintenanceMarginFraction
+    100000000000000000,  # maintenanceMarginBurnRate
+    50000000000000000,  # liquidationFeeRate
+    750000000000000,  # tradingFeeRate
+    100000000000000,  # minCollateral
+    25000000000000,  # priceDriftUpperLimit
+    14,  # averageBlockTime
+)
+
+# fixtures the session deployment sets up when any collected test uses
+# them, in deploy order
+DEPLOYMENT_FIXTURES = (
+    "ovl",
+    "offline_tokens",
+    "uni_factory",
+    "pool_daiweth_30bps",
+    "pool_uniweth_30bps",
+    "factory",
+    "state",
+    "feed_factory",
+    "feed",
+    "market",
+    "mock_feed_factory",
+    "mock_feed",
+    "mock_market",
+)
+
+# (fixture, transactions, gas used, seconds) of each fixture set up by
+# the session deployment, reported at the end of the session
+DEPLOYMENT_TRACE: List[Tuple[str, int, int, float]] = []
+
+# seconds of each revert to the session deployment between modules,
+# reported with the deployment to compare against redeploying
+MODULE_REVERTS: List[float] = []
+
+
+def used_fixtures(session) -> List[str]:
+    """
+    Returns the deployment fixtures used by any collected test
+    """
+    names = set()
+    for item in session.items:
+        names.update(getattr(item, "fixturenames", ()))
+    return [name for name in DEPLOYMENT_FIXTURES if name in names]
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not DEPLOYMENT_TRACE:
+        return
+    terminalreporter.section("state deployment")
+    for (name, txs, gas, seconds) in DEPLOYMENT_TRACE:
+        terminalreporter.write_line(
+            f"{name:<20} {txs:>4} txs {gas:>12} gas {seconds:>8.2f}s")
+    deployed = sum(t[3] for t in DEPLOYMENT_TRACE)
+    terminalreporter.write_line(
+        f"deployed once in {deployed:.2f}s, reverted to "
+        f"{len(MODULE_REVERTS)} times in {sum(MODULE_REVERTS):.2f}s")
+    skipped = [name for name in DEPLOYMENT_FIXTURES
+               if name not in [t[0] for t in DEPLOYMENT_TRACE]]
+    if skipped:
+        terminalreporter.write_line(f"not deployed: {', '.join(skipped)}")
+
+
+class PooledPosition(NamedTuple):
+    market: Any
+    owner: Any
+    id: int
+    is_long: bool
+    collateral: int
+    leverage: int
+
+
+class PositionPool:
+    """
+    Positions built once per test module on each side of the given
+    markets, for hypothesis examples to draw from instead of building
+    their own. Changes made in an example are reverted by fn_isolation.
+
+    Positions are owned by an account no test builds with, and the long
+    side outweighs the short so funding is not zero. Pooled positions
+    change market oi for the rest of the module, so only use the pool
+    from modules where every test draws from it
+    """
+
+    def __init__(self, markets, ovl, owner):
+        self._positions: Dict[Tuple[str, bool], List[PooledPosition]] = {}
+        for market in markets:
+            ovl.approve(market, 2**256-1, {"from": owner})
+            for is_long in (True, False):
+                price_limit = 2**256-1 if is_long else 0
+                collaterals = POOL_COLLATERALS if is_long \
+                    else POOL_SHORT_COLLATERALS
+                positions = []
+                for leverage in POOL_LEVERAGES:
+                    for collateral in collaterals:
+                        tx = market.build(collateral, leverage, is_long,
+                                          price_limit, {"from": owner})
+                        positions.append(PooledPosition(
+                            market, owner, tx.return_value, is_long,
+                            collateral, leverage))
+                self._positions[(market.address, is_long)] = positions
+
+    def get(self, market, is_long: bool, index: int) -> PooledPosition:
+        """
+        Returns the pooled position at index on the side of market
+        """
+        return self._positions[(market.address, is_long)][index]
+
+
+# record or replay all json rpc of the session, e.g.
+# RPC_CASSETTE=state.cassette RPC_CASSETTE_MODE=record brownie test
+@pytest.fixture(scope="session", autouse=True)
+def rpc_cassette():
+    path = os.environ.get(CASSETTE_ENV)
+    if not path:
+        yield None
+        return
+
+    path = cassette_path(path)
+    record = os.environ.get(CASSETTE_MODE_ENV) == RECORD
+    provider = web3.provider
+    if record:
+        cassette = Cassette()
+        web3.provider = RecordingProvider(provider, cassette)
+    else:
+        cassette = Cassette.load(path)
+        web3.provider = ReplayProvider(cassette)
+
+    yield cassette
+
+    web3.provider = provider
+    if record:
+        cassette.save(path)
+
+
+@pytest.fixture(scope="session")
 def ovl_v1_core(pm):
     return pm("overlay-market/v1-core@1.0.0-rc.0")
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gov(accounts):
     yield accounts[0]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def alice(accounts):
     yield accounts[1]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def bob(accounts):
     yield accounts[2]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def rando(accounts):
     yield accounts[3]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def fee_recipient(accounts):
     yield accounts[4]
 
 
-@pytest.fixture(scope="module")
+# owner of the pooled positions, not used by any other fixture or test
+@pytest.fixture(scope="session")
+def pool_owner(accounts):
+    yield accounts[5]
+
+
+@pytest.fixture(scope="session")
 def minter_role():
     yield web3.solidityKeccak(['string'], ["MINTER"])
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def burner_role():
     yield web3.solidityKeccak(['string'], ["BURNER"])
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def governor_role():
     yield web3.solidityKeccak(['string'], ["GOVERNOR"])
 
 
-@pytest.fixture(scope="module", params=[8000000])
-def create_token(ovl_v1_core, gov, alice, bob, minter_role, request):
-    sup = request.param
+@pytest.fixture(scope="session")
+def create_token(ovl_v1_core, gov, alice, bob, minter_role):
+    sup = TOKEN_SUPPLY
 
     def create_token(supply=sup):
         ovl = ovl_v1_core.OverlayV1Token
@@ -70,46 +296,110 @@ def create_token(ovl_v1_core, gov, alice, bob, minter_role, request):
     yield create_token
 
 
-@pytest.fixture(scope="module")
-def ovl(create_token):
-    yield create_token()
+@pytest.fixture(scope="session")
+def ovl(create_token, ovl_v1_core, devnet):
+    if "ovl" in devnet:
+        yield ovl_v1_core.OverlayV1Token.at(devnet["ovl"])
+    else:
+        yield create_token()
 
 
-@pytest.fixture(scope="module")
-def dai():
-    yield Contract.from_explorer("0x6B175474E89094C44Da98b954EedeAC495271d0F")
+@pytest.fixture(scope="session")
+def explorer_cache():
+    yield ExplorerCache()
 
 
-@pytest.fixture(scope="module")
-def weth():
-    yield Contract.from_explorer("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+# builds mainnet contracts from ABIs in the local explorer cache, only
+# fetching from the explorer the first time an address is used
+@pytest.fixture(scope="session")
+def explorer(explorer_cache):
+    def explorer(address, chain_id=1):
+        contract = explorer_cache.get_or_fetch(chain_id, address)
+        return Contract.from_abi(contract.name, address, contract.abi)
 
+    yield explorer
 
-@pytest.fixture(scope="module")
-def uni():
-    # to be used as example ovl
-    yield Contract.from_explorer("0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984")
 
+# use local stand ins for mainnet contracts unless on a fork, e.g.
+# brownie test --network development
+@pytest.fixture(scope="session")
+def offline():
+    yield "fork" not in network.show_active()
 
-@pytest.fixture(scope="module")
-def uni_factory():
-    yield Contract.from_explorer("0x1F98431c8aD98523631AE4a59f267346ea31F984")
 
+@pytest.fixture(scope="session")
+def offline_tokens(offline, gov, devnet):
+    if not offline:
+        yield {}
+    elif "dai" in devnet:
+        yield {name: ERC20Mock.at(devnet[name]) for name in OFFLINE_TOKENS}
+    else:
+        yield deploy_tokens(gov, OFFLINE_TOKENS)
 
-@pytest.fixture(scope="module")
-def pool_daiweth_30bps():
-    yield Contract.from_explorer("0xC2e9F25Be6257c210d7Adf0D4Cd6E3E881ba25f8")
 
+@pytest.fixture(scope="session")
+def dai(offline, offline_tokens, explorer):
+    if offline:
+        yield offline_tokens["dai"]
+    else:
+        yield explorer("0x6B175474E89094C44Da98b954EedeAC495271d0F")
 
-@pytest.fixture(scope="module")
-def pool_uniweth_30bps():
-    # to be used as example ovlweth pool
-    yield Contract.from_explorer("0x1d42064Fc4Beb5F8aAF85F4617AE8b3b5B8Bd801")
+
+@pytest.fixture(scope="session")
+def weth(offline, offline_tokens, explorer):
+    if offline:
+        yield offline_tokens["weth"]
+    else:
+        yield explorer("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
 
 
-@pytest.fixture(scope="module", params=[(600, 1800, 300, 12)])
-def create_feed_factory(ovl_v1_core, uni_factory, gov, weth, uni, request):
-    micro, macro, cardinality, block_time = request.param
+@pytest.fixture(scope="session")
+def uni(offline, offline_tokens, explorer):
+    # to be used as example ovl
+    if offline:
+        yield offline_tokens["uni"]
+    else:
+        yield explorer("0x1f9840a85d5aF5bf1D1762F925BDADdC4201F984")
+
+
+@pytest.fixture(scope="session")
+def uni_factory(offline, gov, explorer, devnet):
+    if offline and "uni_factory" in devnet:
+        yield UniswapV3FactoryMock.at(devnet["uni_factory"])
+    elif offline:
+        yield gov.deploy(UniswapV3FactoryMock)
+    else:
+        yield explorer("0x1F98431c8aD98523631AE4a59f267346ea31F984")
+
+
+@pytest.fixture(scope="session")
+def pool_daiweth_30bps(offline, uni_factory, dai, weth, gov, explorer,
+                       devnet):
+    if offline and "pool_daiweth_30bps" in devnet:
+        yield UniswapV3PoolMock.at(devnet["pool_daiweth_30bps"])
+    elif offline:
+        yield create_pool(uni_factory, weth, dai, 3000, 3000,
+                          900000000000000000000000, gov)
+    else:
+        yield explorer("0xC2e9F25Be6257c210d7Adf0D4Cd6E3E881ba25f8")
+
+
+@pytest.fixture(scope="session")
+def pool_uniweth_30bps(offline, uni_factory, uni, weth, gov, explorer,
+                       devnet):
+    # to be used as example ovlweth pool
+    if offline and "pool_uniweth_30bps" in devnet:
+        yield UniswapV3PoolMock.at(devnet["pool_uniweth_30bps"])
+    elif offline:
+        yield create_pool(uni_factory, weth, uni, 3000, 300,
+                          100000000000000000000000, gov)
+    else:
+        yield explorer("0x1d42064Fc4Beb5F8aAF85F4617AE8b3b5B8Bd801")
+
+
+@pytest.fixture(scope="session")
+def create_feed_factory(ovl_v1_core, uni_factory, gov, weth, uni):
+    micro, macro, cardinality, block_time = FEED_FACTORY_PARAMS
     tok = uni.address
     uni_fact = uni_factory
 
@@ -125,12 +415,15 @@ def create_feed_factory(ovl_v1_core, uni_factory, gov, weth, uni, request):
     yield create_feed_factory
 
 
-@pytest.fixture(scope="module")
-def feed_factory(create_feed_factory):
-    yield create_feed_factory()
+@pytest.fixture(scope="session")
+def feed_factory(create_feed_factory, ovl_v1_core, devnet):
+    if "feed_factory" in devnet:
+        yield ovl_v1_core.OverlayV1UniswapV3Factory.at(devnet["feed_factory"])
+    else:
+        yield create_feed_factory()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def create_feed(ovl_v1_core, gov, feed_factory, pool_daiweth_30bps,
                 pool_uniweth_30bps, uni, dai, weth, request):
     # ovlweth treated as uniweth for test purposes, feed ovl treated as uni
@@ -160,14 +453,17 @@ def create_feed(ovl_v1_core, gov, feed_factory, pool_daiweth_30bps,
     yield create_feed
 
 
-@pytest.fixture(scope="module")
-def feed(create_feed):
-    yield create_feed()
+@pytest.fixture(scope="session")
+def feed(create_feed, ovl_v1_core, devnet):
+    if "feed" in devnet:
+        yield ovl_v1_core.OverlayV1UniswapV3Feed.at(devnet["feed"])
+    else:
+        yield create_feed()
 
 
-@pytest.fixture(scope="module", params=[(600, 1800)])
-def create_mock_feed_factory(ovl_v1_core, gov, request):
-    micro, macro = request.param
+@pytest.fixture(scope="session")
+def create_mock_feed_factory(ovl_v1_core, gov):
+    micro, macro = MOCK_FEED_FACTORY_PARAMS
 
     def create_mock_feed_factory(micro_window=micro, macro_window=macro):
         feed_factory = gov.deploy(ovl_v1_core.OverlayV1FeedFactoryMock,
@@ -177,17 +473,19 @@ def create_mock_feed_factory(ovl_v1_core, gov, request):
     yield create_mock_feed_factory
 
 
-@pytest.fixture(scope="module")
-def mock_feed_factory(create_mock_feed_factory):
-    yield create_mock_feed_factory()
+@pytest.fixture(scope="session")
+def mock_feed_factory(create_mock_feed_factory, ovl_v1_core, devnet):
+    if "mock_feed_factory" in devnet:
+        yield ovl_v1_core.OverlayV1FeedFactoryMock.at(
+            devnet["mock_feed_factory"])
+    else:
+        yield create_mock_feed_factory()
 
 
 # Mock feed to easily change price/reserve for testing of various conditions
-@pytest.fixture(scope="module", params=[
-    (1000000000000000000, 2000000000000000000000000)
-])
-def create_mock_feed(ovl_v1_core, gov, mock_feed_factory, request):
-    price, reserve = request.param
+@pytest.fixture(scope="session")
+def create_mock_feed(ovl_v1_core, gov, mock_feed_factory):
+    price, reserve = MOCK_FEED_PARAMS
 
     def create_mock_feed(price=price, reserve=reserve):
         tx = mock_feed_factory.deployFeed(price, reserve)
@@ -198,33 +496,17 @@ def create_mock_feed(ovl_v1_core, gov, mock_feed_factory, request):
     yield create_mock_feed
 
 
-@pytest.fixture(scope="module")
-def mock_feed(create_mock_feed):
-    yield create_mock_feed()
-
+@pytest.fixture(scope="session")
+def mock_feed(create_mock_feed, ovl_v1_core, devnet):
+    if "mock_feed" in devnet:
+        yield ovl_v1_core.OverlayV1FeedMock.at(devnet["mock_feed"])
+    else:
+        yield create_mock_feed()
 
-@pytest.fixture(scope="module", params=[(
-    1220000000000,  # k
-    500000000000000000,  # lmbda
-    2500000000000000,  # delta
-    5000000000000000000,  # capPayoff
-    800000000000000000000000,  # capNotional
-    5000000000000000000,  # capLeverage
-    2592000,  # circuitBreakerWindow
-    66670000000000000000000,  # circuitBreakerMintTarget
-    100000000000000000,  # maintenanceMarginFraction
-    100000000000000000,  # maintenanceMarginBurnRate
-    50000000000000000,  # liquidationFeeRate
-    750000000000000,  # tradingFeeRate
-    100000000000000,  # minCollateral
-    25000000000000,  # priceDriftUpperLimit
-    14,  # averageBlockTime
-)])
-def create_factory(ovl_v1_core, gov, governor_role, fee_recipient, ovl,
-                   feed_factory, mock_feed_factory, feed, mock_feed, request):
-    params = request.param
 
-    def create_factory(tok=ovl, recipient=fee_recipient, risk_params=params):
+@pytest.fixture(scope="session")
+def create_factory(ovl_v1_core, gov, governor_role, fee_recipient, ovl):
+    def create_factory(tok=ovl, recipient=fee_recipient):
         ovl_factory = ovl_v1_core.OverlayV1Factory
 
         # create the market factory
@@ -236,44 +518,57 @@ def create_factory(ovl_v1_core, gov, governor_role, fee_recipient, ovl,
         # grant gov the governor role on token to access factory methods
         tok.grantRole(governor_role, gov, {"from": gov})
 
-        # add feed factory as approved for factory to deploy markets on
-        factory.addFeedFactory(feed_factory, {"from": gov})
+        return factory
 
-        # add mock feed factory as approved for factory to deploy markets on
-        factory.addFeedFactory(mock_feed_factory, {"from": gov})
+    yield create_factory
 
-        # deploy a market on feed
-        factory.deployMarket(feed_factory, feed, risk_params, {"from": gov})
 
-        # deploy a market on mock feed
-        factory.deployMarket(mock_feed_factory, mock_feed,
-                             risk_params, {"from": gov})
+@pytest.fixture(scope="session")
+def factory(create_factory, ovl_v1_core, devnet):
+    if "factory" in devnet:
+        yield ovl_v1_core.OverlayV1Factory.at(devnet["factory"])
+    else:
+        yield create_factory()
 
-        return factory
 
-    yield create_factory
+@pytest.fixture(scope="session")
+def create_market(ovl_v1_core, gov, factory):
+    params = RISK_PARAMS
 
+    def create_market(feed_factory, feed, risk_params=params):
+        # add feed factory as approved for factory to deploy markets on
+        if not factory.isFeedFactory(feed_factory):
+            factory.addFeedFactory(feed_factory, {"from": gov})
 
-@pytest.fixture(scope="module")
-def factory(create_factory):
-    yield create_factory()
+        # deploy a market on feed
+        factory.deployMarket(feed_factory, feed, risk_params, {"from": gov})
+        market_addr = factory.getMarket(feed)
+        return ovl_v1_core.OverlayV1Market.at(market_addr)
 
+    yield create_market
 
-@pytest.fixture(scope="module")
-def market(ovl_v1_core, feed, factory):
+
+# markets are only deployed on the feeds of tests that use them
+@pytest.fixture(scope="session")
+def market(ovl_v1_core, create_market, feed_factory, feed, factory):
     market_addr = factory.getMarket(feed)
-    market = ovl_v1_core.OverlayV1Market.at(market_addr)
-    yield market
+    if int(market_addr, 16) != 0:
+        yield ovl_v1_core.OverlayV1Market.at(market_addr)
+    else:
+        yield create_market(feed_factory, feed)
 
 
-@pytest.fixture(scope="module")
-def mock_market(ovl_v1_core, mock_feed, factory):
+@pytest.fixture(scope="session")
+def mock_market(ovl_v1_core, create_market, mock_feed_factory, mock_feed,
+                factory):
     mock_market_addr = factory.getMarket(mock_feed)
-    mock_market = ovl_v1_core.OverlayV1Market.at(mock_market_addr)
-    yield mock_market
+    if int(mock_market_addr, 16) != 0:
+        yield ovl_v1_core.OverlayV1Market.at(mock_market_addr)
+    else:
+        yield create_market(mock_feed_factory, mock_feed)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def create_state(rando, ovl):
     def create_state(factory, deployer=rando):
         state = deployer.deploy(OverlayV1State, factory)
@@ -282,6 +577,96 @@ def create_state(rando, ovl):
     yield create_state
 
 
+@pytest.fixture(scope="session")
+def state(create_state, factory, devnet):
+    if "state" in devnet:
+        yield OverlayV1State.at(devnet["state"])
+    else:
+        yield create_state(factory)
+
+
+@pytest.fixture(scope="session")
+def devnet_fingerprint(ovl_v1_core, accounts):
+    # rebuild the dump when deployed bytecode, this setup, the network
+    # or the accounts change. Dumps hold every deployment fixture, so
+    # the same dump serves any subset of tests
+    contracts = [
+        OverlayV1State,
+        ERC20Mock,
+        UniswapV3FactoryMock,
+        UniswapV3PoolMock,
+        ovl_v1_core.OverlayV1Token,
+        ovl_v1_core.OverlayV1UniswapV3Factory,
+        ovl_v1_core.OverlayV1UniswapV3Feed,
+        ovl_v1_core.OverlayV1FeedFactoryMock,
+        ovl_v1_core.OverlayV1FeedMock,
+        ovl_v1_core.OverlayV1Factory,
+        ovl_v1_core.OverlayV1Market,
+    ]
+    extra = [network.show_active(), [str(a) for a in accounts]]
+    yield fingerprint(contracts, [__file__], extra)
+
+
+# addresses of contracts by fixture name when loaded from the devnet
+# dump, else empty and fixtures deploy as usual
+@pytest.fixture(scope="session")
+def devnet(devnet_fingerprint):
+    addresses = load_devnet(web3, devnet_dir("state"), devnet_fingerprint)
+    yield addresses if addresses is not None else {}
+
+
+# build the position pool after the module reverts to the session
+# deployment and before fn_isolation snapshots each test
 @pytest.fixture(scope="module")
-def state(create_state, factory):
-    yield create_state(factory)
+def position_pool(module_isolation, market, mock_market, ovl, alice,
+                  pool_owner):
+    ovl.transfer(pool_owner, 1000000000000000000000, {"from": alice})
+    yield PositionPool([market, mock_market], ovl, pool_owner)
+
+
+# deploy the contracts used by the collected tests once per session,
+# before any module snapshots so fixtures are never deployed within a
+# reverted test
+@pytest.fixture(scope="session")
+def deployment(rpc_cassette, devnet, devnet_fingerprint, request):
+    # deploy everything when saving a dump, as later sessions load it
+    # whichever tests they collect, else only what these tests use
+    dumping = not devnet and supports_dump(web3)
+    names = DEPLOYMENT_FIXTURES if dumping \
+        else used_fixtures(request.session)
+
+    contracts = {}
+    for name in names:
+        start = len(history)
+        started = time.perf_counter()
+        value = request.getfixturevalue(name)
+        seconds = time.perf_counter() - started
+        txs = history[start:]
+        DEPLOYMENT_TRACE.append(
+            (name, len(txs), sum(tx.gas_used for tx in txs), seconds))
+
+        if isinstance(value, dict):
+            contracts.update(value)
+        else:
+            contracts[name] = value
+
+    # save the setup for the next session if not loaded from a dump
+    if dumping:
+        save_devnet(web3, devnet_dir("state"), devnet_fingerprint, contracts)
+
+    yield ChainSnapshot()
+
+
+def revert_deployment(deployment):
+    started = time.perf_counter()
+    deployment.revert()
+    MODULE_REVERTS.append(time.perf_counter() - started)
+
+
+# overrides brownie module_isolation, which resets the chain, to revert
+# to the session deployment instead of redeploying for each module
+@pytest.fixture(scope="module", autouse=True)
+def module_isolation(deployment):
+    revert_deployment(deployment)
+    yield
+    revert_deployment(deployment)
@@ -0,0 +1,99 @@
+import os
+from decimal import Decimal
+
+import pyarrow.dataset as ds
+import pytest
+from brownie import chain, web3
+
+from scripts.state.backfill import backfill, pending_ranges
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def read_rows(out_dir):
+    table = ds.dataset(out_dir, format="parquet",
+                       partitioning="hive").to_table()
+    return sorted(table.to_pylist(),
+                  key=lambda row: (row["market"], row["block"]))
+
+
+def build_history(market, ovl, alice, bob, blocks):
+    # change market state over a number of blocks
+    ovl.approve(market, 2**256-1, {"from": alice})
+    ovl.approve(market, 2**256-1, {"from": bob})
+    start = chain.height + 1
+    for i in range(blocks):
+        if i % 2 == 0:
+            market.build(10000000000000000000, 1000000000000000000, True,
+                         2**256-1, {"from": alice})
+        else:
+            market.build(5000000000000000000, 1000000000000000000, False,
+                         0, {"from": bob})
+    return (start, chain.height + 1)
+
+
+def test_backfill(tmp_path, state, mock_market, market, ovl, alice, bob):
+    (start, end) = build_history(mock_market, ovl, alice, bob, 6)
+    out_dir = str(tmp_path)
+    markets = [mock_market.address, market.address]
+
+    rows = backfill(web3.provider.endpoint_uri, state.address, state.abi,
+                    markets, start, end, out_dir, range_size=2, workers=2)
+    assert rows == 2 * (end - start)
+
+    # check rows match market state at each block
+    actual = read_rows(out_dir)
+    assert len(actual) == rows
+    for row in actual:
+        m = mock_market if row["market"] == mock_market.address.lower() \
+            else market
+        expect = state.marketState(m, block_identifier=row["block"])
+        for name, value in zip(["bid", "ask", "mid", "volume_bid",
+                                "volume_ask", "oi_long", "oi_short",
+                                "cap_oi", "circuit_breaker_level",
+                                "funding_rate"], expect):
+            assert row[name] == Decimal(int(value)).scaleb(-18)
+
+
+def test_backfill_resumes(tmp_path, state, mock_market, ovl, alice, bob):
+    (start, end) = build_history(mock_market, ovl, alice, bob, 6)
+    out_dir = str(tmp_path)
+    markets = [mock_market.address]
+
+    # backfill first range only then resume the rest
+    backfill(web3.provider.endpoint_uri, state.address, state.abi, markets,
+             start, start + 2, out_dir, range_size=2, workers=1)
+    assert len(pending_ranges(out_dir, start, end, 2)) == 2
+
+    rows = backfill(web3.provider.endpoint_uri, state.address, state.abi,
+                    markets, start, end, out_dir, range_size=2, workers=2)
+    assert rows == end - start - 2
+    assert pending_ranges(out_dir, start, end, 2) == []
+
+    # nothing left to do on rerun
+    rows = backfill(web3.provider.endpoint_uri, state.address, state.abi,
+                    markets, start, end, out_dir, range_size=2, workers=2)
+    assert rows == 0
+    assert [row["block"] for row in read_rows(out_dir)] == list(
+        range(start, end))
+
+    partition = os.path.join(out_dir,
+                             f"market={mock_market.address.lower()}")
+    assert len(os.listdir(partition)) == 3
+
+
+def test_backfill_step(tmp_path, state, mock_market, ovl, alice, bob):
+    (start, end) = build_history(mock_market, ovl, alice, bob, 6)
+    out_dir = str(tmp_path)
+    rows = backfill(web3.provider.endpoint_uri, state.address, state.abi,
+                    [mock_market.address], start, end, out_dir,
+                    range_size=4, step=2, workers=2)
+    assert rows == len(range(start, end, 2))
+
+    with pytest.raises(ValueError):
+        backfill(web3.provider.endpoint_uri, state.address, state.abi,
+                 [mock_market.address], start, end, out_dir,
+                 range_size=3, step=2)
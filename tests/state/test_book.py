@@ -0,0 +1,167 @@
+import pytest
+from pytest import approx
+from brownie import chain
+
+from scripts.state.book import BOOK_DTYPE, PositionBook
+from scripts.state.offline import (
+    PositionInfo,
+    to_position_info,
+    to_raw_market_data
+)
+
+
+MARKET_A = "0x" + "aa" * 20
+MARKET_B = "0x" + "bb" * 20
+ALICE = "0x" + "01" * 20
+BOB = "0x" + "02" * 20
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def make_position(is_long=True, notional_initial=20 * 10**18,
+                  oi_shares=2**100 + 7, liquidated=False,
+                  fraction_remaining=10000):
+    return PositionInfo(
+        notional_initial=notional_initial,
+        debt_initial=2**95 + 1,
+        mid_tick=-887272,
+        entry_tick=12345,
+        is_long=is_long,
+        liquidated=liquidated,
+        oi_shares=oi_shares,
+        fraction_remaining=fraction_remaining
+    )
+
+
+def test_append_and_get():
+    book = PositionBook(capacity=2)
+    positions = {}
+    for i in range(10):
+        position = make_position(is_long=(i % 2 == 0),
+                                 notional_initial=i * 10**18)
+        book.append(MARKET_A, ALICE, i, position)
+        positions[i] = position
+
+    assert len(book) == 10
+    assert book.records.dtype == BOOK_DTYPE
+    for i, position in positions.items():
+        assert book.get(MARKET_A, ALICE, i) == position
+        assert (MARKET_A, ALICE, i) in book
+
+    # keys are case insensitive in addresses
+    assert (MARKET_A.upper().replace("0X", "0x"), ALICE, 0) in book
+    assert (MARKET_A, ALICE, 10) not in book
+
+    with pytest.raises(ValueError):
+        book.append(MARKET_A, ALICE, 0, make_position())
+
+
+def test_update():
+    book = PositionBook()
+    book.append(MARKET_A, ALICE, 0, make_position())
+    row = book.append(MARKET_A, BOB, 0, make_position())
+
+    updated = make_position(fraction_remaining=5000, liquidated=True)
+    assert book.update(MARKET_A, BOB, 0, updated) == row
+    assert book.get(MARKET_A, BOB, 0) == updated
+    assert book.get(MARKET_A, ALICE, 0) == make_position()
+
+    with pytest.raises(KeyError):
+        book.update(MARKET_B, BOB, 0, updated)
+
+    # upsert appends new and updates existing
+    book.upsert(MARKET_B, BOB, 0, updated)
+    book.upsert(MARKET_B, BOB, 0, make_position())
+    assert len(book) == 3
+    assert book.get(MARKET_B, BOB, 0) == make_position()
+
+
+def test_append_reverts_when_overflow():
+    book = PositionBook()
+    with pytest.raises(OverflowError):
+        book.append(MARKET_A, ALICE, 0,
+                    make_position(notional_initial=2**96))
+    with pytest.raises(OverflowError):
+        book.append(MARKET_A, ALICE, 0, make_position(oi_shares=2**240))
+    assert len(book) == 0
+
+    # oi shares take the full uint240 range
+    position = make_position(oi_shares=2**240 - 1)
+    book.append(MARKET_A, ALICE, 0, position)
+    assert book.get(MARKET_A, ALICE, 0) == position
+
+
+def test_filters():
+    book = PositionBook()
+    book.append(MARKET_A, ALICE, 0, make_position(is_long=True))
+    book.append(MARKET_A, BOB, 0, make_position(is_long=False))
+    book.append(MARKET_B, ALICE, 0, make_position(is_long=True))
+    book.append(MARKET_B, ALICE, 1, make_position(liquidated=True))
+    book.append(MARKET_B, BOB, 1, make_position(fraction_remaining=0))
+
+    assert list(book.rows()) == [0, 1, 2]
+    assert list(book.rows(market=MARKET_A)) == [0, 1]
+    assert list(book.rows(market=MARKET_B)) == [2]
+    assert list(book.rows(market=MARKET_B, include_closed=True)) == [2, 3, 4]
+    assert list(book.rows(is_long=False)) == [1]
+    assert list(book.rows(market=MARKET_A, is_long=True)) == [0]
+    assert list(book.rows(market="0x" + "cc" * 20)) == []
+
+    keys = [key for key, _ in book.positions(book.rows(market=MARKET_A))]
+    assert keys == [(MARKET_A, ALICE, 0), (MARKET_A, BOB, 0)]
+    assert book.markets == [MARKET_A, MARKET_B]
+
+
+def test_from_records():
+    book = PositionBook()
+    book.append(MARKET_A, ALICE, 0, make_position(is_long=True))
+    book.append(MARKET_B, BOB, 7, make_position(is_long=False))
+
+    # keys by row come from the records before any lookup by key
+    loaded = PositionBook.from_records(book.records.copy(), book.markets)
+    assert [loaded.key(row) for row in range(2)] == \
+        [(MARKET_A, ALICE, 0), (MARKET_B, BOB, 7)]
+
+    assert loaded.row(MARKET_B, BOB, 7) == 1
+    assert (MARKET_A, BOB, 0) not in loaded
+    loaded.append(MARKET_A, BOB, 0, make_position())
+    assert loaded.get(MARKET_A, BOB, 0) == make_position()
+
+
+def test_record_size():
+    # far smaller than a dict or tuple of python ints per position
+    assert BOOK_DTYPE.itemsize <= 96
+
+
+def test_values_at(state, mock_market, ovl, alice, bob):
+    ovl.approve(mock_market, 2**256-1, {"from": alice})
+    ovl.approve(mock_market, 2**256-1, {"from": bob})
+
+    # build positions on both sides and add them to the book
+    book = PositionBook()
+    for (user, is_long, price_limit) in [(alice, True, 2**256-1),
+                                         (bob, False, 0),
+                                         (alice, False, 0)]:
+        tx = mock_market.build(10000000000000000000, 2000000000000000000,
+                               is_long, price_limit, {"from": user})
+        pos_id = tx.return_value
+        book.append(mock_market.address, user.address, pos_id,
+                    to_position_info(state.position(mock_market,
+                                                    user.address, pos_id)))
+
+    # check offline values from the book match values on-chain
+    raw = to_raw_market_data(state.rawMarketData(mock_market))
+    cap_oi = state.capOi(mock_market)
+    now = chain[-1]['timestamp']
+    actual = book.values_at(mock_market.address, raw, cap_oi, now)
+
+    assert len(actual) == 3
+    for (_, owner, pos_id), actual_value in actual.items():
+        expect_value = state.value(mock_market, owner, pos_id)
+        assert actual_value == approx(int(expect_value))
+
+    # none liquidatable right after build
+    assert book.liquidatable_at(mock_market.address, raw, now) == []
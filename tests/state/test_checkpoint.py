@@ -0,0 +1,155 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from brownie import chain, web3
+
+from scripts.state.book import PositionBook
+from scripts.state.checkpoint import (
+    HEADER_FILENAME,
+    load_checkpoint,
+    save_checkpoint,
+    warm_start
+)
+from scripts.state.offline import (
+    PositionInfo,
+    to_position_info,
+    to_raw_market_data
+)
+
+
+MARKET = "0x" + "aa" * 20
+OWNERS = ["0x" + "01" * 20, "0x" + "02" * 19 + "00"]
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def make_book(count):
+    book = PositionBook()
+    for i in range(count):
+        position = PositionInfo(
+            notional_initial=(i + 1) * 10**18, debt_initial=2**95 + i,
+            mid_tick=-i, entry_tick=i, is_long=(i % 2 == 0),
+            liquidated=False, oi_shares=2**100 + i,
+            fraction_remaining=10000)
+        book.append(MARKET, OWNERS[i % 2], i, position)
+    return book
+
+
+def test_save_load_checkpoint(tmp_path):
+    path = str(tmp_path)
+    book = make_book(100)
+    save_checkpoint(path, book, 12345)
+
+    checkpoint = load_checkpoint(path)
+    assert checkpoint.block == 12345
+    assert checkpoint.market_data == {}
+    assert isinstance(checkpoint.book.records, np.memmap)
+    assert len(checkpoint.book) == 100
+    assert checkpoint.book.markets == book.markets
+    for i in range(100):
+        key = (MARKET, OWNERS[i % 2], i)
+        assert checkpoint.book.get(*key) == book.get(*key)
+
+    # loaded book accepts updates and appends without touching the file
+    position = book.get(MARKET, OWNERS[0], 0)._replace(liquidated=True)
+    checkpoint.book.update(MARKET, OWNERS[0], 0, position)
+    checkpoint.book.append(MARKET, OWNERS[0], 100, position)
+    assert len(checkpoint.book) == 101
+
+    reloaded = load_checkpoint(path)
+    assert len(reloaded.book) == 100
+    assert not reloaded.book.get(MARKET, OWNERS[0], 0).liquidated
+
+
+def test_save_checkpoint_replaces_previous(tmp_path):
+    path = str(tmp_path)
+    save_checkpoint(path, make_book(10), 1)
+    save_checkpoint(path, make_book(20), 2)
+    save_checkpoint(path, make_book(30), 3)
+
+    assert len(load_checkpoint(path).book) == 30
+
+    # records of the previous checkpoint kept for readers of its header
+    records = [name for name in os.listdir(path)
+               if name.startswith("positions-")]
+    assert sorted(records) == ["positions-2.bin", "positions-3.bin"]
+
+
+def test_load_checkpoint_reloads_when_records_replaced(tmp_path,
+                                                       monkeypatch):
+    path = str(tmp_path)
+    save_checkpoint(path, make_book(10), 1)
+
+    # newer checkpoints land between reading the header and the records
+    memmap = np.memmap
+
+    def replaced_memmap(filename, *args, **kwargs):
+        if filename.endswith("positions-1.bin"):
+            save_checkpoint(path, make_book(20), 2)
+            save_checkpoint(path, make_book(30), 3)
+        return memmap(filename, *args, **kwargs)
+
+    monkeypatch.setattr(np, "memmap", replaced_memmap)
+    checkpoint = load_checkpoint(path)
+    assert checkpoint.block == 3
+    assert len(checkpoint.book) == 30
+
+
+def test_load_empty_checkpoint(tmp_path):
+    path = str(tmp_path)
+    save_checkpoint(path, PositionBook(), 1)
+    assert len(load_checkpoint(path).book) == 0
+
+
+def test_load_checkpoint_raises_when_version_mismatch(tmp_path):
+    path = str(tmp_path)
+    save_checkpoint(path, make_book(1), 1)
+
+    header_path = os.path.join(path, HEADER_FILENAME)
+    with open(header_path) as f:
+        header = json.load(f)
+    header["version"] += 1
+    with open(header_path, "w") as f:
+        json.dump(header, f)
+
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+
+
+def test_warm_start(tmp_path, state, mock_market, ovl, alice, bob):
+    path = str(tmp_path)
+    ovl.approve(mock_market, 2**256-1, {"from": alice})
+    ovl.approve(mock_market, 2**256-1, {"from": bob})
+
+    # index alice position and checkpoint with market data
+    tx = mock_market.build(10000000000000000000, 1000000000000000000,
+                           True, 2**256-1, {"from": alice})
+    alice_id = tx.return_value
+    book = PositionBook()
+    book.append(mock_market.address, alice.address, alice_id,
+                to_position_info(state.position(mock_market, alice.address,
+                                                alice_id)))
+    raw = to_raw_market_data(state.rawMarketData(mock_market))
+    save_checkpoint(path, book, chain.height,
+                    {mock_market.address: raw})
+
+    # changes after checkpoint: bob builds, alice unwinds half
+    tx = mock_market.build(10000000000000000000, 1000000000000000000,
+                           False, 0, {"from": bob})
+    bob_id = tx.return_value
+    mock_market.unwind(alice_id, 500000000000000000, 0, {"from": alice})
+
+    loaded = load_checkpoint(path)
+    assert loaded.market_data[mock_market.address.lower()] == raw
+
+    book, block = warm_start(path, web3, state, [mock_market], chain.height)
+    assert block == chain.height
+    assert len(book) == 2
+    for (owner, pos_id) in [(alice.address, alice_id), (bob.address, bob_id)]:
+        expect = to_position_info(state.position(mock_market, owner, pos_id))
+        assert book.get(mock_market.address, owner, pos_id) == expect
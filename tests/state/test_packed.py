@@ -0,0 +1,147 @@
+import pytest
+from brownie import reverts
+
+from scripts.state.packed import (
+    POSITION_DTYPE,
+    POSITION_VALUES_DTYPE,
+    decode_position_values,
+    decode_positions,
+    position_columns,
+    position_values_columns
+)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def build_positions(market, ovl, alice, bob):
+    # build a long for alice and a short for bob
+    ovl.approve(market, 2**256-1, {"from": alice})
+    ovl.approve(market, 2**256-1, {"from": bob})
+    tx_alice = market.build(20000000000000000000, 3000000000000000000,
+                            True, 2**256-1, {"from": alice})
+    tx_bob = market.build(10000000000000000000, 1000000000000000000,
+                          False, 0, {"from": bob})
+    owners = [alice.address, bob.address]
+    ids = [tx_alice.return_value, tx_bob.return_value]
+    return owners, ids
+
+
+def test_positions_packed(state, mock_market, ovl, alice, bob):
+    owners, ids = build_positions(mock_market, ovl, alice, bob)
+
+    payload = bytes(state.positionsPacked(mock_market, owners, ids))
+    assert len(payload) == len(owners) * POSITION_DTYPE.itemsize
+
+    # check decoded columns match positions from state
+    columns = position_columns(decode_positions(payload))
+    for i, (owner, pos_id) in enumerate(zip(owners, ids)):
+        (expect_notional_initial, expect_debt_initial, expect_mid_tick,
+         expect_entry_tick, expect_is_long, expect_liquidated,
+         expect_oi_shares, expect_fraction_remaining) = state.position(
+            mock_market, owner, pos_id)
+
+        assert columns["notional_initial"][i] == expect_notional_initial
+        assert columns["debt_initial"][i] == expect_debt_initial
+        assert columns["mid_tick"][i] == expect_mid_tick
+        assert columns["entry_tick"][i] == expect_entry_tick
+        assert columns["is_long"][i] == expect_is_long
+        assert columns["liquidated"][i] == expect_liquidated
+        assert columns["oi_shares"][i] == expect_oi_shares
+        assert columns["fraction_remaining"][i] == expect_fraction_remaining
+
+
+def test_position_values_packed(state, mock_market, ovl, alice, bob):
+    owners, ids = build_positions(mock_market, ovl, alice, bob)
+
+    payload = bytes(state.positionValuesPacked(mock_market, owners, ids))
+    assert len(payload) == len(owners) * POSITION_VALUES_DTYPE.itemsize
+
+    # check decoded columns match position views from state
+    columns = position_values_columns(decode_position_values(payload))
+    for i, (owner, pos_id) in enumerate(zip(owners, ids)):
+        expect_value = state.value(mock_market, owner, pos_id)
+        expect_notional = state.notional(mock_market, owner, pos_id)
+        expect_collateral = state.collateral(mock_market, owner, pos_id)
+        expect_liquidation_fee = state.liquidationFee(mock_market, owner,
+                                                      pos_id)
+        expect_liquidatable = state.liquidatable(mock_market, owner, pos_id)
+
+        assert columns["value"][i] == expect_value
+        assert columns["notional"][i] == expect_notional
+        assert columns["collateral"][i] == expect_collateral
+        assert columns["liquidation_fee"][i] == expect_liquidation_fee
+        assert columns["liquidatable"][i] == expect_liquidatable
+
+
+def test_packed_smaller_than_abi_encoded(state, mock_market, ovl, alice,
+                                         bob):
+    owners, ids = build_positions(mock_market, ovl, alice, bob)
+
+    # abi encoded Position.Info[] pads each of 8 fields to 32 bytes
+    payload = bytes(state.positionsPacked(mock_market, owners, ids))
+    abi_encoded_size = len(owners) * 8 * 32
+    assert len(payload) < abi_encoded_size / 4
+
+
+def test_packed_reverts_when_length_mismatch(state, mock_market, alice):
+    with reverts("OVLV1: !length"):
+        _ = state.positionsPacked(mock_market, [alice.address], [0, 1])
+
+    with reverts("OVLV1: !length"):
+        _ = state.positionValuesPacked(mock_market, [alice.address], [0, 1])
+
+
+def test_decode_positions():
+    # pack a record by hand in the contract layout
+    notional_initial = 2**95 + 12345
+    debt_initial = 10**18
+    mid_tick = -887272
+    entry_tick = 12345
+    oi_shares = 2**200 + 1
+    fraction_remaining = 10000
+    record = (notional_initial.to_bytes(12, "big")
+              + debt_initial.to_bytes(12, "big")
+              + mid_tick.to_bytes(3, "big", signed=True)
+              + entry_tick.to_bytes(3, "big", signed=True)
+              + bytes([0b10])
+              + oi_shares.to_bytes(30, "big")
+              + fraction_remaining.to_bytes(2, "big"))
+    assert len(record) == POSITION_DTYPE.itemsize
+
+    columns = position_columns(decode_positions(record * 3))
+    assert len(columns["mid_tick"]) == 3
+    assert columns["notional_initial"][0] == notional_initial
+    assert columns["debt_initial"][1] == debt_initial
+    assert list(columns["mid_tick"]) == [mid_tick] * 3
+    assert list(columns["entry_tick"]) == [entry_tick] * 3
+    assert not columns["is_long"][2]
+    assert columns["liquidated"][2]
+    assert columns["oi_shares"][0] == oi_shares
+    assert columns["fraction_remaining"][0] == fraction_remaining
+
+    with pytest.raises(ValueError):
+        decode_positions(record[:-1])
+
+
+def test_decode_position_values():
+    # pack a record by hand with amounts past float64 precision (2**53)
+    value = 10**24 + 1
+    notional = 2**53 + 1
+    collateral = 2**128 - 1
+    liquidation_fee = 0
+    record = (value.to_bytes(16, "big")
+              + notional.to_bytes(16, "big")
+              + collateral.to_bytes(16, "big")
+              + liquidation_fee.to_bytes(16, "big")
+              + bytes([0b1]))
+    assert len(record) == POSITION_VALUES_DTYPE.itemsize
+
+    columns = position_values_columns(decode_position_values(record * 2))
+    assert list(columns["value"]) == [value] * 2
+    assert list(columns["notional"]) == [notional] * 2
+    assert list(columns["collateral"]) == [collateral] * 2
+    assert list(columns["liquidation_fee"]) == [liquidation_fee] * 2
+    assert all(columns["liquidatable"])
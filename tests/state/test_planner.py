@@ -0,0 +1,119 @@
+import pytest
+import requests
+
+from scripts.state.planner import (
+    BatchPlanner,
+    estimate_gas_per_item,
+    is_retryable,
+    plan_chunks
+)
+
+
+def test_plan_chunks():
+    assert plan_chunks(0, 10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert plan_chunks(3, 5, 4) == [(3, 5)]
+    assert plan_chunks(0, 0, 4) == []
+
+
+def test_is_retryable():
+    assert is_retryable(ValueError("execution reverted: out of gas"))
+    assert is_retryable(ValueError("gas required exceeds allowance"))
+    assert is_retryable(requests.exceptions.ReadTimeout())
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(ValueError("execution reverted: OVLV1:!market"))
+
+
+def test_estimate_gas_per_item():
+    def estimate(chunk):
+        return 21000 + 50000 * len(chunk)
+
+    assert estimate_gas_per_item(estimate, list(range(10))) == 52100
+
+    with pytest.raises(ValueError):
+        estimate_gas_per_item(estimate, [])
+
+
+def test_chunk_size_fits_budget():
+    planner = BatchPlanner(gas_per_item=50000, gas_budget=50000000,
+                           headroom=1.0)
+    assert planner.chunk_size == 1000
+
+    planner = BatchPlanner(gas_per_item=50000, gas_budget=50000000,
+                           headroom=0.5)
+    assert planner.chunk_size == 500
+
+    planner = BatchPlanner(gas_per_item=50000, gas_budget=50000000,
+                           max_items=100)
+    assert planner.chunk_size == 100
+
+    planner = BatchPlanner(gas_per_item=10**9, gas_budget=50000000)
+    assert planner.chunk_size == 1
+
+
+def test_run_returns_results_in_order():
+    calls = []
+
+    def call(chunk):
+        calls.append(len(chunk))
+        return [2 * x for x in chunk]
+
+    items = list(range(100000))
+    planner = BatchPlanner(gas_per_item=1000, gas_budget=10000000,
+                           headroom=1.0)
+    actual = planner.run(call, items)
+
+    assert actual == [2 * x for x in items]
+    assert len(calls) == 10
+    assert planner.retries == 0
+
+
+def test_run_shrinks_chunks_when_out_of_gas():
+    # actual gas per item is 4x the estimate
+    actual_gas_per_item = 4000
+    gas_budget = 10000000
+
+    def call(chunk):
+        if len(chunk) * actual_gas_per_item > gas_budget:
+            raise ValueError("out of gas")
+        return [2 * x for x in chunk]
+
+    items = list(range(20000))
+    planner = BatchPlanner(gas_per_item=1000, gas_budget=gas_budget,
+                           headroom=1.0, max_workers=4)
+    actual = planner.run(call, items)
+
+    assert actual == [2 * x for x in items]
+    assert planner.retries > 0
+    assert planner.chunk_size * actual_gas_per_item <= gas_budget
+
+
+def test_run_shrinks_chunks_on_timeout():
+    def call(chunk):
+        if len(chunk) > 10:
+            raise requests.exceptions.ReadTimeout()
+        return chunk
+
+    items = list(range(100))
+    planner = BatchPlanner(gas_per_item=1, gas_budget=1000, headroom=1.0)
+    actual = planner.run(call, items)
+
+    assert actual == items
+    assert planner.chunk_size <= 10
+
+
+def test_run_raises_non_retryable():
+    def call(chunk):
+        raise ValueError("execution reverted: OVLV1:!market")
+
+    planner = BatchPlanner(gas_per_item=1, gas_budget=10)
+    with pytest.raises(ValueError, match="OVLV1:!market"):
+        planner.run(call, list(range(100)))
+
+
+def test_run_raises_when_single_item_out_of_gas():
+    def call(chunk):
+        raise ValueError("out of gas")
+
+    planner = BatchPlanner(gas_per_item=1, gas_budget=10)
+    with pytest.raises(ValueError, match="out of gas"):
+        planner.run(call, list(range(100)))
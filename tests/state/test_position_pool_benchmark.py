@@ -0,0 +1,43 @@
+import time
+
+import pytest
+from brownie import chain
+
+from .utils import POOL_SIZE
+
+# number of examples to time each way
+EXAMPLES = 20
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def test_position_pool_examples_per_second(state, mock_market, ovl, alice,
+                                           position_pool):
+    ovl.approve(mock_market, 2**256-1, {"from": alice})
+
+    # build a position per example, as hypothesis tests did before
+    start = time.perf_counter()
+    for i in range(EXAMPLES):
+        chain.snapshot()
+        tx = mock_market.build(20000000000000000000, 3000000000000000000,
+                               i % 2 == 0, 2**256-1 if i % 2 == 0 else 0,
+                               {"from": alice})
+        state.value(mock_market, alice.address, tx.return_value)
+        chain.revert()
+    built = EXAMPLES / (time.perf_counter() - start)
+
+    # draw a prebuilt position per example from the pool
+    start = time.perf_counter()
+    for i in range(EXAMPLES):
+        chain.snapshot()
+        pooled = position_pool.get(mock_market, i % 2 == 0, i % POOL_SIZE)
+        state.value(mock_market, pooled.owner.address, pooled.id)
+        chain.revert()
+    pooled = EXAMPLES / (time.perf_counter() - start)
+
+    assert pooled > built
+    print(f"\nexamples: {EXAMPLES}, built: {built:.1f}/s, "
+          f"pooled: {pooled:.1f}/s, speedup: {pooled / built:.1f}x")
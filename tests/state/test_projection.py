@@ -0,0 +1,149 @@
+import pytest
+from pytest import approx
+from brownie import chain, reverts
+from brownie.test import given, strategy
+
+from scripts.state.offline import (
+    market_projection,
+    position_projection,
+    to_position_info,
+    to_raw_market_data
+)
+
+from .utils import get_position_key
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+def build_positions(market, ovl, alice, bob):
+    # alice build params
+    input_collateral_alice = 20000000000000000000  # 20
+    input_leverage_alice = 3000000000000000000  # 3
+    input_is_long_alice = True
+    input_price_limit_alice = 2**256-1
+
+    # bob build params
+    input_collateral_bob = 10000000000000000000  # 10
+    input_leverage_bob = 1000000000000000000  # 1
+    input_is_long_bob = False
+    input_price_limit_bob = 0
+
+    # approve max for both
+    ovl.approve(market, 2**256-1, {"from": alice})
+    ovl.approve(market, 2**256-1, {"from": bob})
+
+    # build positions for alice and bob
+    tx = market.build(input_collateral_alice, input_leverage_alice,
+                      input_is_long_alice, input_price_limit_alice,
+                      {"from": alice})
+    market.build(input_collateral_bob, input_leverage_bob,
+                 input_is_long_bob, input_price_limit_bob, {"from": bob})
+    return tx.return_value
+
+
+def test_market_projection(state, mock_market, ovl, alice, bob):
+    build_positions(mock_market, ovl, alice, bob)
+
+    # project forward from the latest block timestamp
+    now = chain[-1]['timestamp']
+    timestamps = [now, now + 600, now + 86400]
+    actual = state.marketProjection(mock_market, timestamps)
+
+    # forward the chain to each timestamp and check projections match
+    for i, timestamp in enumerate(timestamps):
+        if timestamp > now:
+            chain.mine(timestamp=timestamp)
+        (actual_timestamp, actual_oi_long, actual_oi_short,
+         actual_funding_rate) = actual[i]
+        expect_oi_long, expect_oi_short = state.ois(mock_market)
+        expect_funding_rate = state.fundingRate(mock_market)
+
+        assert actual_timestamp == timestamp
+        assert int(actual_oi_long) == approx(int(expect_oi_long))
+        assert int(actual_oi_short) == approx(int(expect_oi_short))
+        assert int(actual_funding_rate) == approx(int(expect_funding_rate))
+
+
+@given(is_long=strategy('bool'))
+def test_position_projection(state, mock_market, ovl, alice, bob, is_long):
+    pos_id = build_positions(mock_market, ovl, alice, bob)
+    owner = alice.address
+
+    # build a position for bob on the side given
+    ovl.approve(mock_market, 2**256-1, {"from": bob})
+    if not is_long:
+        tx = mock_market.build(20000000000000000000, 3000000000000000000,
+                               False, 0, {"from": bob})
+        pos_id = tx.return_value
+        owner = bob.address
+
+    # project forward from the latest block timestamp
+    now = chain[-1]['timestamp']
+    timestamps = [now, now + 600, now + 86400]
+    actual = state.positionProjection(mock_market, owner, pos_id, timestamps)
+
+    # forward the chain to each timestamp and check projections match
+    for i, timestamp in enumerate(timestamps):
+        if timestamp > now:
+            chain.mine(timestamp=timestamp)
+        (actual_timestamp, actual_value, actual_notional,
+         actual_liquidatable) = actual[i]
+        expect_value = state.value(mock_market, owner, pos_id)
+        expect_notional = state.notional(mock_market, owner, pos_id)
+        expect_liquidatable = state.liquidatable(mock_market, owner, pos_id)
+
+        assert actual_timestamp == timestamp
+        assert int(actual_value) == approx(int(expect_value))
+        assert int(actual_notional) == approx(int(expect_notional))
+        assert actual_liquidatable == expect_liquidatable
+
+
+def test_market_projection_reverts_when_timestamp_lt_now(state, mock_market):
+    now = chain[-1]['timestamp']
+    with reverts("OVLV1: timestamp < now"):
+        _ = state.marketProjection(mock_market, [now + 600, now - 1])
+
+
+def test_position_projection_reverts_when_timestamp_lt_now(state, mock_market,
+                                                           ovl, alice, bob):
+    pos_id = build_positions(mock_market, ovl, alice, bob)
+    now = chain[-1]['timestamp']
+    with reverts("OVLV1: timestamp < now"):
+        _ = state.positionProjection(mock_market, alice.address, pos_id,
+                                     [now - 1])
+
+
+def test_offline_projection(state, mock_market, ovl, alice, bob):
+    pos_id = build_positions(mock_market, ovl, alice, bob)
+
+    # project forward from the latest block timestamp
+    now = chain[-1]['timestamp']
+    timestamps = [now, now + 600, now + 3600, now + 86400]
+
+    # get the raw inputs once for the offline mirror
+    raw = to_raw_market_data(state.rawMarketData(mock_market))
+    cap_oi = state.capOi(mock_market)
+    pos_key = get_position_key(alice.address, pos_id)
+    position = to_position_info(mock_market.positions(pos_key))
+
+    # check offline market projections in line with on-chain
+    expect = state.marketProjection(mock_market, timestamps)
+    actual = market_projection(raw, timestamps)
+    for (e, a) in zip(expect, actual):
+        (_, expect_oi_long, expect_oi_short, expect_funding_rate) = e
+        assert a.oi_long == approx(int(expect_oi_long))
+        assert a.oi_short == approx(int(expect_oi_short))
+        assert a.funding_rate == approx(int(expect_funding_rate))
+
+    # check offline position projections in line with on-chain
+    expect = state.positionProjection(mock_market, alice.address, pos_id,
+                                      timestamps)
+    actual = position_projection(raw, cap_oi, position, timestamps)
+    for (e, a) in zip(expect, actual):
+        (_, expect_value, expect_notional, expect_liquidatable) = e
+        assert a.value == approx(int(expect_value))
+        assert a.notional == approx(int(expect_notional))
+        assert a.liquidatable == expect_liquidatable
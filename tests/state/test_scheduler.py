@@ -0,0 +1,181 @@
+import threading
+import time
+
+import pytest
+
+from scripts.state.scheduler import (
+    Priority,
+    RpcScheduler,
+    StaleRequestError,
+    TokenBucket
+)
+
+
+class LocalNode:
+    """
+    Stand-in for a node serving a limited number of requests at once
+    with fixed latency. Tracks max concurrent requests per class
+    """
+
+    def __init__(self, capacity=4, latency=0.01):
+        self.latency = latency
+        self.slots = threading.Semaphore(capacity)
+        self.lock = threading.Lock()
+        self.in_flight = {p: 0 for p in Priority}
+        self.max_in_flight = {p: 0 for p in Priority}
+        self.calls = []
+
+    def call(self, priority, value=None):
+        with self.lock:
+            self.in_flight[priority] += 1
+            self.max_in_flight[priority] = max(
+                self.max_in_flight[priority], self.in_flight[priority])
+            self.calls.append((time.monotonic(), priority))
+        with self.slots:
+            time.sleep(self.latency)
+        with self.lock:
+            self.in_flight[priority] -= 1
+        return value
+
+
+@pytest.fixture
+def node():
+    return LocalNode()
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = RpcScheduler(max_workers=8, limits={
+        Priority.LIQUIDATION: 8,
+        Priority.KEEPER: 4,
+        Priority.DASHBOARD: 2,
+    })
+    yield scheduler
+    scheduler.close()
+
+
+def test_token_bucket():
+    now = [0.0]
+    bucket = TokenBucket(rate=10, burst=2, clock=lambda: now[0])
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(0.1)
+
+    now[0] += 0.1
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    # refills no higher than burst
+    now[0] += 10
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, burst=1)
+
+
+def test_submit_returns_result(scheduler, node):
+    future = scheduler.submit(node.call, Priority.KEEPER, 42,
+                              priority=Priority.KEEPER)
+    assert future.result(timeout=1) == 42
+
+
+def test_submit_raises_error(scheduler):
+    def fail():
+        raise ValueError("execution reverted")
+
+    future = scheduler.submit(fail, priority=Priority.LIQUIDATION)
+    with pytest.raises(ValueError, match="execution reverted"):
+        future.result(timeout=1)
+
+
+def test_class_concurrency_limits(scheduler, node):
+    futures = [scheduler.submit(node.call, p, priority=p)
+               for _ in range(20) for p in Priority]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert node.max_in_flight[Priority.DASHBOARD] <= 2
+    assert node.max_in_flight[Priority.KEEPER] <= 4
+    assert sum(node.max_in_flight.values()) <= 8 + 4 + 2
+
+
+def test_liquidation_latency_bounded_under_load(scheduler, node):
+    # flood with dashboard reads and keeper scans
+    load = [scheduler.submit(node.call, Priority.DASHBOARD,
+                             priority=Priority.DASHBOARD)
+            for _ in range(200)]
+    load += [scheduler.submit(node.call, Priority.KEEPER,
+                              priority=Priority.KEEPER)
+             for _ in range(100)]
+
+    # liquidations jump the queue and do not wait for the backlog
+    latencies = []
+    for _ in range(5):
+        start = time.monotonic()
+        scheduler.submit(node.call, Priority.LIQUIDATION,
+                         priority=Priority.LIQUIDATION).result(timeout=5)
+        latencies.append(time.monotonic() - start)
+
+    # backlog alone takes > 0.5s to drain at node capacity
+    assert max(latencies) < 0.1
+    assert scheduler.pending(Priority.DASHBOARD) > 0
+
+    for future in load:
+        future.result(timeout=10)
+
+
+def test_stale_reads_dropped(scheduler, node):
+    # block dashboard class with slow reads then queue reads with deadline
+    slow = LocalNode(capacity=2, latency=0.2)
+    blockers = [scheduler.submit(slow.call, Priority.DASHBOARD,
+                                 priority=Priority.DASHBOARD)
+                for _ in range(2)]
+    stale = [scheduler.submit(node.call, Priority.DASHBOARD,
+                              priority=Priority.DASHBOARD, timeout=0.05)
+             for _ in range(10)]
+
+    for future in stale:
+        with pytest.raises(StaleRequestError):
+            future.result(timeout=1)
+    for future in blockers:
+        future.result(timeout=1)
+
+    assert scheduler.dropped[Priority.DASHBOARD] == 10
+    assert not any(p == Priority.DASHBOARD for (_, p) in node.calls)
+
+
+def test_endpoint_rate_limit(node):
+    scheduler = RpcScheduler(rates={"node": (50, 5)})
+    try:
+        start = time.monotonic()
+        futures = [scheduler.submit(node.call, Priority.KEEPER,
+                                    priority=Priority.KEEPER,
+                                    endpoint="node")
+                   for _ in range(25)]
+        for future in futures:
+            future.result(timeout=5)
+        elapsed = time.monotonic() - start
+    finally:
+        scheduler.close()
+
+    # burst of 5 then 20 more at 50 per second
+    assert elapsed >= 0.35
+
+
+def test_close_cancels_queued(node):
+    scheduler = RpcScheduler(limits={Priority.DASHBOARD: 1})
+    slow = LocalNode(latency=0.1)
+    running = scheduler.submit(slow.call, Priority.DASHBOARD)
+    while not running.running():
+        time.sleep(0.001)
+    queued = [scheduler.submit(node.call, Priority.DASHBOARD)
+              for _ in range(5)]
+    scheduler.close()
+
+    assert running.result() is None
+    assert all(future.cancelled() for future in queued)
+    with pytest.raises(RuntimeError):
+        scheduler.submit(node.call, Priority.DASHBOARD)
@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from brownie import chain, web3
+
+from scripts.state.offline import to_raw_market_data
+from scripts.state.shared import (
+    SnapshotPublisher,
+    SnapshotReader,
+    decode_market_state,
+    decode_raw_market_data
+)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture
+def publisher(state, mock_market, market):
+    publisher = SnapshotPublisher(web3, state.address, state.abi,
+                                  [mock_market.address, market.address])
+    yield publisher
+    publisher.close()
+
+
+def read_market_state(name, market):
+    reader = SnapshotReader(name)
+    try:
+        snapshot = reader.read()
+        return (snapshot.block,
+                tuple(decode_market_state(reader.market(snapshot, market))))
+    finally:
+        reader.close()
+
+
+def test_publish(publisher, state, mock_market, market):
+    block = chain.height
+    publisher.publish(block)
+
+    reader = SnapshotReader(publisher.name)
+    snapshot = reader.read()
+    assert snapshot.block == block
+    assert snapshot.generation == 2
+    assert snapshot.timestamp == chain[block]["timestamp"]
+    assert len(snapshot.records) == 2
+
+    # check snapshot matches views on state
+    for m in [mock_market, market]:
+        record = reader.market(snapshot, m.address)
+        assert tuple(decode_market_state(record)) == state.marketState(m)
+        assert decode_raw_market_data(record) == to_raw_market_data(
+            state.rawMarketData(m))
+
+    reader.close()
+
+
+def test_view(publisher, state, mock_market, ovl, alice):
+    publisher.publish(chain.height)
+
+    reader = SnapshotReader(publisher.name)
+    snapshot = reader.view()
+    assert snapshot.generation == 2
+    assert not snapshot.records.flags.writeable
+    assert not snapshot.records.flags.owndata
+
+    # check view matches state while valid
+    record = reader.market(snapshot, mock_market.address)
+    assert tuple(decode_market_state(record)) == \
+        state.marketState(mock_market)
+    assert reader.valid(snapshot)
+
+    # publishing again invalidates the view
+    ovl.approve(mock_market, 2**256-1, {"from": alice})
+    mock_market.build(10000000000000000000, 1000000000000000000, True,
+                      2**256-1, {"from": alice})
+    publisher.publish(chain.height)
+    assert not reader.valid(snapshot)
+    assert reader.view().generation == 4
+
+    del snapshot, record
+    reader.close()
+
+
+def test_publish_each_block(publisher, mock_market, ovl, alice):
+    publisher.publish(chain.height)
+
+    # change market state then publish again
+    ovl.approve(mock_market, 2**256-1, {"from": alice})
+    mock_market.build(10000000000000000000, 1000000000000000000, True,
+                      2**256-1, {"from": alice})
+    publisher.publish(chain.height)
+
+    reader = SnapshotReader(publisher.name)
+    snapshot = reader.read()
+    assert snapshot.block == chain.height
+    assert snapshot.generation == 4
+    record = reader.market(snapshot, mock_market.address)
+    assert decode_market_state(record).oi_long > 0
+    reader.close()
+
+
+def test_read_from_other_process(publisher, state, mock_market):
+    block = chain.height
+    publisher.publish(block)
+
+    with ProcessPoolExecutor(2) as executor:
+        futures = [executor.submit(read_market_state, publisher.name,
+                                   mock_market.address) for _ in range(2)]
+        results = [future.result() for future in futures]
+
+    expect = (block, tuple(state.marketState(mock_market)))
+    assert results == [expect, expect]
+
+
+def test_read_raises_when_publisher_mid_write(publisher):
+    publisher.publish(chain.height)
+    reader = SnapshotReader(publisher.name)
+
+    # simulate publisher stuck mid write
+    publisher.header["generation"] += 1
+    with pytest.raises(TimeoutError):
+        reader.read(timeout=0.01)
+
+    publisher.header["generation"] += 1
+    assert reader.read().generation == 4
+    reader.close()
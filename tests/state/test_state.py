@@ -1,3 +1,6 @@
+from eth_abi import decode_abi
+
+
 def test_market_state(state, market, feed, ovl, alice, bob):
     # alice build params
     input_collateral_alice = 20000000000000000000  # 20
@@ -39,3 +42,89 @@ def test_market_state(state, market, feed, ovl, alice, bob):
               cap_oi, circuit_level, funding_rate)
     actual = state.marketState(market)
     assert expect == actual
+
+
+def test_raw_market_data(state, market, feed, ovl, alice, bob):
+    # alice build params
+    input_collateral_alice = 20000000000000000000  # 20
+    input_leverage_alice = 1000000000000000000  # 1
+    input_is_long_alice = True
+    input_price_limit_alice = 2**256-1
+
+    # bob build params
+    input_collateral_bob = 10000000000000000000  # 10
+    input_leverage_bob = 1000000000000000000  # 1
+    input_is_long_bob = False
+    input_price_limit_bob = 0
+
+    # approve max for both
+    ovl.approve(market, 2**256-1, {"from": alice})
+    ovl.approve(market, 2**256-1, {"from": bob})
+
+    # build position for alice
+    market.build(input_collateral_alice, input_leverage_alice,
+                 input_is_long_alice, input_price_limit_alice, {"from": alice})
+
+    # build position for bob
+    market.build(input_collateral_bob, input_leverage_bob,
+                 input_is_long_bob, input_price_limit_bob, {"from": bob})
+
+    # query all the raw attributes directly from the market and feed
+    params = tuple(market.params(i) for i in range(15))
+    expect = (feed.address, market.oiLong(), market.oiShort(),
+              market.oiLongShares(), market.oiShortShares(),
+              market.timestampUpdateLast(), market.snapshotVolumeBid(),
+              market.snapshotVolumeAsk(), market.snapshotMinted(),
+              params, feed.latest())
+    actual = state.rawMarketData(market)
+    assert expect == actual
+
+
+def test_raw_market_data_batch(state, market, mock_market):
+    expect = [state.rawMarketData(market), state.rawMarketData(mock_market)]
+    actual = state.rawMarketDataBatch([market, mock_market])
+    assert expect == actual
+
+
+def test_try_batch(state, market, feed, ovl, alice):
+    # alice build params
+    input_collateral_alice = 20000000000000000000  # 20
+    input_leverage_alice = 1000000000000000000  # 1
+    input_is_long_alice = True
+    input_price_limit_alice = 2**256-1
+
+    # approve max for alice
+    ovl.approve(market, 2**256-1, {"from": alice})
+
+    # build position for alice
+    tx = market.build(input_collateral_alice, input_leverage_alice,
+                      input_is_long_alice, input_price_limit_alice,
+                      {"from": alice})
+    pos_id = tx.return_value
+
+    # batch with valid calls and a call to liquidationPrice that reverts
+    # for a position that doesn't exist
+    calls = [
+        state.mid.encode_input(market),
+        state.liquidationPrice.encode_input(market, alice, pos_id + 1),
+        state.value.encode_input(market, alice, pos_id),
+    ]
+    results = state.tryBatch(calls)
+
+    # check successful calls return same as individual calls
+    (success, return_data) = results[0]
+    assert success is True
+    assert state.mid.decode_output(return_data) == state.mid(market)
+
+    (success, return_data) = results[2]
+    assert success is True
+    assert state.value.decode_output(return_data) \
+        == state.value(market, alice, pos_id)
+
+    # check failed call returns revert reason
+    # Error(string) is selector 0x08c379a0 followed by abi encoded string
+    (success, return_data) = results[1]
+    assert success is False
+    assert bytes(return_data[:4]).hex() == "08c379a0"
+    (reason,) = decode_abi(["string"], bytes(return_data[4:]))
+    assert reason == "OVLV1: oi == 0"
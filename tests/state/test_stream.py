@@ -0,0 +1,127 @@
+import io
+
+import pytest
+
+from scripts.state.shared import MarketState
+from scripts.state.stream import (
+    DELTA,
+    KEYFRAME,
+    MarketStateDecoder,
+    MarketStateEncoder,
+    read_frames
+)
+
+
+MARKET_A = "0x" + "aa" * 20
+MARKET_B = "0x" + "bb" * 20
+
+
+def make_state(**kwargs):
+    values = dict(
+        bid=1990000000000000000000, ask=2010000000000000000000,
+        mid=2000000000000000000000, volume_bid=0, volume_ask=0,
+        oi_long=350000000000000000000, oi_short=250000000000000000000,
+        cap_oi=800000000000000000000000, circuit_breaker_level=10**18,
+        funding_rate=-1500000000
+    )
+    values.update(kwargs)
+    return MarketState(**values)
+
+
+def test_encode_decode_round_trip():
+    encoder = MarketStateEncoder()
+    decoder = MarketStateDecoder()
+
+    states = [make_state(), make_state(bid=1980000000000000000000),
+              make_state(bid=1980000000000000000000, funding_rate=2**200,
+                         oi_long=0)]
+    for block, state in enumerate(states):
+        update = decoder.decode(encoder.encode(block, MARKET_A, state))
+        assert update.block == block
+        assert update.market == MARKET_A
+        assert update.state == state
+
+    update = decoder.decode(encoder.encode(3, MARKET_A, make_state(
+        funding_rate=-2**255)))
+    assert update.kind == DELTA
+    assert update.state.funding_rate == -2**255
+    assert set(update.changed) == {"bid", "oi_long", "funding_rate"}
+
+
+def test_encode_only_changed_fields():
+    encoder = MarketStateEncoder()
+    decoder = MarketStateDecoder()
+    keyframe = encoder.encode(0, MARKET_A, make_state())
+
+    # quiet market emits nothing
+    assert encoder.encode(1, MARKET_A, make_state()) is None
+
+    # single field change emits small delta
+    delta = encoder.encode(2, MARKET_A, make_state(volume_bid=12345))
+    assert len(delta) < len(keyframe) / 2
+
+    decoder.decode(keyframe)
+    update = decoder.decode(delta)
+    assert update.kind == DELTA
+    assert update.changed == ["volume_bid"]
+    assert update.state == make_state(volume_bid=12345)
+
+    # much smaller than abi encoded market state of 10 words
+    assert len(keyframe) < 10 * 32
+
+
+def test_keyframes_for_late_joiners():
+    encoder = MarketStateEncoder(keyframe_interval=5)
+    frames = []
+    for block in range(20):
+        frame = encoder.encode(block, MARKET_A,
+                               make_state(volume_ask=block // 2))
+        if frame is not None:
+            frames.append(frame)
+
+    # late joiner skips deltas until the next keyframe
+    decoder = MarketStateDecoder()
+    updates = [decoder.decode(frame) for frame in frames[3:]]
+    first = next(i for i, u in enumerate(updates) if u is not None)
+    assert all(u is None for u in updates[:first])
+    assert updates[first].kind == KEYFRAME
+    assert updates[-1].state == make_state(volume_ask=19 // 2)
+
+
+def test_keyframes_in_quiet_market():
+    encoder = MarketStateEncoder(keyframe_interval=5)
+    frames = [encoder.encode(block, MARKET_A, make_state())
+              for block in range(11)]
+    kinds = [block for block, frame in enumerate(frames) if frame is not None]
+    assert kinds == [0, 5, 10]
+
+
+def test_markets_tracked_separately():
+    encoder = MarketStateEncoder()
+    decoder = MarketStateDecoder()
+    buffer = io.BytesIO()
+    for block in range(3):
+        for market, bid in [(MARKET_A, block), (MARKET_B, 7)]:
+            frame = encoder.encode(block, market, make_state(bid=bid))
+            if frame is not None:
+                buffer.write(frame)
+
+    buffer.seek(0)
+    updates = [decoder.decode(frame) for frame in read_frames(buffer)]
+    assert [(u.block, u.market) for u in updates] == [
+        (0, MARKET_A), (0, MARKET_B), (1, MARKET_A), (2, MARKET_A)]
+    assert decoder.states[MARKET_A] == make_state(bid=2)
+    assert decoder.states[MARKET_B] == make_state(bid=7)
+
+
+def test_decode_raises_when_version_mismatch():
+    frame = bytearray(MarketStateEncoder().encode(0, MARKET_A, make_state()))
+    frame[4] += 1
+    with pytest.raises(ValueError):
+        MarketStateDecoder().decode(bytes(frame))
+
+
+def test_read_frames_raises_when_truncated():
+    frame = MarketStateEncoder().encode(0, MARKET_A, make_state())
+    with pytest.raises(EOFError):
+        list(read_frames(io.BytesIO(frame[:-1])))
@@ -6,6 +6,27 @@ from math import log
 from typing import Any
 
 
+# leverages and collateral of positions built on each side of a market
+# in the position pool. Shorts are built with a tenth of the collateral
+# of longs so the market is imbalanced and funding adjusts positions
+POOL_LEVERAGES = (
+    1000000000000000000,  # 1
+    2000000000000000000,  # 2
+    3000000000000000000,  # 3
+)
+POOL_COLLATERALS = (
+    10000000000000000000,  # 10
+    20000000000000000000,  # 20
+)
+POOL_SHORT_COLLATERALS = (
+    1000000000000000000,  # 1
+    2000000000000000000,  # 2
+)
+
+# number of positions in the pool on each side of a market
+POOL_SIZE = len(POOL_LEVERAGES) * len(POOL_COLLATERALS)
+
+
 class RiskParameter(Enum):
     K = 0
     LMBDA = 1